@@ -28,20 +28,49 @@ LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
 HOSPITAL_API_BASE_URL = os.getenv("HOSPITAL_API_BASE_URL", "http://localhost:8080")
 HOSPITAL_API_VERSION = os.getenv("HOSPITAL_API_VERSION", "v1")
 
+# Test Execution Configuration
+EXECUTOR_CONCURRENCY = int(os.getenv("EXECUTOR_CONCURRENCY", "10"))
+EXECUTOR_TIMEOUT = float(os.getenv("EXECUTOR_TIMEOUT", "30"))  # Per-request timeout in seconds
+MOCK_SERVER_PORT = int(os.getenv("MOCK_SERVER_PORT", "8090"))  # Port of the spec-driven mock server
+
+# Generation Service Configuration
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8100"))
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "2"))  # Generation jobs run concurrently
+
 # Test Generation Configuration
 VALID_TESTS_PER_ENDPOINT = int(os.getenv("VALID_TESTS_PER_ENDPOINT", "3"))
 INVALID_TESTS_PER_ENDPOINT = int(os.getenv("INVALID_TESTS_PER_ENDPOINT", "3"))
 ENABLE_EDGE_CASES = os.getenv("ENABLE_EDGE_CASES", "true").lower() == "true"
+COVERAGE_MAX_ROUNDS = int(os.getenv("COVERAGE_MAX_ROUNDS", "3"))  # LLM requests per endpoint in coverage-driven mode
+FEW_SHOT_EXAMPLES = int(os.getenv("FEW_SHOT_EXAMPLES", "0"))  # Curated cases added to each prompt (0 = none, changes the prompts)
+FEW_SHOT_MAX_TOKENS = int(os.getenv("FEW_SHOT_MAX_TOKENS", "600"))  # Estimated tokens of a prompt's examples
+MUTANTS_PER_ITEM = int(os.getenv("MUTANTS_PER_ITEM", "0"))  # INVALID cases derived from VALID ones per endpoint, error kind and field (0 = none)
+MUTATION_MAX_BODY_BYTES = int(os.getenv("MUTATION_MAX_BODY_BYTES", "0"))  # API body size limit for oversized-payload cases (0 = unknown, none)
+LAZY_PARSE_MIN_MB = float(os.getenv("LAZY_PARSE_MIN_MB", "10"))  # JSON specs this large are parsed lazily
+GENERATION_CONCURRENCY = int(os.getenv("GENERATION_CONCURRENCY", "4"))  # Endpoints generated at once by the multi command
+LLM_RATE_LIMIT_RPM = float(os.getenv("LLM_RATE_LIMIT_RPM", "0"))  # LLM requests per minute of the multi command (0 = unlimited)
 
 # Output Configuration
-OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "json")  # Options: "json", "csv", "postman"
-OUTPUT_DIR = PROJECT_ROOT / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "json")  # Options: "json", "jsonl", "csv", "postman" (comma-separated for several)
+OUTPUT_FORMATS = [f.strip() for f in OUTPUT_FORMAT.split(",") if f.strip()]
+POSTMAN_SHARDS = int(os.getenv("POSTMAN_SHARDS", "1"))  # Balanced collections for parallel Newman runners
+TEMPLATE_MIN_ROWS = int(os.getenv("TEMPLATE_MIN_ROWS", "3"))  # Cases differing only in values that --templates turns into one template
+OUTPUT_DIR = PROJECT_ROOT / "output"  # Created by whatever writes to it first
+SPEC_CACHE = os.getenv("SPEC_CACHE", "true").lower() == "true"  # Reuse parsed endpoints while a spec is unchanged
+SPEC_CACHE_DIR = OUTPUT_DIR / "spec_cache"
+PAYLOAD_CACHE = os.getenv("PAYLOAD_CACHE", "false").lower() == "true"  # Reuse one valid request body per schema (changes the prompts)
+PAYLOAD_CACHE_FILE = OUTPUT_DIR / "payload_cache.json"
+RESULTS_DB = Path(os.getenv("RESULTS_DB", str(OUTPUT_DIR / "results.db")))  # Execution results store
+LATENCY_PERCENTILE = float(os.getenv("LATENCY_PERCENTILE", "95"))  # Historical percentile behind response-time budgets
+LATENCY_HEADROOM = float(os.getenv("LATENCY_HEADROOM", "1.5"))  # Multiplier applied to that percentile
+
+# Benchmark Configuration
+BENCHMARK_BASELINE = PROJECT_ROOT / "benchmarks" / "baseline.json"  # Committed stage timings of "main.py bench"
+BENCHMARK_THRESHOLD = float(os.getenv("BENCHMARK_THRESHOLD", "0.5"))  # Allowed regression over the baseline (0.5 = 50%)
 
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = PROJECT_ROOT / "logs" / "ai_generator.log"
-LOG_FILE.parent.mkdir(exist_ok=True)
+LOG_FILE = PROJECT_ROOT / "logs" / "ai_generator.log"  # Created on the first log record
 
 # Feature Flags
 ENABLE_POSTMAN_EXPORT = os.getenv("ENABLE_POSTMAN_EXPORT", "true").lower() == "true"
@@ -2,28 +2,52 @@
 Main entry point for AI Test Case Generator
 """
 import sys
+import json
 import logging
 import argparse
 from pathlib import Path
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Union, TYPE_CHECKING
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from config import (
     OPENAI_API_KEY, ANTHROPIC_API_KEY, LLM_PROVIDER, LLM_MODEL,
-    LLM_TEMPERATURE, OUTPUT_FORMAT, OUTPUT_DIR, VALID_TESTS_PER_ENDPOINT,
-    INVALID_TESTS_PER_ENDPOINT, LOG_LEVEL, LOG_FILE, OLLAMA_SERVER
+    LLM_TEMPERATURE, OUTPUT_FORMATS, OUTPUT_DIR, VALID_TESTS_PER_ENDPOINT,
+    INVALID_TESTS_PER_ENDPOINT, LOG_LEVEL, LOG_FILE, OLLAMA_SERVER,
+    POSTMAN_SHARDS, HOSPITAL_API_BASE_URL, EXECUTOR_CONCURRENCY, EXECUTOR_TIMEOUT,
+    MOCK_SERVER_PORT, COVERAGE_MAX_ROUNDS, MANUAL_TESTS_DIR, SERVICE_PORT, SERVICE_WORKERS,
+    BENCHMARK_BASELINE, BENCHMARK_THRESHOLD, OAS_DOCS_DIR, LAZY_PARSE_MIN_MB, SPEC_CACHE, SPEC_CACHE_DIR,
+    GENERATION_CONCURRENCY, LLM_RATE_LIMIT_RPM, PAYLOAD_CACHE, PAYLOAD_CACHE_FILE,
+    FEW_SHOT_EXAMPLES, FEW_SHOT_MAX_TOKENS, MUTANTS_PER_ITEM, MUTATION_MAX_BODY_BYTES, TEMPLATE_MIN_ROWS,
+    RESULTS_DB, LATENCY_PERCENTILE, LATENCY_HEADROOM
 )
-from test_generator import TestCaseGenerator
-from output_formatter import FormatterFactory
+
+if TYPE_CHECKING:
+    from latency_baseline import LatencyBaseline
+
+# Subcommand modules are imported where they are used, so each command only
+# pays for its own dependencies (aiohttp alone costs more than a --help run)
+
+
+class LogFileHandler(logging.FileHandler):
+    """File handler that creates the log file (and its directory) on the first record"""
+    
+    def __init__(self, filename: Path):
+        super().__init__(filename, delay=True)
+    
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
 
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(LOG_FILE),
+        LogFileHandler(LOG_FILE),
         logging.StreamHandler()
     ]
 )
@@ -58,7 +82,22 @@ def generate_tests(
     valid_per_endpoint: int = VALID_TESTS_PER_ENDPOINT,
     invalid_per_endpoint: int = INVALID_TESTS_PER_ENDPOINT,
     tags: Optional[list] = None,
-    output_format: str = OUTPUT_FORMAT
+    output_formats: Union[str, List[str], None] = None,
+    formatter_options: Optional[dict] = None,
+    latency_baseline: Optional["LatencyBaseline"] = None,
+    coverage_seeds: Optional[List[Path]] = None,
+    coverage_rounds: int = COVERAGE_MAX_ROUNDS,
+    methods: Optional[list] = None,
+    paths: Optional[list] = None,
+    lazy_parse: Optional[bool] = None,
+    spec_cache: bool = SPEC_CACHE,
+    payload_cache: bool = PAYLOAD_CACHE,
+    few_shot_cases: Optional[List[Path]] = None,
+    few_shot_examples: int = FEW_SHOT_EXAMPLES,
+    few_shot_tokens: int = FEW_SHOT_MAX_TOKENS,
+    mutants_per_item: int = MUTANTS_PER_ITEM,
+    existing_cases: Optional[List[Path]] = None,
+    template_min_rows: int = 0
 ) -> dict:
     """
     Generate test cases from OAS specification
@@ -70,11 +109,43 @@ def generate_tests(
         valid_per_endpoint: Number of valid test cases per endpoint
         invalid_per_endpoint: Number of invalid test cases per endpoint
         tags: Filter by endpoint tags
-        output_format: Output format (json, csv, postman)
+        output_formats: Output formats written from the single generation pass
+            (any format registered in FormatterFactory, default: OUTPUT_FORMAT)
+        formatter_options: Per-format formatter options, e.g. {"postman": {"shards": 4}}
+        latency_baseline: Adds historical response-time budgets to the generated cases
+        coverage_seeds: Existing test case files; when given, generation is coverage-driven
+            and only asks the LLM for spec coverage these cases miss
+        coverage_rounds: Maximum LLM requests per endpoint in coverage-driven mode
+        methods: Filter by HTTP methods
+        paths: Filter by path glob patterns
+        lazy_parse: Only decode the parts of the spec the filters select
+            (default: for JSON specs of at least LAZY_PARSE_MIN_MB)
+        spec_cache: Reuse the endpoints parsed by an earlier run while the spec is unchanged
+        payload_cache: Build request bodies from one valid body per schema, kept across runs,
+            instead of having the LLM write each body
+        few_shot_cases: Curated test case files the prompts' few-shot examples are retrieved from
+        few_shot_examples: Examples per prompt at most (0 = none)
+        few_shot_tokens: Estimated tokens of a prompt's examples at most
+        mutants_per_item: INVALID cases derived locally from the VALID ones per endpoint,
+            kind of error and field (0 = none)
+        existing_cases: Existing test case files derived cases must not repeat, besides
+            the coverage seeds and few-shot cases
+        template_min_rows: Export cases differing only in values as data-driven templates
+            once this many share a request shape (0 = export every case in full)
     
     Returns:
         Dictionary with results
     """
+    from oas_parser import OASParser
+    from test_generator import TestCaseGenerator
+    from output_formatter import export_formats
+    from coverage_index import CoverageIndex
+    from test_executor import load_test_cases
+    from payload_cache import PayloadCache
+    from example_retriever import ExampleRetriever
+    from mutation_engine import MutationEngine
+    from case_templates import collapse, is_template
+    
     try:
         logger.info(f"Starting test case generation for {oas_file}")
         
@@ -85,41 +156,92 @@ def generate_tests(
         if llm_config is None:
             llm_config = setup_llm_config(provider)
         
+        # Parse only the selected operations; filtered out ones are never built
+        if lazy_parse is None:
+            lazy_parse = oas_file.stat().st_size >= LAZY_PARSE_MIN_MB * 1024 * 1024
+        oas_parser = OASParser(oas_file, lazy=lazy_parse, cache_dir=SPEC_CACHE_DIR if spec_cache else None)
+        oas_parser.parse(tags=tags, methods=methods, paths=paths)
+        
         # Initialize generator
+        payloads = PayloadCache(PAYLOAD_CACHE_FILE) if payload_cache else None
+        retriever = None
+        if few_shot_cases and few_shot_examples > 0:
+            curated = [tc for cases_file in few_shot_cases for tc in load_test_cases(cases_file)]
+            retriever = ExampleRetriever(curated, k=few_shot_examples, max_tokens=few_shot_tokens)
+            logger.info(f"Indexed {len(retriever)} curated test cases for few-shot examples")
+        mutations = None
+        if mutants_per_item > 0:
+            mutations = MutationEngine(oas_parser.definitions, mutants_per_item, MUTATION_MAX_BODY_BYTES)
+            # Every case file the run reads counts as existing, with or without --coverage
+            for cases_file in dict.fromkeys([*(existing_cases or []), *(coverage_seeds or []), *(few_shot_cases or [])]):
+                mutations.seed(load_test_cases(cases_file))
         generator = TestCaseGenerator(
             oas_file_path=oas_file,
             llm_provider=provider,
-            llm_config=llm_config
+            llm_config=llm_config,
+            oas_parser=oas_parser,
+            payload_cache=payloads,
+            example_retriever=retriever,
+            mutation_engine=mutations
         )
         
+        coverage_index = None
+        if coverage_seeds is not None:
+            coverage_index = CoverageIndex(generator.endpoints, generator.oas_parser.definitions)
+            for seed_file in coverage_seeds:
+                covered = coverage_index.add_all(load_test_cases(seed_file))
+                logger.info(f"Seeded coverage with {covered} items from {seed_file}")
+        
         # Generate test cases
         test_cases = generator.generate_all_tests(
             valid_cases_per_endpoint=valid_per_endpoint,
             invalid_cases_per_endpoint=invalid_per_endpoint,
             filter_tags=tags,
-            validate=True
+            validate=True,
+            coverage_index=coverage_index,
+            max_rounds=coverage_rounds
         )
         
-        # Export results
-        output_file = OUTPUT_DIR / f"generated_tests_{output_format}.{output_format if output_format != 'postman' else 'json'}"
+        if payloads is not None:
+            payloads.save()
         
-        formatter = FormatterFactory.create_formatter(output_format)
-        metadata = {
-            "projectName": generator.oas_parser.api_title,
-            "apiVersion": generator.oas_parser.api_version,
-            "baseUrl": "http://localhost:8080",
-            "oasFile": str(oas_file)
-        }
+        if latency_baseline is not None:
+            budgeted = latency_baseline.apply(test_cases)
+            logger.info(f"Added response-time budgets to {budgeted} test cases")
+        
+        exported_cases = test_cases
+        if template_min_rows > 0:
+            exported_cases = collapse(test_cases, template_min_rows)
         
-        formatted_data = formatter.format(test_cases, metadata)
-        formatter.write(output_file, formatted_data)
+        # Export results once per format from the same generation pass
+        if output_formats is None:
+            output_formats = OUTPUT_FORMATS
+        elif isinstance(output_formats, str):
+            output_formats = [output_formats]
+        
+        metadata = generator.get_export_metadata()
+        metadata["baseUrl"] = "http://localhost:8080"
+        
+        output_files = export_formats(
+            exported_cases, metadata, output_formats, OUTPUT_DIR,
+            formatter_options=formatter_options
+        )
         
         stats = generator.get_statistics()
+        if coverage_index is not None:
+            coverage = coverage_index.get_summary()
+            stats["saturated_endpoints"] = f"{coverage['saturated_endpoints']}/{coverage['total_endpoints']}"
+        if payloads is not None:
+            stats["reused_request_bodies"] = payloads.hits
+        if mutations is not None:
+            stats["derived_invalid_cases"] = mutations.derived
+        if template_min_rows > 0:
+            stats["data_driven_templates"] = len([tc for tc in exported_cases if is_template(tc)])
         
         return {
             "success": True,
             "message": f"Generated {len(test_cases)} test cases",
-            "output_file": str(output_file),
+            "output_files": {name: str(path) for name, path in output_files.items()},
             "statistics": stats
         }
     
@@ -132,99 +254,1301 @@ def generate_tests(
         }
 
 
-def main():
-    """Main entry point"""
+def load_latency_baseline(percentile: float, headroom: float) -> "LatencyBaseline":
+    """Compute response-time budgets from the results store"""
+    from results_store import ResultsStore
+    from latency_baseline import LatencyBaseline
+    
+    with ResultsStore(RESULTS_DB) as store:
+        return LatencyBaseline.from_store(store, percentile=percentile, headroom=headroom)
+
+
+def add_latency_baseline_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options controlling response-time budgets"""
+    parser.add_argument(
+        "--latency-baseline",
+        action="store_true",
+        help="Assert response times below a budget derived from past runs in the results store"
+    )
+    
+    parser.add_argument(
+        "--latency-percentile",
+        type=float,
+        default=LATENCY_PERCENTILE,
+        help="Historical latency percentile the budget is based on"
+    )
+    
+    parser.add_argument(
+        "--latency-headroom",
+        type=float,
+        default=LATENCY_HEADROOM,
+        help="Multiplier applied to the historical percentile"
+    )
+
+
+def add_profiling_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options tracing and profiling a run"""
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="FILE",
+        help="Write per-stage spans as a Chrome trace (open in chrome://tracing or ui.perfetto.dev)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run under cProfile and print the hottest functions"
+    )
+
+
+def run_profiled(args: argparse.Namespace, run, top: int = 25):
+    """Call run() with the tracing and profiling requested by add_profiling_arguments options"""
+    profiler = None
+    if args.trace:
+        from tracing import enable_tracing
+        enable_tracing()
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    try:
+        return run()
+    finally:
+        if profiler is not None:
+            import pstats
+            profiler.disable()
+            print("\n" + "="*60)
+            print(f"Top {top} functions by cumulative time:")
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(top)
+        if args.trace:
+            from tracing import disable_tracing
+            tracer = disable_tracing()
+            tracer.write(args.trace)
+            print("\n" + "="*60)
+            print(f"{'Stage':<24} {'count':>7} {'total ms':>12}")
+            for name, total in tracer.get_summary().items():
+                print(f"{name:<24} {total['count']:>7} {total['total_ms']:>12.1f}")
+            print(f"\nTrace: {args.trace}")
+
+
+def build_execution_plan(test_cases: List[dict], oas_file: Optional[Path] = None, producer_cases: Optional[List[dict]] = None):
+    """Plan shared fixtures for test cases, reading identifier fields from the OAS file if given"""
+    from oas_parser import OASParser
+    from execution_planner import ExecutionPlanner
+    
+    endpoints, definitions = [], {}
+    if oas_file:
+        oas_parser = OASParser(oas_file)
+        endpoints = oas_parser.parse()
+        definitions = oas_parser.definitions
+    
+    plan = ExecutionPlanner(endpoints, definitions).plan(test_cases, producer_cases)
+    logger.info(f"Execution plan: {plan.get_summary()}")
+    return plan
+
+
+def execute_command(argv: List[str]) -> int:
+    """Run generated test cases against the API (the "execute" subcommand)"""
     parser = argparse.ArgumentParser(
-        description="AI Test Case Generator for Hospital Management API"
+        prog="main.py execute",
+        description="Execute generated test cases against the Hospital Management API"
     )
     
     parser.add_argument(
-        "oas_file",
+        "test_cases_file",
         type=Path,
-        help="Path to OpenAPI specification file"
+        help="Generated test cases (JSON or JSONL output of the generator)"
     )
     
     parser.add_argument(
-        "--provider",
-        choices=["openai", "anthropic"],
-        default=LLM_PROVIDER,
-        help="LLM provider to use (default: openai)"
+        "--base-url",
+        default=HOSPITAL_API_BASE_URL,
+        help="Base URL of the API under test"
     )
     
     parser.add_argument(
-        "--api-key",
-        help="API key for LLM provider (overrides environment variable)"
+        "--concurrency",
+        type=int,
+        default=EXECUTOR_CONCURRENCY,
+        help="Maximum concurrent requests (and pooled connections)"
     )
     
     parser.add_argument(
-        "--model",
-        default=LLM_MODEL,
-        help="LLM model to use"
+        "--timeout",
+        type=float,
+        default=EXECUTOR_TIMEOUT,
+        help="Per-request timeout in seconds"
     )
     
     parser.add_argument(
-        "--valid-per-endpoint",
+        "--plan",
+        action="store_true",
+        help="Create shared fixtures once and bind dependent cases to them"
+    )
+    
+    parser.add_argument(
+        "--oas-file",
+        type=Path,
+        help="OpenAPI specification used by --plan to find identifier fields"
+    )
+    
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_DIR / "execution_results.jsonl",
+        help="JSONL file receiving one result per line as requests complete"
+    )
+    
+    add_latency_baseline_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    
+    from test_executor import AsyncTestExecutor, load_test_cases
+    
+    test_cases = load_test_cases(args.test_cases_file)
+    if args.latency_baseline:
+        load_latency_baseline(args.latency_percentile, args.latency_headroom).apply(test_cases)
+    
+    executor = AsyncTestExecutor(
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        timeout=args.timeout
+    )
+    
+    to_execute = build_execution_plan(test_cases, args.oas_file) if args.plan else test_cases
+    
+    logger.info(f"Executing {len(test_cases)} test cases against {args.base_url}")
+    results = executor.execute(to_execute, args.output)
+    summary = AsyncTestExecutor.summarize(results)
+    
+    print("\n" + "="*60)
+    for result in results:
+        if not result.passed:
+            print(f"✗ {result.test_id} {result.method} {result.url}: {result.error or '; '.join(result.failures)}")
+    print(f"\nResults: {args.output}")
+    print("\nSummary:")
+    for key, value in summary.items():
+        print(f"  {key}: {value}")
+    print("="*60 + "\n")
+    
+    return 0 if summary["failed"] == 0 else 1
+
+
+def load_command(argv: List[str]) -> int:
+    """Drive VALID test cases as an open-loop load test (the "load" subcommand)"""
+    parser = argparse.ArgumentParser(
+        prog="main.py load",
+        description="Run a load test built from generated VALID test cases"
+    )
+    
+    parser.add_argument(
+        "test_cases_file",
+        type=Path,
+        help="Generated test cases (JSON or JSONL output of the generator)"
+    )
+    
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        help="Only use endpoints starting with these paths (e.g. /v1/hospitais/maisProximo)"
+    )
+    
+    parser.add_argument(
+        "--weight",
+        action="append",
+        default=[],
+        metavar="PATH=WEIGHT",
+        help="Relative traffic share of an endpoint path (default: 1 per endpoint)"
+    )
+    
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=10.0,
+        help="Target requests per second"
+    )
+    
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30.0,
+        help="Run time in seconds, including the ramp"
+    )
+    
+    parser.add_argument(
+        "--ramp-up",
+        type=float,
+        default=0.0,
+        help="Seconds to ramp linearly from --start-rps to --rps"
+    )
+    
+    parser.add_argument(
+        "--start-rps",
+        type=float,
+        default=1.0,
+        help="Request rate at the start of the ramp"
+    )
+    
+    parser.add_argument(
+        "--base-url",
+        default=HOSPITAL_API_BASE_URL,
+        help="Base URL of the API under test"
+    )
+    
+    parser.add_argument(
+        "--max-connections",
         type=int,
-        default=VALID_TESTS_PER_ENDPOINT,
-        help="Number of valid test cases per endpoint"
+        default=EXECUTOR_CONCURRENCY,
+        help="Size of the keep-alive connection pool"
     )
     
     parser.add_argument(
-        "--invalid-per-endpoint",
+        "--timeout",
+        type=float,
+        default=EXECUTOR_TIMEOUT,
+        help="Per-request timeout in seconds"
+    )
+    
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Create shared fixtures first and bind the load cases to them"
+    )
+    
+    parser.add_argument(
+        "--oas-file",
+        type=Path,
+        help="OpenAPI specification used by --plan to find identifier fields"
+    )
+    
+    parser.add_argument(
+        "--seed",
         type=int,
-        default=INVALID_TESTS_PER_ENDPOINT,
-        help="Number of invalid test cases per endpoint"
+        help="Random seed for a reproducible request sequence"
     )
     
     parser.add_argument(
-        "--output-format",
-        choices=["json", "csv", "postman"],
-        default=OUTPUT_FORMAT,
-        help="Output format for test cases"
+        "--output",
+        type=Path,
+        default=OUTPUT_DIR / "load_report.json",
+        help="JSON file receiving the load report"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    import asyncio
+    from test_executor import AsyncTestExecutor, load_test_cases
+    from load_generator import LoadGenerator, LoadProfile, write_load_report
+    
+    weights = {}
+    for entry in args.weight:
+        path, _, weight = entry.rpartition("=")
+        weights[path] = float(weight)
+    
+    test_cases = load_test_cases(args.test_cases_file)
+    profile = LoadProfile.from_test_cases(test_cases, endpoints=args.endpoints, weights=weights)
+    executor = AsyncTestExecutor(
+        base_url=args.base_url,
+        concurrency=args.max_connections,
+        timeout=args.timeout
+    )
+    load_generator = LoadGenerator(
+        executor, profile,
+        target_rps=args.rps,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        start_rps=args.start_rps,
+        seed=args.seed
+    )
+    plan = None
+    if args.plan:
+        plan = build_execution_plan([tc for tc, _ in profile.entries], args.oas_file, producer_cases=test_cases)
+    
+    logger.info(f"Running load test at {args.rps} rps for {args.duration}s against {args.base_url}")
+    report = asyncio.run(load_generator.run(plan))
+    write_load_report(report, args.output)
+    
+    print("\n" + "="*60)
+    print(f"{'Endpoint':<50} {'count':>7} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for key, stats in list(report["endpoints"].items()) + [("OVERALL", report["overall"])]:
+        print(
+            f"{key:<50} {stats['count']:>7} {stats['error_rate'] * 100:>5.1f}% "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}"
+        )
+    print(f"\nAchieved: {report['achieved_rps']} rps (target {args.rps})")
+    print(f"Report: {args.output}")
+    print("="*60 + "\n")
+    
+    return 0
+
+
+def results_command(argv: List[str]) -> int:
+    """Import and query stored execution results (the "results" subcommand)"""
+    parser = argparse.ArgumentParser(
+        prog="main.py results",
+        description="Store and query test execution results"
     )
     
     parser.add_argument(
-        "--tags",
-        nargs="+",
-        help="Filter endpoints by tags"
+        "--db",
+        type=Path,
+        default=RESULTS_DB,
+        help="SQLite results database"
+    )
+    
+    actions = parser.add_subparsers(dest="action", required=True)
+    
+    import_parser = actions.add_parser("import", help="Import Postman run exports (.json) or executor results (.jsonl)")
+    import_parser.add_argument("files", nargs="+", type=Path)
+    import_parser.add_argument(
+        "--oas-file",
+        type=Path,
+        default=OAS_DOCS_DIR / "hospital-api.json",
+        help="OpenAPI specification used to map concrete URLs to endpoint templates (default: the hospital API)"
+    )
+    
+    trend_parser = actions.add_parser("trend", help="Latency per run of one endpoint")
+    trend_parser.add_argument("endpoint")
+    trend_parser.add_argument("--method")
+    trend_parser.add_argument("--last-runs", type=int)
+    
+    failures_parser = actions.add_parser("failures", help="Failure rate per endpoint across runs")
+    failures_parser.add_argument("--last-runs", type=int)
+    
+    slowest_parser = actions.add_parser("slowest", help="Tests with the highest average latency")
+    slowest_parser.add_argument("--limit", type=int, default=10)
+    slowest_parser.add_argument("--last-runs", type=int)
+    
+    actions.add_parser("summary", help="Number of stored runs and results")
+    
+    args = parser.parse_args(argv)
+    
+    from oas_parser import OASParser
+    from results_store import ResultsStore
+    
+    templates = None
+    if args.action == "import":
+        if args.oas_file.exists():
+            templates = [endpoint.path for endpoint in OASParser(args.oas_file).parse()]
+        else:
+            logger.warning(f"OAS file not found: {args.oas_file}; results keep their concrete URL paths")
+    
+    with ResultsStore(args.db, endpoint_templates=templates) as store:
+        if args.action == "import":
+            for results_file in args.files:
+                if results_file.suffix.lower() == ".jsonl":
+                    run_id = store.import_execution_results(results_file)
+                else:
+                    run_id = store.import_postman_run(results_file)
+                print(f"{results_file}: {'imported as run ' + str(run_id) if run_id else 'already imported'}")
+            rows = [store.get_summary()]
+        elif args.action == "trend":
+            rows = store.latency_trend(args.endpoint, args.method, args.last_runs)
+        elif args.action == "failures":
+            rows = store.failure_rates(args.last_runs)
+        elif args.action == "slowest":
+            rows = store.slowest_tests(args.limit, args.last_runs)
+        else:
+            rows = [store.get_summary()]
+    
+    for row in rows:
+        print(json.dumps(row))
+    
+    return 0
+
+
+def mock_command(argv: List[str]) -> int:
+    """Serve a local mock of the API described by an OAS file (the "mock" subcommand)"""
+    parser = argparse.ArgumentParser(
+        prog="main.py mock",
+        description="Serve a mock API generated from an OpenAPI specification"
     )
     
     parser.add_argument(
-        "--verbose",
+        "oas_file",
+        type=Path,
+        help="Path to OpenAPI specification file"
+    )
+    
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface to listen on"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=MOCK_SERVER_PORT,
+        help="Port to listen on"
+    )
+    
+    parser.add_argument(
+        "--base-path",
+        default="",
+        help="Prefix of every route (e.g. the spec's basePath)"
+    )
+    
+    parser.add_argument(
+        "--stateful",
         action="store_true",
-        help="Enable verbose logging"
+        help="Keep created resources in memory so CRUD sequences and 404s behave like the real API"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
-    if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
+    from oas_parser import OASParser
+    from mock_server import MockServer
     
-    # Setup LLM config
-    llm_config = None
-    if args.api_key:
-        llm_config = {
-            "api_key": args.api_key,
-            "model": args.model,
-            "temperature": LLM_TEMPERATURE
-        }
+    oas_parser = OASParser(args.oas_file)
+    mock = MockServer(oas_parser.parse(), oas_parser.oas_doc, base_path=args.base_path, stateful=args.stateful)
     
-    # Generate tests
-    result = generate_tests(
-        oas_file=args.oas_file,
-        provider=args.provider,
-        llm_config=llm_config,
-        valid_per_endpoint=args.valid_per_endpoint,
-        invalid_per_endpoint=args.invalid_per_endpoint,
-        tags=args.tags,
-        output_format=args.output_format
+    print(f"Mock of {oas_parser.api_title} listening on http://{args.host}:{args.port}{args.base_path} (Ctrl+C to stop)")
+    mock.run(args.host, args.port)
+    
+    return 0
+
+
+def select_command(argv: List[str]) -> int:
+    """Export a minimal covering subset of test cases (the "select" subcommand)"""
+    from output_formatter import FormatterFactory
+    from subset_selector import CRITERIA
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py select",
+        description="Select a small smoke subset that keeps the coverage of the full suite"
+    )
+    
+    parser.add_argument(
+        "test_cases_file",
+        type=Path,
+        help="Generated test cases (JSON or JSONL output of the generator)"
+    )
+    
+    parser.add_argument(
+        "--oas-file",
+        type=Path,
+        help="OpenAPI specification providing required fields, enum values and declared status codes"
+    )
+    
+    parser.add_argument(
+        "--criteria",
+        nargs="+",
+        choices=CRITERIA,
+        default=list(CRITERIA),
+        help="Coverage criteria the subset must keep"
     )
     
+    parser.add_argument(
+        "--output-format",
+        nargs="+",
+        choices=FormatterFactory.available_formats(),
+        default=OUTPUT_FORMATS,
+        help="Output formats for the subset"
+    )
+    
+    parser.add_argument(
+        "--output-name",
+        default="smoke_tests",
+        help="File name prefix of the exported subset"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    from oas_parser import OASParser
+    from output_formatter import export_formats
+    from test_executor import load_test_cases
+    from subset_selector import SubsetSelector
+    
+    test_cases = load_test_cases(args.test_cases_file)
+    endpoints, definitions, project_name = [], {}, "Generated API Tests"
+    if args.oas_file:
+        oas_parser = OASParser(args.oas_file)
+        endpoints = oas_parser.parse()
+        definitions = oas_parser.definitions
+        project_name = oas_parser.api_title
+    
+    subset = SubsetSelector(endpoints, definitions, args.criteria).select(test_cases)
+    summary = subset.get_summary()
+    metadata = {
+        "projectName": f"{project_name} (smoke subset)",
+        "generatedAt": datetime.now().isoformat(),
+        "sourceFile": str(args.test_cases_file),
+        "subset": summary
+    }
+    output_files = export_formats(subset.test_cases, metadata, args.output_format, OUTPUT_DIR, args.output_name)
+    
+    print("\n" + "="*60)
+    print(f"Selected {summary['selected_test_cases']} of {summary['total_test_cases']} test cases")
+    print(f"Covered requirements: {summary['covered_by_criterion']}")
+    if summary["uncovered_requirements"]:
+        print(f"\nNot covered by any test case ({len(summary['uncovered_requirements'])}):")
+        for requirement in summary["uncovered_requirements"]:
+            print(f"  {requirement}")
+    print("\nOutput files:")
+    for name, path in output_files.items():
+        print(f"  {name}: {path}")
+    print("="*60 + "\n")
+    
+    return 0
+
+
+def serve_command(argv: List[str]) -> int:
+    """Run test generation as a local HTTP service (the "serve" subcommand)"""
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Serve test generation as a local HTTP API with warm LLM clients and caches"
+    )
+    
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface to listen on"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=SERVICE_PORT,
+        help="Port to listen on"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SERVICE_WORKERS,
+        help="Generation jobs run concurrently"
+    )
+    
+    parser.add_argument(
+        "--provider",
+        choices=["openai", "anthropic", "ollama"],
+        default=LLM_PROVIDER,
+        help="LLM provider of jobs that do not name one"
+    )
+    
+    parser.add_argument(
+        "--payload-cache",
+        action=argparse.BooleanOptionalAction,
+        default=PAYLOAD_CACHE,
+        help="Reuse one valid request body per schema across jobs"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    from llm_processor import LLMFactory
+    from generation_service import GenerationService
+    
+    def create_provider(provider: str, model: str):
+        return LLMFactory.create_provider(provider, **setup_llm_config(provider, model=model))
+    
+    service = GenerationService(
+        create_provider, OUTPUT_DIR, workers=args.workers, default_provider=args.provider,
+        payload_cache=args.payload_cache
+    )
+    
+    print(f"Generation service listening on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    service.run(args.host, args.port)
+    
+    return 0
+
+
+def multi_command(argv: List[str]) -> int:
+    """Generate test cases for many specs in one run (the "multi" subcommand)"""
+    from output_formatter import FormatterFactory
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py multi",
+        description="Generate test cases for every spec under directories or glob patterns, with one concurrency and rate budget"
+    )
+    
+    parser.add_argument(
+        "sources",
+        nargs="+",
+        help="Spec files, directories (searched recursively) or glob patterns, e.g. 'oas_docs/**/*.yaml'"
+    )
+    
+    parser.add_argument(
+        "--provider",
+        choices=["openai", "anthropic"],
+        default=LLM_PROVIDER,
+        help="LLM provider to use"
+    )
+    
+    parser.add_argument(
+        "--model",
+        default=LLM_MODEL,
+        help="LLM model to use"
+    )
+    
+    parser.add_argument(
+        "--valid-per-endpoint",
+        type=int,
+        default=VALID_TESTS_PER_ENDPOINT,
+        help="Number of valid test cases per endpoint"
+    )
+    
+    parser.add_argument(
+        "--invalid-per-endpoint",
+        type=int,
+        default=INVALID_TESTS_PER_ENDPOINT,
+        help="Number of invalid test cases per endpoint"
+    )
+    
+    parser.add_argument(
+        "--output-format",
+        nargs="+",
+        choices=FormatterFactory.available_formats(),
+        default=OUTPUT_FORMATS,
+        help="Output formats written for each spec"
+    )
+    
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=OUTPUT_DIR / "multi",
+        help="Directory receiving index.json and one directory per spec"
+    )
+    
+    parser.add_argument(
+        "--tags",
+        nargs="+",
+        help="Filter endpoints by tags"
+    )
+    
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        help="Filter endpoints by HTTP methods"
+    )
+    
+    parser.add_argument(
+        "--paths",
+        nargs="+",
+        help="Filter endpoints by path glob patterns"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=GENERATION_CONCURRENCY,
+        help="Endpoints generated at the same time, across all specs"
+    )
+    
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=LLM_RATE_LIMIT_RPM,
+        help="LLM requests per minute, across all specs (0 = unlimited)"
+    )
+    
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        help="Processes parsing specs (default: one per CPU)"
+    )
+    
+    parser.add_argument(
+        "--lazy-parse",
+        action="store_true",
+        help="Only decode the parts of JSON specs the filters select"
+    )
+    
+    parser.add_argument(
+        "--no-spec-cache",
+        action="store_true",
+        help="Parse the specs again instead of reusing the endpoints cached by an earlier run"
+    )
+    
+    parser.add_argument(
+        "--payload-cache",
+        action=argparse.BooleanOptionalAction,
+        default=PAYLOAD_CACHE,
+        help="Reuse one valid request body per schema and have the LLM write only per-case changes"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    from llm_processor import LLMFactory
+    from multi_spec import MultiSpecGenerator
+    from payload_cache import PayloadCache
+    
+    generator = MultiSpecGenerator(
+        LLMFactory.create_provider(args.provider, **setup_llm_config(args.provider, model=args.model)),
+        args.output_dir,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rate_limit,
+        parse_workers=args.parse_workers,
+        cache_dir=SPEC_CACHE_DIR if SPEC_CACHE and not args.no_spec_cache else None,
+        payload_cache=PayloadCache(PAYLOAD_CACHE_FILE) if args.payload_cache else None,
+        provider_name=args.provider
+    )
+    index = generator.run(
+        args.sources,
+        valid_per_endpoint=args.valid_per_endpoint,
+        invalid_per_endpoint=args.invalid_per_endpoint,
+        tags=args.tags,
+        methods=args.methods,
+        paths=args.paths,
+        lazy=args.lazy_parse,
+        output_formats=args.output_format
+    )
+    
+    print("\n" + "="*60)
+    for spec in index["specs"]:
+        if spec["error"]:
+            print(f"✗ {spec['name']}: {spec['error']}")
+        else:
+            print(f"✓ {spec['name']}: {spec['testCases']} test cases for {spec['endpoints']} endpoints")
+    totals = index["totals"]
+    print(f"\n{totals['testCases']} test cases for {totals['specs']} specs ({totals['failed']} failed)")
+    print(f"Index: {index['indexFile']}")
+    print("="*60 + "\n")
+    
+    return 1 if totals["failed"] else 0
+
+
+def bench_command(argv: List[str]) -> int:
+    """Benchmark the pipeline on synthetic specs (the "bench" subcommand)"""
+    from benchmark import SIZES, VERSIONS, FORMATS, STAGES
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py bench",
+        description="Time each pipeline stage on synthetic specs with a zero-latency LLM provider"
+    )
+    
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=SIZES,
+        help="Operation counts of the synthetic specs"
+    )
+    
+    parser.add_argument(
+        "--versions",
+        nargs="+",
+        choices=VERSIONS,
+        default=VERSIONS,
+        help="Specification versions to benchmark"
+    )
+    
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        default=FORMATS,
+        help="Output formats written by the format stage"
+    )
+    
+    parser.add_argument(
+        "--ref-depth",
+        type=int,
+        default=5,
+        help="Length of the $ref chain below every resource schema"
+    )
+    
+    parser.add_argument(
+        "--enum-size",
+        type=int,
+        default=100,
+        help="Number of values of each large enum"
+    )
+    
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the tracemalloc pass recording peak memory"
+    )
+    
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BENCHMARK_BASELINE,
+        help="Committed results the run is compared against"
+    )
+    
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=BENCHMARK_THRESHOLD,
+        help="Allowed slowdown or memory growth over the baseline (0.5 = 50%%)"
+    )
+    
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results as the new baseline instead of comparing"
+    )
+    
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_DIR / "benchmark.json",
+        help="JSON file receiving the results"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    from benchmark import run_benchmarks, compare_to_baseline
+    
+    results = run_benchmarks(
+        sizes=args.sizes,
+        versions=args.versions,
+        formats=args.formats,
+        ref_depth=args.ref_depth,
+        enum_size=args.enum_size,
+        measure_memory=not args.no_memory
+    )
+    
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    
+    print("\n" + "="*60)
+    print(f"{'Scenario':<16} " + " ".join(f"{stage:>14}" for stage in STAGES))
+    for name, stages in results["scenarios"].items():
+        print(f"{name:<16} " + " ".join(f"{stages[stage]['time_ms']:>11.1f} ms" for stage in STAGES))
+        if not args.no_memory:
+            print(f"{'  peak':<16} " + " ".join(f"{stages[stage]['peak_kb'] / 1024:>11.1f} MB" for stage in STAGES))
+    print(f"\nResults: {args.output}")
+    
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline updated: {args.baseline}")
+        print("="*60 + "\n")
+        return 0
+    
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create it")
+        print("="*60 + "\n")
+        return 0
+    
+    regressions = compare_to_baseline(
+        results, json.loads(args.baseline.read_text(encoding="utf-8")), threshold=args.threshold
+    )
+    if regressions:
+        print(f"\nRegressions against {args.baseline}:")
+        for regression in regressions:
+            print(f"  ✗ {regression}")
+    else:
+        print(f"\n✓ Within {args.threshold:.0%} of {args.baseline}")
+    print("="*60 + "\n")
+    
+    return 1 if regressions else 0
+
+
+def bench_llm_command(argv: List[str]) -> int:
+    """Compare LLM providers and models on a fixed endpoint set (the "bench-llm" subcommand)"""
+    parser = argparse.ArgumentParser(
+        prog="main.py bench-llm",
+        description="Compare latency, throughput, valid-case yield and cost of LLM providers and models"
+    )
+    
+    parser.add_argument(
+        "--target",
+        nargs="+",
+        required=True,
+        metavar="PROVIDER:MODEL",
+        help="Targets to compare, e.g. openai:gpt-4 ollama:llama3:8b-instruct replay:cassettes/gpt-4.jsonl"
+    )
+    
+    parser.add_argument(
+        "--oas-file",
+        type=Path,
+        default=OAS_DOCS_DIR / "hospital-api.json",
+        help="Specification providing the endpoint set"
+    )
+    
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        help="Only use endpoints starting with these paths"
+    )
+    
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help="Times each endpoint is prompted per target"
+    )
+    
+    parser.add_argument(
+        "--valid-per-endpoint",
+        type=int,
+        default=VALID_TESTS_PER_ENDPOINT,
+        help="VALID cases requested per prompt"
+    )
+    
+    parser.add_argument(
+        "--invalid-per-endpoint",
+        type=int,
+        default=INVALID_TESTS_PER_ENDPOINT,
+        help="INVALID cases requested per prompt"
+    )
+    
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=4000,
+        help="Output token limit of every call"
+    )
+    
+    parser.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="Record live calls as replay cassettes in this directory"
+    )
+    
+    parser.add_argument(
+        "--price",
+        action="append",
+        default=[],
+        metavar="MODEL=INPUT,OUTPUT",
+        help="USD per million input and output tokens of a model (overrides the built-in table)"
+    )
+    
+    parser.add_argument(
+        "--output-name",
+        default="llm_benchmark",
+        help="File name prefix of the JSON and Markdown reports"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    from oas_parser import OASParser
+    from llm_processor import LLMFactory
+    from llm_benchmark import LLMBenchmark, RecordingProvider, ReplayProvider, MODEL_PRICES, format_markdown
+    
+    prices = dict(MODEL_PRICES)
+    for entry in args.price:
+        model, _, price = entry.rpartition("=")
+        input_price, output_price = price.split(",")
+        prices[model] = (float(input_price), float(output_price))
+    
+    endpoints = OASParser(args.oas_file).parse()
+    if args.endpoints:
+        endpoints = [e for e in endpoints if any(e.path.startswith(prefix) for prefix in args.endpoints)]
+    benchmark = LLMBenchmark(
+        endpoints,
+        num_valid=args.valid_per_endpoint,
+        num_invalid=args.invalid_per_endpoint,
+        max_tokens=args.max_tokens,
+        repeats=args.repeats
+    )
+    
+    summaries = []
+    for target in args.target:
+        provider_name, _, model = target.partition(":")
+        try:
+            if provider_name == "replay":
+                provider = ReplayProvider(model)
+                model = provider.model
+            else:
+                provider = LLMFactory.create_provider(provider_name, **setup_llm_config(provider_name, model=model))
+                model = model or getattr(provider, "model", "")
+                if args.record:
+                    cassette = args.record / f"{provider_name}_{model.replace(':', '_').replace('/', '_')}.jsonl"
+                    provider = RecordingProvider(provider, cassette)
+        except Exception as e:
+            logger.error(f"Skipping {target}: {e}")
+            continue
+        summaries.append(benchmark.run_target(target, provider_name, model, provider).get_summary(prices))
+    
+    report = {
+        "oasFile": str(args.oas_file),
+        "endpoints": [f"{e.method} {e.path}" for e in endpoints],
+        "repeats": args.repeats,
+        "maxTokens": args.max_tokens,
+        "targets": summaries
+    }
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    json_path = OUTPUT_DIR / f"{args.output_name}.json"
+    markdown_path = OUTPUT_DIR / f"{args.output_name}.md"
+    json_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    markdown_path.write_text(format_markdown(summaries), encoding="utf-8")
+    
+    print("\n" + "="*60)
+    print(format_markdown(summaries))
+    print(f"Reports: {json_path}, {markdown_path}")
+    print("="*60 + "\n")
+    
+    return 0 if summaries else 1
+
+
+COMMANDS = {
+    "execute": execute_command,
+    "load": load_command,
+    "results": results_command,
+    "mock": mock_command,
+    "select": select_command,
+    "serve": serve_command,
+    "multi": multi_command,
+    "bench": bench_command,
+    "bench-llm": bench_llm_command
+}
+
+
+def profile_startup_command(argv: List[str], limit: int = 20) -> int:
+    """Print the import time of each module a command loads (main.py --profile-startup ...)"""
+    from startup_profiler import profile_startup
+    
+    report = profile_startup(Path(__file__), argv)
+    for line in report["stderr"]:
+        print(line, file=sys.stderr)
+    
+    print("\n" + "="*60)
+    print(f"{'Module':<40} {'self ms':>9} {'total ms':>9}")
+    for timing in report["top_level"][:limit]:
+        print(f"{timing.module:<40} {timing.self_us / 1000:>9.1f} {timing.cumulative_us / 1000:>9.1f}")
+    print(f"\nImports: {report['import_ms']} ms ({report['modules']} modules)")
+    print(f"Wall time: {report['wall_ms']} ms (exit code {report['returncode']})")
+    print("="*60 + "\n")
+    
+    return report["returncode"]
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] == "--profile-startup":
+        sys.exit(profile_startup_command(sys.argv[2:]))
+    
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        sys.exit(COMMANDS[sys.argv[1]](sys.argv[2:]))
+    
+    from output_formatter import FormatterFactory
+    
+    parser = argparse.ArgumentParser(
+        description="AI Test Case Generator for Hospital Management API",
+        epilog=(
+            f"Other commands: {', '.join(COMMANDS)} (run 'main.py COMMAND --help'). "
+            "Prefix any command line with --profile-startup to time its imports."
+        )
+    )
+    
+    parser.add_argument(
+        "oas_file",
+        type=Path,
+        help="Path to OpenAPI specification file"
+    )
+    
+    parser.add_argument(
+        "--provider",
+        choices=["openai", "anthropic"],
+        default=LLM_PROVIDER,
+        help="LLM provider to use (default: openai)"
+    )
+    
+    parser.add_argument(
+        "--api-key",
+        help="API key for LLM provider (overrides environment variable)"
+    )
+    
+    parser.add_argument(
+        "--model",
+        default=LLM_MODEL,
+        help="LLM model to use"
+    )
+    
+    parser.add_argument(
+        "--valid-per-endpoint",
+        type=int,
+        default=VALID_TESTS_PER_ENDPOINT,
+        help="Number of valid test cases per endpoint"
+    )
+    
+    parser.add_argument(
+        "--invalid-per-endpoint",
+        type=int,
+        default=INVALID_TESTS_PER_ENDPOINT,
+        help="Number of invalid test cases per endpoint"
+    )
+    
+    parser.add_argument(
+        "--output-format",
+        nargs="+",
+        choices=FormatterFactory.available_formats(),
+        default=OUTPUT_FORMATS,
+        help="Output formats for test cases (all written from one generation pass)"
+    )
+    
+    parser.add_argument(
+        "--postman-shards",
+        type=int,
+        default=POSTMAN_SHARDS,
+        help="Split the Postman collection into N balanced collections for parallel runners"
+    )
+    
+    parser.add_argument(
+        "--postman-timings",
+        nargs="+",
+        type=Path,
+        default=[],
+        help="Postman run exports used to weight shards by historical request time"
+    )
+    
+    parser.add_argument(
+        "--tags",
+        nargs="+",
+        help="Filter endpoints by tags"
+    )
+    
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        help="Filter endpoints by HTTP methods"
+    )
+    
+    parser.add_argument(
+        "--paths",
+        nargs="+",
+        help="Filter endpoints by path glob patterns, e.g. '/v1/hospitais*'"
+    )
+    
+    parser.add_argument(
+        "--lazy-parse",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=f"Only decode the parts of a JSON spec the filters select (default: specs of {LAZY_PARSE_MIN_MB:g} MB or more)"
+    )
+    
+    parser.add_argument(
+        "--no-spec-cache",
+        action="store_true",
+        help="Parse the spec again instead of reusing the endpoints cached by an earlier run"
+    )
+    
+    parser.add_argument(
+        "--payload-cache",
+        action=argparse.BooleanOptionalAction,
+        default=PAYLOAD_CACHE,
+        help="Reuse one valid request body per schema and have the LLM write only per-case changes"
+    )
+    
+    parser.add_argument(
+        "--few-shot",
+        type=int,
+        default=FEW_SHOT_EXAMPLES,
+        help="Curated test cases added to each prompt as examples, e.g. 3 (default: 0 = none)"
+    )
+    
+    parser.add_argument(
+        "--few-shot-tokens",
+        type=int,
+        default=FEW_SHOT_MAX_TOKENS,
+        help="Estimated tokens of a prompt's examples at most"
+    )
+    
+    parser.add_argument(
+        "--few-shot-cases",
+        nargs="+",
+        type=Path,
+        default=[MANUAL_TESTS_DIR / "test_cases.json"],
+        help="Curated test case files (JSON or JSONL) the examples are retrieved from"
+    )
+    
+    parser.add_argument(
+        "--templates",
+        action="store_true",
+        help=f"Export cases differing only in values as one data-driven template each "
+             f"(Postman: one request plus an iteration data file) once {TEMPLATE_MIN_ROWS} share a request"
+    )
+    
+    parser.add_argument(
+        "--mutants",
+        type=int,
+        default=MUTANTS_PER_ITEM,
+        help="INVALID cases derived from the VALID ones per endpoint, kind of error and field, e.g. 1 (default: 0 = none)"
+    )
+    
+    add_latency_baseline_arguments(parser)
+    
+    parser.add_argument(
+        "--coverage",
+        action="store_true",
+        help="Only ask the LLM for spec coverage existing cases miss; skip saturated endpoints"
+    )
+    
+    parser.add_argument(
+        "--seed-cases",
+        nargs="+",
+        type=Path,
+        default=[MANUAL_TESTS_DIR / "test_cases.json"],
+        help="Existing test case files (JSON or JSONL) seeding --coverage; --mutants never repeats them"
+    )
+    
+    parser.add_argument(
+        "--coverage-rounds",
+        type=int,
+        default=COVERAGE_MAX_ROUNDS,
+        help="Maximum LLM requests per endpoint with --coverage"
+    )
+    
+    add_profiling_arguments(parser)
+    
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging"
+    )
+    
+    args = parser.parse_args()
+    
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    
+    # Setup LLM config
+    llm_config = None
+    if args.api_key:
+        llm_config = {
+            "api_key": args.api_key,
+            "model": args.model,
+            "temperature": LLM_TEMPERATURE
+        }
+    
+    # Generate tests
+    result = run_profiled(args, lambda: generate_tests(
+        oas_file=args.oas_file,
+        provider=args.provider,
+        llm_config=llm_config,
+        valid_per_endpoint=args.valid_per_endpoint,
+        invalid_per_endpoint=args.invalid_per_endpoint,
+        tags=args.tags,
+        output_formats=args.output_format,
+        formatter_options={
+            "postman": {
+                "shards": args.postman_shards,
+                "timing_reports": args.postman_timings
+            }
+        },
+        latency_baseline=(
+            load_latency_baseline(args.latency_percentile, args.latency_headroom)
+            if args.latency_baseline else None
+        ),
+        coverage_seeds=[f for f in args.seed_cases if f.exists()] if args.coverage else None,
+        coverage_rounds=args.coverage_rounds,
+        methods=args.methods,
+        paths=args.paths,
+        lazy_parse=args.lazy_parse,
+        spec_cache=SPEC_CACHE and not args.no_spec_cache,
+        payload_cache=args.payload_cache,
+        few_shot_cases=[f for f in args.few_shot_cases if f.exists()],
+        few_shot_examples=args.few_shot,
+        few_shot_tokens=args.few_shot_tokens,
+        mutants_per_item=args.mutants,
+        existing_cases=[f for f in args.seed_cases if f.exists()],
+        template_min_rows=TEMPLATE_MIN_ROWS if args.templates else 0
+    ))
+    
     # Print results
     print("\n" + "="*60)
     if result["success"]:
         print(f"✓ {result['message']}")
-        print(f"\nOutput: {result['output_file']}")
+        print(f"\nOutput:")
+        for name, path in result["output_files"].items():
+            print(f"  {name}: {path}")
         print(f"\nStatistics:")
         for key, value in result["statistics"].items():
             print(f"  {key}: {value}")
@@ -0,0 +1,230 @@
+"""
+Benchmark - Time and peak memory of each pipeline stage on synthetic specs
+
+Runs parse, prompt build, generation (with a zero-latency LLM provider),
+validation and formatting on synthetic Swagger 2.0 and OpenAPI 3 specs of
+growing size. Each stage is timed in a plain pass and measured for peak
+memory in a second pass under tracemalloc, so tracing overhead does not
+distort the timings. Results can be compared against a committed baseline.
+"""
+import gc
+import json
+import time
+import logging
+import tempfile
+import tracemalloc
+from typing import Dict, List, Any, Optional, Union, Callable
+from pathlib import Path
+
+from oas_parser import OASParser
+from llm_processor import LLMProvider, LLMResponse
+from test_generator import TestCaseGenerator, TestCaseValidator
+from output_formatter import export_formats
+from synthetic_spec import build_synthetic_spec
+
+logger = logging.getLogger(__name__)
+
+SIZES = [10, 100, 1000, 10000]
+VERSIONS = ["swagger2", "oas3"]
+STAGES = ["parse", "prompt_build", "generate", "validate", "format"]
+FORMATS = ["json", "jsonl", "csv", "postman"]
+
+
+class ZeroLatencyProvider(LLMProvider):
+    """LLM provider answering instantly with valid and invalid cases for the prompted endpoint"""
+    
+    def __init__(self, valid: int = 3, invalid: int = 3):
+        """
+        Initialize zero-latency provider
+        
+        Args:
+            valid: VALID cases returned per prompt
+            invalid: INVALID cases returned per prompt
+        """
+        self.valid = valid
+        self.invalid = invalid
+    
+    def generate_response(self, prompt: str, max_tokens: int = 2000) -> LLMResponse:
+        """Return cases for the path and method named in the prompt"""
+        path = prompt.split("Path: ", 1)[1].split("\n", 1)[0]
+        method = prompt.split("Method: ", 1)[1].split("\n", 1)[0]
+        test_cases = [
+            {
+                "testId": f"{method}-{path}-{index}",
+                "endpoint": path,
+                "method": method,
+                "category": "VALID" if index < self.valid else "INVALID",
+                "description": f"Synthetic case {index}",
+                "priority": "MEDIUM",
+                "requestHeaders": {"Content-Type": "application/json"},
+                "pathParams": {"id": 1} if "{id}" in path else {},
+                "queryParams": {},
+                "requestBody": {"name": "synthetic", "code": "ABC-1234", "status": "STATUS_0"} if method in ("POST", "PUT") else None,
+                "expectedStatusCode": 200 if index < self.valid else 400,
+                "expectedResponseFields": [],
+                "assertions": ["status code matches"]
+            }
+            for index in range(self.valid + self.invalid)
+        ]
+        return LLMResponse(content=json.dumps({"testCases": test_cases}), model="zero-latency")
+    
+    def parse_json_response(self, response: LLMResponse) -> Dict[str, Any]:
+        """Parse JSON response"""
+        return json.loads(response.content)
+
+
+def measure(stage: Callable[[], Any], trace_memory: bool) -> Dict[str, Any]:
+    """
+    Run one stage
+    
+    Returns:
+        Dictionary with the stage's return value, wall time in ms and, when
+        trace_memory is set, the peak of memory allocated during it in KB
+    """
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        value = stage()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024 if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return {"value": value, "time_ms": elapsed_ms, "peak_kb": peak_kb}
+
+
+def run_pipeline(
+    spec_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    formats: List[str],
+    trace_memory: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every pipeline stage once on a spec file
+    
+    Returns:
+        Stage name -> {"time_ms", "peak_kb"}
+    """
+    results = {}
+    
+    def _parse():
+        oas_parser = OASParser(spec_path)
+        oas_parser.parse()
+        return oas_parser
+    
+    parsed = measure(_parse, trace_memory)
+    generator = TestCaseGenerator(spec_path, llm_provider=ZeroLatencyProvider(), oas_parser=parsed["value"])
+    results["parse"] = parsed
+    
+    results["prompt_build"] = measure(lambda: [
+        generator.llm_processor.build_test_generation_prompt(generator.build_endpoint_info(endpoint), 3, 3)
+        for endpoint in generator.endpoints
+    ], trace_memory)
+    
+    generated = measure(lambda: [
+        test_case
+        for endpoint in generator.endpoints
+        for test_case in generator.generate_tests_for_endpoint(endpoint, 3, 3)
+    ], trace_memory)
+    results["generate"] = generated
+    test_cases = generated["value"]
+    
+    results["validate"] = measure(
+        lambda: [tc for tc in test_cases if TestCaseValidator.validate_test_case(tc)[0]],
+        trace_memory
+    )
+    
+    metadata = generator.get_export_metadata()
+    results["format"] = measure(lambda: export_formats(test_cases, metadata, formats, output_dir), trace_memory)
+    
+    return {stage: {"time_ms": r["time_ms"], "peak_kb": r["peak_kb"]} for stage, r in results.items()}
+
+
+def run_benchmarks(
+    sizes: Optional[List[int]] = None,
+    versions: Optional[List[str]] = None,
+    formats: Optional[List[str]] = None,
+    ref_depth: int = 5,
+    enum_size: int = 100,
+    measure_memory: bool = True
+) -> Dict[str, Any]:
+    """
+    Benchmark the pipeline on synthetic specs
+    
+    Args:
+        sizes: Operation counts of the synthetic specs
+        versions: Spec versions ("swagger2", "oas3")
+        formats: Output formats written by the format stage
+        ref_depth: Length of the $ref chain below every resource schema
+        enum_size: Number of values of each large enum
+        measure_memory: Run a second pass per spec to record peak memory
+    
+    Returns:
+        Dictionary with the benchmark settings and, per scenario ("<version>-<size>"),
+        the time and peak memory of every stage
+    """
+    sizes = sizes or SIZES
+    versions = versions or VERSIONS
+    formats = formats or FORMATS
+    scenarios = {}
+    
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as work_dir:
+        for version in versions:
+            for size in sizes:
+                name = f"{version}-{size}"
+                spec_path = Path(work_dir) / f"{name}.json"
+                spec_path.write_text(json.dumps(build_synthetic_spec(size, version, ref_depth, enum_size)), encoding="utf-8")
+                
+                timings = run_pipeline(spec_path, Path(work_dir) / name, formats)
+                if measure_memory:
+                    memory = run_pipeline(spec_path, Path(work_dir) / name, formats, trace_memory=True)
+                scenarios[name] = {
+                    stage: {
+                        "time_ms": round(timings[stage]["time_ms"], 2),
+                        "peak_kb": round(memory[stage]["peak_kb"], 1) if measure_memory else None
+                    }
+                    for stage in STAGES
+                }
+                logger.info(f"Benchmarked {name}: " + ", ".join(f"{s} {timings[s]['time_ms']:.1f} ms" for s in STAGES))
+    
+    return {
+        "settings": {"ref_depth": ref_depth, "enum_size": enum_size, "formats": formats},
+        "scenarios": scenarios
+    }
+
+
+def compare_to_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.5,
+    min_time_ms: float = 5.0,
+    min_peak_kb: float = 256.0
+) -> List[str]:
+    """
+    Find stages slower or hungrier than the baseline allows
+    
+    A stage regresses when it exceeds its baseline value by more than the threshold
+    (0.5 = 50%) and by more than an absolute noise floor. Scenarios and stages the
+    baseline does not contain are skipped.
+    
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for name, stages in results["scenarios"].items():
+        for stage, measured in stages.items():
+            expected = baseline.get("scenarios", {}).get(name, {}).get(stage)
+            if not expected:
+                continue
+            for metric, unit, floor in (("time_ms", "ms", min_time_ms), ("peak_kb", "KB", min_peak_kb)):
+                if measured.get(metric) is None or expected.get(metric) is None:
+                    continue
+                limit = max(expected[metric] * (1 + threshold), expected[metric] + floor)
+                if measured[metric] > limit:
+                    regressions.append(
+                        f"{name} {stage}: {measured[metric]:.1f} {unit} exceeds baseline "
+                        f"{expected[metric]:.1f} {unit} by more than {threshold:.0%}"
+                    )
+    return regressions
@@ -0,0 +1,207 @@
+"""
+Case Templates - Data-driven test cases: one request template plus a table of values
+
+Parameter sweeps (e.g. a grid of coordinates on /v1/hospitais/maisProximo)
+produce many cases that repeat the endpoint, headers and most of the body.
+A templated case stores that request once, with {{name}} placeholders
+(Postman's variable syntax), and a "data" table with one column per
+placeholder and one row per case:
+    
+    {
+        "testId": "{{testId}}",
+        "endpoint": "/v1/hospitais/maisProximo",
+        "method": "GET",
+        "queryParams": {"latitude": "{{latitude}}", "longitude": "{{longitude}}"},
+        "expectedStatusCode": "{{expectedStatusCode}}",
+        ...
+        "data": {"columns": ["testId", "latitude", "longitude", "expectedStatusCode"],
+                 "rows": [["NEAR-001", -23.5, -46.6, 200], ...]}
+    }
+
+A value that is exactly one placeholder takes the row's value with its type;
+placeholders inside longer strings are replaced by the value's text. A template
+whose testId has no placeholder gets the row number appended.
+"""
+import re
+import copy
+import json
+from typing import Dict, List, Any, Iterator, Iterable, Tuple
+
+PLACEHOLDER = re.compile(r"\{\{([^{}]+)\}\}")
+
+# Request parts whose fields become columns individually
+TEMPLATE_PARTS = ("pathParams", "queryParams", "requestHeaders", "requestBody")
+
+SCALARS = (str, int, float, bool, type(None))
+
+
+def is_template(test_case: Dict[str, Any]) -> bool:
+    """Whether a test case is a template with a data table"""
+    return isinstance(test_case.get("data"), dict) and "rows" in test_case["data"]
+
+
+def template_rows(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Get the rows of a template's data table as column -> value dicts"""
+    columns = template["data"].get("columns") or []
+    return [dict(zip(columns, row)) for row in template["data"]["rows"]]
+
+
+def _slots(value: Any, path: Tuple = ()) -> List[Tuple[Tuple, str]]:
+    """Find the strings holding placeholders in a value, with their key paths"""
+    if isinstance(value, str):
+        return [(path, value)] if "{{" in value else []
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return []
+    return [slot for key, item in items for slot in _slots(item, path + (key,))]
+
+
+def _fill(text: str, row: Dict[str, Any]) -> Any:
+    """Replace the placeholders in a string with a row's values"""
+    match = PLACEHOLDER.fullmatch(text)
+    if match and match.group(1) in row:
+        return row[match.group(1)]
+    return PLACEHOLDER.sub(lambda m: str(row[m.group(1)]) if m.group(1) in row else m.group(0), text)
+
+
+def expand_template(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand a template into one test case per row
+    
+    The placeholders are located once. Each case gets its own copy of the
+    dicts and lists holding placeholders; values without any are shared
+    between the cases of a template, so treat them as read-only.
+    
+    Returns:
+        Test cases in row order
+    """
+    request = {key: value for key, value in template.items() if key != "data"}
+    slots = _slots(request)
+    containers = sorted({path[:end] for path, _ in slots for end in range(1, len(path))}, key=len)
+    numbered = not PLACEHOLDER.search(str(request.get("testId", "")))
+    
+    test_cases = []
+    for number, row in enumerate(template_rows(template), start=1):
+        test_case = dict(request)
+        for path in containers:
+            parent = test_case
+            for key in path[:-1]:
+                parent = parent[key]
+            parent[path[-1]] = copy.copy(parent[path[-1]])
+        for path, text in slots:
+            parent = test_case
+            for key in path[:-1]:
+                parent = parent[key]
+            parent[path[-1]] = _fill(text, row)
+        if numbered:
+            test_case["testId"] = f"{test_case.get('testId', 'TC')}-{number:03d}"
+        test_cases.append(test_case)
+    return test_cases
+
+
+def iter_expanded(test_cases: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield test cases with every template expanded in place, one row at a time"""
+    for test_case in test_cases:
+        if is_template(test_case):
+            yield from expand_template(test_case)
+        else:
+            yield test_case
+
+
+def expand_templates(test_cases: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Expand every template in a list of test cases"""
+    return list(iter_expanded(test_cases))
+
+
+def count_cases(test_cases: Iterable[Dict[str, Any]]) -> int:
+    """Count test cases, counting each row of a template"""
+    return sum(len(tc["data"]["rows"]) if is_template(tc) else 1 for tc in test_cases)
+
+
+def _leaves(test_case: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the top-level fields of a case, with request parts split into their fields"""
+    leaves = {}
+    for key, value in test_case.items():
+        if key in TEMPLATE_PARTS and isinstance(value, dict):
+            leaves.update({f"{key}.{name}": item for name, item in value.items()})
+        else:
+            leaves[key] = value
+    return leaves
+
+
+def _shape(test_case: Dict[str, Any], leaves: Dict[str, Any]) -> str:
+    """Get what must be equal for cases to share a template: fields, parts and non-scalar values"""
+    return json.dumps(
+        [
+            test_case.get("method"),
+            test_case.get("endpoint"),
+            sorted(leaves),
+            [key for key in TEMPLATE_PARTS if isinstance(test_case.get(key), dict)],
+            {key: value for key, value in leaves.items() if not isinstance(value, SCALARS)}
+        ],
+        sort_keys=True,
+        default=str
+    )
+
+
+def _column_names(paths: List[str]) -> Dict[str, str]:
+    """Name columns by their field name, or by their full path where two field names clash"""
+    short = [path.split(".", 1)[-1] for path in paths]
+    return {path: name if short.count(name) == 1 else path for path, name in zip(paths, short)}
+
+
+def collapse(test_cases: List[Dict[str, Any]], min_rows: int = 3) -> List[Dict[str, Any]]:
+    """
+    Replace groups of cases differing only in scalar values with templates
+    
+    Cases of one method and endpoint that have the same fields and the same
+    non-scalar values (e.g. a parameter sweep) become one template whose columns
+    are the fields that vary. A template takes the place of its group's first
+    case; smaller groups and templates already present are kept as they are.
+    
+    Args:
+        test_cases: Expanded or partly templated test cases
+        min_rows: Cases a group needs to become a template
+    
+    Returns:
+        Test cases and templates; expanding them gives back the same cases, each
+        group's at the position of its first case
+    """
+    groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for position, test_case in enumerate(test_cases):
+        if is_template(test_case):
+            continue
+        leaves = _leaves(test_case)
+        groups.setdefault(_shape(test_case, leaves), []).append((position, leaves))
+    
+    templates: Dict[int, Dict[str, Any]] = {}
+    grouped = set()
+    for members in groups.values():
+        if len(members) < max(2, min_rows):
+            continue
+        first = members[0][1]
+        paths = [path for path in first if any(leaves[path] != first[path] for _, leaves in members)]
+        names = _column_names(paths)
+        
+        template = copy.deepcopy(test_cases[members[0][0]])
+        for path in paths:
+            part, _, name = path.partition(".")
+            if part in TEMPLATE_PARTS and name:
+                template[part][name] = "{{" + names[path] + "}}"
+            else:
+                template[path] = "{{" + names[path] + "}}"
+        template["data"] = {
+            "columns": [names[path] for path in paths],
+            "rows": [[leaves[path] for path in paths] for _, leaves in members]
+        }
+        templates[members[0][0]] = template
+        grouped.update(position for position, _ in members)
+    
+    return [
+        templates.get(position, test_case)
+        for position, test_case in enumerate(test_cases)
+        if position in templates or position not in grouped
+    ]
@@ -0,0 +1,286 @@
+"""
+Coverage Index - Tracks which parts of each endpoint's spec test cases exercise
+
+Every endpoint gets a fixed list of coverage items: each declared parameter
+and top-level body field sent at least once, each required one left out,
+each constraint class violated (below minimum, too long, invalid enum, ...)
+and each declared non-5xx response code expected. Items are bit positions,
+so a test case becomes one integer mask and coverage checks are bitwise.
+"""
+import re
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from oas_parser import Endpoint, parse_status_code
+from schema_resolver import SchemaResolver
+from endpoint_index import PLACEHOLDER, PathRouter, path_shape
+
+logger = logging.getLogger(__name__)
+
+CONSTRAINT_DESCRIPTIONS = {
+    "present": "send {location}",
+    "missing": "omit required {location}",
+    "wrong_type": "send {location} with the wrong type",
+    "below_minimum": "send {location} below its minimum",
+    "above_maximum": "send {location} above its maximum",
+    "too_short": "send {location} shorter than its minimum length",
+    "too_long": "send {location} longer than its maximum length",
+    "pattern_mismatch": "send {location} not matching its pattern",
+    "invalid_enum": "send {location} outside its allowed values"
+}
+
+
+def constraint_violations(value: Any, constraints: Dict[str, Any], from_string: bool) -> List[str]:
+    """
+    Get the constraint classes a value violates
+    
+    Args:
+        value: Parameter or body field value
+        constraints: Field constraints as returned by endpoint_fields
+        from_string: Whether the value is sent as text (path, query and header
+            parameters), so numbers and booleans are parsed from strings
+    """
+    field_type = constraints.get('type')
+    number = value
+    if field_type in ('integer', 'number'):
+        if from_string and isinstance(value, str):
+            try:
+                number = int(value) if field_type == 'integer' else float(value)
+            except ValueError:
+                return ["wrong_type"]
+        if isinstance(number, bool) or not isinstance(number, (int, float)) \
+                or (field_type == 'integer' and isinstance(number, float) and not number.is_integer()):
+            return ["wrong_type"]
+    elif field_type == 'boolean' and not isinstance(value, bool) \
+            and not (from_string and str(value).lower() in ('true', 'false')):
+        return ["wrong_type"]
+    
+    violations = []
+    if isinstance(number, (int, float)) and not isinstance(number, bool):
+        if constraints.get('minimum') is not None and number < constraints['minimum']:
+            violations.append("below_minimum")
+        if constraints.get('maximum') is not None and number > constraints['maximum']:
+            violations.append("above_maximum")
+    if isinstance(value, str):
+        if constraints.get('minLength') is not None and len(value) < constraints['minLength']:
+            violations.append("too_short")
+        if constraints.get('maxLength') is not None and len(value) > constraints['maxLength']:
+            violations.append("too_long")
+        if constraints.get('pattern') and not re.search(constraints['pattern'], value):
+            violations.append("pattern_mismatch")
+    if constraints.get('enum') and value not in constraints['enum']:
+        violations.append("invalid_enum")
+    return violations
+
+
+def endpoint_fields(endpoint: Endpoint, resolver: Optional[SchemaResolver] = None) -> List[Tuple[str, Dict[str, Any], bool]]:
+    """
+    Get the parameters and top-level body fields of an endpoint with their constraints
+    
+    Returns:
+        (location, constraints, required) per field, where location is e.g.
+        "query.latitude" or "body.name"
+    """
+    resolver = resolver or SchemaResolver()
+    fields = []
+    for param in endpoint.parameters or []:
+        if param.in_ not in ('path', 'query', 'header'):
+            continue
+        constraints = {
+            "type": param.data_type,
+            "minimum": param.minimum,
+            "maximum": param.maximum,
+            "minLength": param.min_length,
+            "maxLength": param.max_length,
+            "pattern": param.pattern,
+            "enum": param.enum_values
+        }
+        fields.append((f"{param.in_}.{param.name}", constraints, param.required))
+    
+    body_schema = resolver.resolve(endpoint.request_body_schema or {})
+    required = set(endpoint.request_required_fields or body_schema.get('required', []))
+    for name, property_schema in (body_schema.get('properties') or {}).items():
+        fields.append((f"body.{name}", resolver.resolve(property_schema), name in required))
+    return fields
+
+
+class EndpointCoverage:
+    """Coverage items of one endpoint and the bitset of those covered so far"""
+    
+    def __init__(self, endpoint: Endpoint, fields: List[Tuple[str, Dict[str, Any], bool]]):
+        """
+        Initialize endpoint coverage
+        
+        Args:
+            endpoint: Endpoint the items belong to
+            fields: (location, constraints, required) for every parameter and top-level body field,
+                    where location is e.g. "query.latitude" or "body.name"
+        """
+        self.endpoint = endpoint
+        self.fields = fields
+        
+        self.placeholders = [
+            PLACEHOLDER.match(s).group(1) for s in endpoint.path.split('/') if PLACEHOLDER.match(s)
+        ]
+        
+        # Path parameters are always sent, so only their constraint classes are tracked
+        items = []
+        for location, constraints, required in fields:
+            if not location.startswith("path."):
+                items.append(f"present:{location}")
+                if required:
+                    items.append(f"missing:{location}")
+            items.extend(f"{constraint}:{location}" for constraint in self._constraint_classes(constraints))
+        items.extend(
+            f"status:{response.status_code}"
+            for response in endpoint.responses or []
+            if response.status_code < 500
+        )
+        
+        self.items = list(dict.fromkeys(items))
+        self.bits = {item: 1 << index for index, item in enumerate(self.items)}
+        self.full = (1 << len(self.items)) - 1
+        self.covered = 0
+        self.test_cases = 0
+    
+    @property
+    def saturated(self) -> bool:
+        """Whether every coverage item is covered"""
+        return self.covered & self.full == self.full
+    
+    def missing(self) -> List[str]:
+        """Get the coverage items no test case covers yet"""
+        return [item for item in self.items if not self.covered & self.bits[item]]
+    
+    def mask(self, test_case: Dict[str, Any], path_values: Optional[Dict[str, str]] = None) -> int:
+        """
+        Get the bitset of the coverage items one test case covers
+        
+        Args:
+            test_case: Test case
+            path_values: Spec placeholder name -> path segment of the test case's endpoint,
+                which holds the value when the endpoint is a concrete path
+        """
+        # Placeholder names may differ from the spec ({hospital_id} vs {id}); match them by position
+        path_params = test_case.get('pathParams') or {}
+        case_placeholders = [
+            PLACEHOLDER.match(s).group(1) for s in test_case.get('endpoint', '/').split('/') if PLACEHOLDER.match(s)
+        ]
+        concrete = {name: value for name, value in (path_values or {}).items() if not PLACEHOLDER.match(value)}
+        sources = {
+            "path": {
+                **concrete,
+                **{spec: path_params.get(case) for case, spec in zip(case_placeholders, self.placeholders)}
+            },
+            "query": test_case.get('queryParams') or {},
+            "header": test_case.get('requestHeaders') or {},
+            "body": test_case.get('requestBody') if isinstance(test_case.get('requestBody'), dict) else {}
+        }
+        
+        mask = self.bits.get(f"status:{parse_status_code(test_case.get('expectedStatusCode'))}", 0)
+        for location, constraints, _ in self.fields:
+            source, name = location.split('.', 1)
+            value = sources.get(source, {}).get(name)
+            if value is None:
+                mask |= self.bits.get(f"missing:{location}", 0)
+                continue
+            mask |= self.bits.get(f"present:{location}", 0)
+            for violation in constraint_violations(value, constraints, from_string=source != "body"):
+                mask |= self.bits.get(f"{violation}:{location}", 0)
+        return mask
+    
+    @staticmethod
+    def _constraint_classes(constraints: Dict[str, Any]) -> List[str]:
+        """Get the constraint classes a field declares"""
+        classes = []
+        if constraints.get('type') in ('integer', 'number', 'boolean'):
+            classes.append("wrong_type")
+        for key, constraint_class in (
+            ('minimum', "below_minimum"),
+            ('maximum', "above_maximum"),
+            ('minLength', "too_short"),
+            ('maxLength', "too_long"),
+            ('pattern', "pattern_mismatch"),
+            ('enum', "invalid_enum")
+        ):
+            if constraints.get(key) is not None:
+                classes.append(constraint_class)
+        return classes
+
+
+class CoverageIndex:
+    """Spec coverage of a set of test cases, per endpoint"""
+    
+    def __init__(self, endpoints: List[Endpoint], definitions: Optional[Dict[str, Any]] = None):
+        """
+        Initialize coverage index
+        
+        Args:
+            endpoints: Parsed endpoints whose coverage is tracked
+            definitions: Schema definitions used to follow $ref in body schemas
+        """
+        self.definitions = definitions or {}
+        self.resolver = SchemaResolver(definitions=self.definitions)
+        self.coverage: Dict[Tuple[str, str], EndpointCoverage] = {
+            (endpoint.method, path_shape(endpoint.path)): EndpointCoverage(endpoint, endpoint_fields(endpoint, self.resolver))
+            for endpoint in endpoints
+        }
+        # Test cases may name the template or a concrete path, e.g. /v1/hospitais/5e1a.../estoque
+        self.router = PathRouter()
+        for (method, _), coverage in self.coverage.items():
+            operations = self.router.get(coverage.endpoint.path)
+            if operations is None:
+                operations = {}
+                self.router.add(coverage.endpoint.path, operations)
+            operations[method] = coverage
+    
+    def add(self, test_case: Dict[str, Any]) -> int:
+        """
+        Record the coverage of a test case
+        
+        Returns:
+            Number of coverage items it covered for the first time
+        """
+        route = self.router.match(test_case.get('endpoint', '/'))
+        coverage = route.value.get(test_case.get('method', 'GET').upper()) if route is not None else None
+        if coverage is None:
+            return 0
+        
+        new_bits = coverage.mask(test_case, route.params) & ~coverage.covered
+        coverage.covered |= new_bits
+        coverage.test_cases += 1
+        return bin(new_bits).count("1")
+    
+    def add_all(self, test_cases: List[Dict[str, Any]]) -> int:
+        """Record the coverage of several test cases, returning the number of newly covered items"""
+        return sum(self.add(test_case) for test_case in test_cases)
+    
+    def for_endpoint(self, endpoint: Endpoint) -> EndpointCoverage:
+        """Get the coverage of an endpoint"""
+        return self.coverage[(endpoint.method, path_shape(endpoint.path))]
+    
+    @staticmethod
+    def describe(item: str) -> str:
+        """Describe a coverage item as an instruction for test generation"""
+        kind, target = item.split(':', 1)
+        if kind == "status":
+            return f"expect status code {target}"
+        source, name = target.split('.', 1)
+        location = f"{'request body field' if source == 'body' else source + ' parameter'} {name}"
+        return CONSTRAINT_DESCRIPTIONS[kind].format(location=location)
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get summary of coverage per endpoint"""
+        endpoints = {}
+        for (method, _), coverage in self.coverage.items():
+            covered = bin(coverage.covered).count("1")
+            endpoints[f"{method} {coverage.endpoint.path}"] = {
+                "covered": covered,
+                "total": len(coverage.items),
+                "test_cases": coverage.test_cases
+            }
+        return {
+            "endpoints": endpoints,
+            "saturated_endpoints": len([c for c in self.coverage.values() if c.saturated]),
+            "total_endpoints": len(self.coverage)
+        }
@@ -0,0 +1,201 @@
+"""
+Endpoint Index - Lookups over parsed endpoints and a path-template router
+
+PathRouter compiles OAS path templates into a trie of path segments: literal
+segments are dict lookups and a {placeholder} segment matches any one
+segment, so matching a concrete URL costs one step per segment however many
+templates there are. Literal segments win over placeholders, so
+/hospitais/maisProximo is not taken for /hospitais/{id}.
+
+EndpointIndex builds the tag, method, operationId and path-prefix indexes of
+a list of endpoints, plus a router mapping concrete URLs back to them.
+"""
+import re
+import bisect
+from itertools import islice
+from urllib.parse import urlsplit
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from oas_parser import Endpoint
+
+PLACEHOLDER = re.compile(r"^\{([^/]+)\}$")
+
+
+def path_shape(path: str) -> str:
+    """
+    Normalize a path so templates with different placeholder names compare equal
+    
+    The query string is dropped and every {placeholder} segment becomes {},
+    e.g. /v1/hospitals/{hospitalId}/beds?page=2 -> /v1/hospitals/{}/beds.
+    """
+    return '/' + '/'.join('{}' if PLACEHOLDER.match(s) else s for s in path.split('?')[0].split('/') if s)
+
+
+@dataclass(slots=True)
+class RouteMatch:
+    """A template matched by a concrete path"""
+    template: str
+    value: Any
+    params: Dict[str, str]
+
+
+@dataclass(slots=True)
+class _Node:
+    """One path segment of the router trie"""
+    literals: Dict[str, "_Node"] = field(default_factory=dict)
+    placeholder: Optional["_Node"] = None
+    route: Optional[Tuple[str, List[str], Any]] = None  # template, placeholder names, value
+
+
+class PathRouter:
+    """Matches concrete paths against path templates"""
+    
+    def __init__(self):
+        """Initialize an empty router"""
+        self._root = _Node()
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def add(self, template: str, value: Any) -> None:
+        """
+        Add a template, replacing the value of an equal template
+        
+        Templates differing only in placeholder names or a trailing slash are equal.
+        """
+        node, names = self._root, []
+        for segment in self._segments(template):
+            placeholder = PLACEHOLDER.match(segment)
+            if placeholder:
+                names.append(placeholder.group(1))
+                if node.placeholder is None:
+                    node.placeholder = _Node()
+                node = node.placeholder
+            else:
+                node = node.literals.setdefault(segment, _Node())
+        if node.route is None:
+            self._size += 1
+        node.route = (template, names, value)
+    
+    def get(self, template: str) -> Optional[Any]:
+        """Get the value of a template added before, or None"""
+        node = self._root
+        for segment in self._segments(template):
+            node = node.placeholder if PLACEHOLDER.match(segment) else node.literals.get(segment)
+            if node is None:
+                return None
+        return node.route[2] if node.route else None
+    
+    def match(self, path: str) -> Optional[RouteMatch]:
+        """
+        Match a concrete path (or URL) against the templates
+        
+        Returns:
+            The matched template with its value and placeholder values, or None
+        """
+        segments = self._segments(urlsplit(path).path)
+        values: List[str] = []
+        node = self._match(self._root, segments, 0, values)
+        if node is None:
+            return None
+        template, names, value = node.route
+        return RouteMatch(template=template, value=value, params=dict(zip(names, values)))
+    
+    def _match(self, node: _Node, segments: List[str], index: int, values: List[str]) -> Optional[_Node]:
+        """Walk the trie, trying the literal child before the placeholder child"""
+        if index == len(segments):
+            return node if node.route is not None else None
+        literal = node.literals.get(segments[index])
+        if literal is not None:
+            found = self._match(literal, segments, index + 1, values)
+            if found is not None:
+                return found
+        if node.placeholder is not None:
+            values.append(segments[index])
+            found = self._match(node.placeholder, segments, index + 1, values)
+            if found is not None:
+                return found
+            values.pop()
+        return None
+    
+    @staticmethod
+    def _segments(path: str) -> List[str]:
+        """Split a path into its non-empty segments"""
+        return [s for s in path.split('/') if s]
+
+
+class EndpointIndex:
+    """Tag, method, operationId and path indexes over a list of endpoints"""
+    
+    def __init__(self, endpoints: List["Endpoint"], base_path: str = ""):
+        """
+        Build the indexes
+        
+        Args:
+            endpoints: Parsed endpoints, in spec order
+            base_path: Prefix concrete URLs may carry in front of the endpoint paths
+        """
+        self.endpoints = list(endpoints)
+        self.base_path = base_path.rstrip('/')
+        self.by_tag: Dict[str, List["Endpoint"]] = {}
+        self.by_method: Dict[str, List["Endpoint"]] = {}
+        self.by_operation_id: Dict[str, "Endpoint"] = {}
+        self.router = PathRouter()
+        self._positions = {id(endpoint): position for position, endpoint in enumerate(self.endpoints)}
+        self._paths = sorted((endpoint.path, position) for position, endpoint in enumerate(self.endpoints))
+        self._path_keys = [path for path, _ in self._paths]
+        
+        for endpoint in self.endpoints:
+            for tag in endpoint.tags or []:
+                self.by_tag.setdefault(tag, []).append(endpoint)
+            self.by_method.setdefault(endpoint.method, []).append(endpoint)
+            if endpoint.operation_id:
+                self.by_operation_id.setdefault(endpoint.operation_id, endpoint)
+            
+            operations = self.router.get(endpoint.path)
+            if operations is None:
+                operations = {}
+                self.router.add(endpoint.path, operations)
+            operations.setdefault(endpoint.method, endpoint)
+    
+    def __len__(self) -> int:
+        return len(self.endpoints)
+    
+    def with_tags(self, tags: List[str]) -> List["Endpoint"]:
+        """Get the endpoints with any of the tags, in spec order"""
+        selected = {id(e): e for tag in tags for e in self.by_tag.get(tag, [])}
+        return sorted(selected.values(), key=lambda e: self._positions[id(e)])
+    
+    def with_path_prefix(self, prefix: str) -> List["Endpoint"]:
+        """Get the endpoints whose path template starts with a prefix, in spec order"""
+        start = bisect.bisect_left(self._path_keys, prefix)
+        positions = []
+        for path, position in islice(self._paths, start, None):
+            if not path.startswith(prefix):
+                break
+            positions.append(position)
+        return [self.endpoints[position] for position in sorted(positions)]
+    
+    def match(self, url: str, method: Optional[str] = None) -> Optional["Endpoint"]:
+        """
+        Map a concrete URL (or path) to its endpoint
+        
+        Args:
+            url: URL or path, e.g. "/v1/hospitais/5e1a.../estoque"
+            method: HTTP method; without it, the first endpoint of the matched path is returned
+        
+        Returns:
+            Matching endpoint, or None
+        """
+        path = urlsplit(url).path or "/"
+        route = self.router.match(path)
+        if route is None and self.base_path and path.startswith(self.base_path + "/"):
+            route = self.router.match(path[len(self.base_path):])
+        if route is None:
+            return None
+        if method is None:
+            return next(iter(route.value.values()))
+        return route.value.get(method.upper())
@@ -0,0 +1,157 @@
+"""
+Example Retriever - Picks few-shot examples for a prompt from curated test cases
+
+Human-verified test cases (e.g. manual_testing/test_cases.json) are indexed
+once with BM25 over their method, path, description and category. For each
+endpoint the best-scoring cases are added to the prompt as examples, up to k
+cases and a token budget, so the prompt size stays bounded however large the
+corpus grows. Path placeholders are normalized, so /v1/hospitais/{hospital_id}
+in the corpus matches /v1/hospitais/{id} in the spec, and cases of the same
+route rank first.
+"""
+import re
+import json
+import math
+from collections import Counter
+from typing import Dict, List, Any, Tuple, TYPE_CHECKING
+
+from endpoint_index import path_shape
+
+if TYPE_CHECKING:
+    from oas_parser import Endpoint
+
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Fields of an example shown in the prompt; ids, headers and assertions are left out to save tokens
+EXAMPLE_FIELDS = (
+    "method", "endpoint", "category", "description", "pathParams",
+    "queryParams", "requestBody", "expectedStatusCode"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the tokens of a text (about 4 characters per token for JSON and English)"""
+    return len(text) // 4 + 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase words, splitting camelCase and dropping numbers"""
+    return [word.lower() for word in _WORD.findall(text or "") if not word.isdigit()]
+
+
+def route_terms(method: str, path: str) -> List[str]:
+    """
+    Get the terms of an operation's method and path
+    
+    Besides the method and the words of the path, the path's shape (placeholders
+    normalized) and the method plus shape are terms of their own, so cases of the
+    same route, then of the same path, outrank cases that only share words.
+    """
+    shape = path_shape(path)
+    words = [word for s in shape.split("/") if s and s != "{}" for word in tokenize(s)]
+    return [method.lower()] + words + [f"path:{shape}", f"route:{method.upper()} {shape}"]
+
+
+class ExampleRetriever:
+    """BM25 index over curated test cases"""
+    
+    def __init__(self, test_cases: List[Dict[str, Any]], k: int = 3, max_tokens: int = 600,
+                 k1: float = 1.2, b: float = 0.75):
+        """
+        Index test cases
+        
+        Args:
+            test_cases: Curated test cases (JSON formatter structure)
+            k: Examples per prompt at most
+            max_tokens: Estimated tokens of all examples of a prompt at most
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.k = k
+        self.max_tokens = max_tokens
+        self.k1 = k1
+        self.b = b
+        self.examples: List[Dict[str, Any]] = []
+        self.texts: List[str] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}  # term -> (example, term frequency)
+        self._lengths: List[int] = []
+        
+        for test_case in test_cases:
+            example = {name: test_case[name] for name in EXAMPLE_FIELDS if test_case.get(name) not in (None, {}, [])}
+            terms = self.case_terms(test_case)
+            position = len(self.examples)
+            self.examples.append(example)
+            self.texts.append(json.dumps(example, ensure_ascii=False, separators=(",", ":")))
+            self._lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                self._postings.setdefault(term, []).append((position, frequency))
+        
+        self._average_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+    
+    def __len__(self) -> int:
+        return len(self.examples)
+    
+    @staticmethod
+    def case_terms(test_case: Dict[str, Any]) -> List[str]:
+        """Get the indexed terms of a test case"""
+        return (
+            route_terms(str(test_case.get("method", "")), str(test_case.get("endpoint", "")))
+            + tokenize(test_case.get("description", ""))
+            + [str(test_case.get("category", "")).lower()]
+        )
+    
+    @staticmethod
+    def endpoint_terms(endpoint: "Endpoint") -> List[str]:
+        """Get the query terms of an endpoint"""
+        return (
+            route_terms(endpoint.method, endpoint.path)
+            + tokenize(endpoint.summary)
+            + tokenize(endpoint.description)
+            + [word for tag in endpoint.tags or [] for word in tokenize(tag)]
+        )
+    
+    def search(self, terms: List[str]) -> List[Tuple[int, float]]:
+        """
+        Score the examples against query terms with BM25
+        
+        Returns:
+            (example position, score) pairs, best first; examples sharing no term are left out
+        """
+        scores: Dict[int, float] = {}
+        count = len(self.examples)
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[position] / self._average_length)
+                scores[position] = scores.get(position, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    
+    def select(self, endpoint: "Endpoint") -> List[Dict[str, Any]]:
+        """
+        Pick the examples for an endpoint's prompt
+        
+        The best-scoring examples are taken alternately from the VALID and INVALID
+        ones, so both kinds are shown, while they fit in k and max_tokens.
+        """
+        ranked = self.search(self.endpoint_terms(endpoint))
+        by_category = [
+            [position for position, _ in ranked if self.examples[position].get("category") == "VALID"],
+            [position for position, _ in ranked if self.examples[position].get("category") != "VALID"]
+        ]
+        if by_category[1] and (not by_category[0] or ranked[0][0] == by_category[1][0]):
+            by_category.reverse()  # start with the kind of the best match
+        
+        selected, tokens = [], 0
+        while len(selected) < self.k and any(by_category):
+            for positions in by_category:
+                if not positions or len(selected) >= self.k:
+                    continue
+                position = positions.pop(0)
+                cost = estimate_tokens(self.texts[position])
+                if tokens + cost <= self.max_tokens:
+                    selected.append(self.examples[position])
+                    tokens += cost
+        return selected
@@ -0,0 +1,217 @@
+"""
+Execution Planner - Orders test cases by the resources they depend on
+
+A path placeholder such as {hospitalId} in /v1/hospitais/{hospitalId}/estoque
+is produced by a POST on the collection path before it (/v1/hospitais/).
+The planner turns these producer/consumer relations into a DAG of shared
+fixtures and the test cases that consume them.
+"""
+import logging
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, field
+
+from oas_parser import Endpoint, parse_status_code
+from schema_resolver import SchemaResolver
+from endpoint_index import PLACEHOLDER, path_shape
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Fixture:
+    """A resource created once before the test cases that need it"""
+    key: str
+    collection_path: str
+    producer_case: Dict[str, Any]
+    id_field: str = "id"
+    parent: Optional[str] = None  # key of the fixture this resource is created under
+    parents: Dict[str, str] = field(default_factory=dict)  # producer placeholder -> ancestor fixture key
+    isolated_for: Optional[str] = None  # testId of the destructive case owning this fixture
+
+
+@dataclass
+class PlannedCase:
+    """A test case together with the fixtures bound to its path placeholders"""
+    test_case: Dict[str, Any]
+    bindings: Dict[str, str] = field(default_factory=dict)  # placeholder -> fixture key
+
+
+@dataclass
+class ExecutionPlan:
+    """Fixtures (parents before children) and the planned test cases"""
+    fixtures: List[Fixture] = field(default_factory=list)
+    cases: List[PlannedCase] = field(default_factory=list)
+    unresolved: List[str] = field(default_factory=list)  # collection paths without a producer
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get summary of the plan"""
+        return {
+            "fixtures": len(self.fixtures),
+            "shared_fixtures": len([f for f in self.fixtures if f.isolated_for is None]),
+            "isolated_fixtures": len([f for f in self.fixtures if f.isolated_for is not None]),
+            "test_cases": len(self.cases),
+            "bound_test_cases": len([c for c in self.cases if c.bindings]),
+            "unresolved_collections": self.unresolved
+        }
+
+
+class ExecutionPlanner:
+    """Builds execution plans from generated test cases"""
+    
+    DESTRUCTIVE_METHODS = {"DELETE"}
+    
+    def __init__(
+        self,
+        endpoints: Optional[List[Endpoint]] = None,
+        definitions: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize execution planner
+        
+        Args:
+            endpoints: Parsed endpoints, used to find identifier fields in producer responses
+            definitions: Schema definitions used to follow $ref in response schemas
+        """
+        self.endpoints = endpoints or []
+        self.definitions = definitions or {}
+        self.resolver = SchemaResolver(definitions=self.definitions)
+    
+    def plan(
+        self,
+        test_cases: List[Dict[str, Any]],
+        producer_cases: Optional[List[Dict[str, Any]]] = None
+    ) -> ExecutionPlan:
+        """
+        Build an execution plan
+        
+        Only VALID cases, cases that give no path parameter values, and derived
+        cases whose mutation is not on the path (their path values are copied from
+        a VALID case) are bound to fixtures. Other cases keep their literal path
+        parameters, since a malformed or unknown ID is what they test; so do cases
+        expecting 404.
+        Destructive cases get their own fixture for the resource they remove;
+        parent resources stay shared.
+        
+        Args:
+            test_cases: Test cases to plan
+            producer_cases: Cases searched for fixture producers (default: test_cases)
+        """
+        plan = ExecutionPlan()
+        producers = self._find_producers(producer_cases if producer_cases is not None else test_cases)
+        fixtures: Dict[str, Fixture] = {}
+        
+        for test_case in test_cases:
+            segments = self._segments(test_case.get('endpoint', '/'))
+            placeholders = [(i, PLACEHOLDER.match(s).group(1)) for i, s in enumerate(segments) if PLACEHOLDER.match(s)]
+            
+            if not placeholders or not self._bindable(test_case):
+                plan.cases.append(PlannedCase(test_case))
+                continue
+            
+            bindings = {}
+            parent_key = None
+            for position, (index, name) in enumerate(placeholders):
+                collection = path_shape('/'.join(segments[:index]))
+                producer = producers.get(collection)
+                if producer is None:
+                    if collection not in plan.unresolved:
+                        plan.unresolved.append(collection)
+                    break
+                
+                isolated_for = None
+                if position == len(placeholders) - 1 and test_case.get('method', 'GET').upper() in self.DESTRUCTIVE_METHODS:
+                    isolated_for = str(test_case.get('testId', id(test_case)))
+                
+                parent_key = self._add_fixture(fixtures, plan, collection, producer, parent_key, isolated_for)
+                bindings[name] = parent_key
+            
+            plan.cases.append(PlannedCase(test_case, bindings))
+        
+        logger.info(f"Planned {len(plan.cases)} test cases with {len(plan.fixtures)} fixtures")
+        return plan
+    
+    @staticmethod
+    def _bindable(test_case: Dict[str, Any]) -> bool:
+        """Whether a case's path placeholders may be bound to fixtures instead of its own values"""
+        if parse_status_code(test_case.get('expectedStatusCode')) == 404:
+            return False
+        if test_case.get('category') == 'VALID':
+            return True
+        mutation = test_case.get('mutation')
+        if mutation and not mutation.partition(':')[2].startswith('path.'):
+            return True
+        path_params = test_case.get('pathParams') or {}
+        return not any(value not in (None, "") for value in path_params.values())
+    
+    def _add_fixture(
+        self,
+        fixtures: Dict[str, Fixture],
+        plan: ExecutionPlan,
+        collection: str,
+        producer: Dict[str, Any],
+        parent_key: Optional[str],
+        isolated_for: Optional[str]
+    ) -> str:
+        """Add (or reuse) the fixture for a collection below the given parent fixture"""
+        key = f"{collection}@{parent_key or 'root'}#{isolated_for or 'shared'}"
+        if key in fixtures:
+            return key
+        
+        producer_placeholders = [
+            PLACEHOLDER.match(s).group(1)
+            for s in self._segments(producer.get('endpoint', '/'))
+            if PLACEHOLDER.match(s)
+        ]
+        chain = []
+        ancestor = parent_key
+        while ancestor is not None:
+            chain.insert(0, ancestor)
+            ancestor = fixtures[ancestor].parent
+        
+        fixture = Fixture(
+            key=key,
+            collection_path=collection,
+            producer_case=producer,
+            id_field=self._id_field(collection),
+            parent=parent_key,
+            parents=dict(zip(producer_placeholders, chain)),
+            isolated_for=isolated_for
+        )
+        fixtures[key] = fixture
+        plan.fixtures.append(fixture)
+        return key
+    
+    def _find_producers(self, test_cases: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Map each collection path to a VALID creation case that can produce its resources"""
+        producers = {}
+        for test_case in test_cases:
+            if test_case.get('method', '').upper() != 'POST' or test_case.get('category') != 'VALID':
+                continue
+            if not 200 <= (parse_status_code(test_case.get('expectedStatusCode')) or 0) < 300:
+                continue
+            if not isinstance(test_case.get('requestBody'), dict):
+                continue
+            collection = path_shape(test_case.get('endpoint', '/'))
+            producers.setdefault(collection, test_case)
+        return producers
+    
+    def _id_field(self, collection: str) -> str:
+        """Find the identifier field in the success response of a collection's POST"""
+        for endpoint in self.endpoints:
+            if endpoint.method != 'POST' or path_shape(endpoint.path) != collection:
+                continue
+            for response in sorted(endpoint.responses or [], key=lambda r: r.status_code):
+                if not 200 <= response.status_code < 300 or not response.schema:
+                    continue
+                properties = self.resolver.resolve(response.schema).get('properties', {})
+                if 'id' in properties:
+                    return 'id'
+                for name in properties:
+                    if name.lower().endswith('id'):
+                        return name
+        return 'id'
+    
+    @staticmethod
+    def _segments(path: str) -> List[str]:
+        """Split a path into its non-empty segments"""
+        return [s for s in path.split('?')[0].split('/') if s]
@@ -0,0 +1,341 @@
+"""
+Generation Service - Test case generation as a long-running local HTTP API
+
+Jobs (a spec plus generation options) are queued and run by a fixed number
+of workers, so several specs are generated concurrently. Provider clients,
+parsed specs and LLM responses are created once and reused by every job,
+instead of being rebuilt by each CLI invocation.
+
+Endpoints:
+    POST /jobs               Submit {"oas_file": path} or {"spec": document} with options
+    GET  /jobs               List jobs
+    GET  /jobs/{id}          Job status, statistics and output files
+    GET  /jobs/{id}/results  Generated test cases as JSON lines, streamed as endpoints finish
+    GET  /health             Warm providers, cached specs and LLM cache statistics
+"""
+import json
+import uuid
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from aiohttp import web
+
+from oas_parser import OASParser
+from llm_processor import LLMProvider, CachedLLMProvider
+from test_generator import TestCaseGenerator
+from output_formatter import FormatterFactory, export_formats
+from payload_cache import PayloadCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GenerationJob:
+    """A queued or running generation request"""
+    id: str
+    oas_file: str
+    provider: str
+    model: str = ""
+    valid_per_endpoint: int = 3
+    invalid_per_endpoint: int = 3
+    tags: Optional[List[str]] = None
+    output_formats: List[str] = field(default_factory=lambda: ["json"])
+    status: str = "queued"  # queued, running, done or failed
+    submitted_at: str = ""
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    test_cases: List[Dict[str, Any]] = field(default_factory=list)
+    statistics: Dict[str, Any] = field(default_factory=dict)
+    output_files: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    
+    @property
+    def finished(self) -> bool:
+        """Whether the job has completed or failed"""
+        return self.status in ("done", "failed")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the job status without its test cases"""
+        return {
+            "id": self.id,
+            "oas_file": self.oas_file,
+            "provider": self.provider,
+            "model": self.model,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "test_cases": len(self.test_cases),
+            "statistics": self.statistics,
+            "output_files": self.output_files,
+            "error": self.error
+        }
+
+
+class GenerationService:
+    """Job queue and warm state behind the generation HTTP API"""
+    
+    def __init__(
+        self,
+        provider_factory: Callable[[str, str], LLMProvider],
+        output_dir: Union[str, Path],
+        workers: int = 2,
+        default_provider: str = "openai",
+        payload_cache: bool = False
+    ):
+        """
+        Initialize generation service
+        
+        Args:
+            provider_factory: Creates an LLM provider from a provider name and model
+                (empty model = configured default); called once per pair
+            output_dir: Directory receiving each job's files (in jobs/<id>/)
+                and specs submitted inline (in specs/)
+            workers: Jobs run concurrently
+            default_provider: Provider used by jobs that do not name one
+            payload_cache: Share one valid request body per schema between jobs, so
+                prompts ask only for per-case changes to it
+        """
+        self.provider_factory = provider_factory
+        self.output_dir = Path(output_dir)
+        self.workers = max(1, workers)
+        self.default_provider = default_provider
+        
+        self.jobs: Dict[str, GenerationJob] = {}
+        self._providers: Dict[Tuple[str, str], CachedLLMProvider] = {}
+        self._specs: Dict[str, Tuple[int, Future]] = {}  # resolved path -> (mtime, parsed spec)
+        self.payload_cache = PayloadCache() if payload_cache else None
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._changed: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application"""
+        app = web.Application()
+        app.router.add_post("/jobs", self.handle_submit)
+        app.router.add_get("/jobs", self.handle_list)
+        app.router.add_get("/jobs/{job_id}", self.handle_status)
+        app.router.add_get("/jobs/{job_id}/results", self.handle_results)
+        app.router.add_get("/health", self.handle_health)
+        app.on_startup.append(self._start_workers)
+        app.on_cleanup.append(self._stop_workers)
+        return app
+    
+    def run(self, host: str = "127.0.0.1", port: int = 8100) -> None:
+        """Serve the API until interrupted"""
+        web.run_app(self.create_app(), host=host, port=port, access_log=None, print=None)
+    
+    async def _start_workers(self, app: web.Application) -> None:
+        """Start the job workers"""
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="generation")
+        self._queue = asyncio.Queue()
+        self._changed = asyncio.Condition()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Generation service started with {self.workers} workers")
+    
+    async def _stop_workers(self, app: web.Application) -> None:
+        """Stop the job workers"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def submit(self, request: Dict[str, Any]) -> GenerationJob:
+        """
+        Queue a generation job
+        
+        Raises:
+            ValueError: If the request names no existing spec or an unknown output format
+        """
+        if "spec" in request:
+            oas_file = self._store_inline_spec(request["spec"])
+        elif request.get("oas_file") and Path(request["oas_file"]).is_file():
+            oas_file = Path(request["oas_file"])
+        else:
+            raise ValueError("Request needs an existing 'oas_file' or an inline 'spec'")
+        
+        output_formats = request.get("output_formats") or ["json"]
+        unknown = set(output_formats) - set(FormatterFactory.available_formats())
+        if unknown:
+            raise ValueError(f"Unknown output formats: {', '.join(sorted(unknown))}")
+        
+        job = GenerationJob(
+            id=uuid.uuid4().hex[:12],
+            oas_file=str(oas_file),
+            provider=request.get("provider") or self.default_provider,
+            model=request.get("model") or "",
+            valid_per_endpoint=int(request.get("valid_per_endpoint", 3)),
+            invalid_per_endpoint=int(request.get("invalid_per_endpoint", 3)),
+            tags=request.get("tags"),
+            output_formats=output_formats,
+            submitted_at=datetime.now().isoformat()
+        )
+        self.jobs[job.id] = job
+        self._queue.put_nowait(job)
+        logger.info(f"Queued job {job.id} for {job.oas_file}")
+        return job
+    
+    def get_provider(self, name: str, model: str = "") -> CachedLLMProvider:
+        """Get the warm provider for a name and model, creating it on first use"""
+        with self._lock:
+            key = (name.lower(), model)
+            if key not in self._providers:
+                self._providers[key] = CachedLLMProvider(self.provider_factory(name, model))
+            return self._providers[key]
+    
+    def get_spec(self, oas_file: Union[str, Path]) -> OASParser:
+        """
+        Get the parsed spec of a file, parsing it again only after it changes
+        
+        The first job needing a spec parses it outside the service lock, so jobs
+        for other specs are not held up; concurrent jobs for the same spec wait
+        for that parse. A changed file replaces its previous entry.
+        """
+        path = Path(oas_file).resolve()
+        mtime = path.stat().st_mtime_ns
+        with self._lock:
+            entry = self._specs.get(str(path))
+            parsing = entry is None or entry[0] != mtime
+            if parsing:
+                entry = self._specs[str(path)] = (mtime, Future())
+        future = entry[1]
+        
+        if parsing:
+            try:
+                oas_parser = OASParser(path)
+                oas_parser.parse()
+                future.set_result(oas_parser)
+            except Exception as e:
+                with self._lock:
+                    if self._specs.get(str(path)) is entry:
+                        del self._specs[str(path)]
+                future.set_exception(e)
+        return future.result()
+    
+    def _store_inline_spec(self, spec: Dict[str, Any]) -> Path:
+        """Write a submitted spec document to disk once per distinct content"""
+        content = json.dumps(spec, sort_keys=True)
+        path = self.output_dir / "specs" / f"{hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]}.json"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        return path
+    
+    async def _worker(self) -> None:
+        """Run queued jobs one at a time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = datetime.now().isoformat()
+            try:
+                await loop.run_in_executor(self._pool, self._run_job, job, loop)
+                job.status = "done"
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = datetime.now().isoformat()
+                await self._notify()
+                self._queue.task_done()
+    
+    def _run_job(self, job: GenerationJob, loop: asyncio.AbstractEventLoop) -> None:
+        """Generate and export one job's test cases (runs in a worker thread)"""
+        generator = TestCaseGenerator(
+            job.oas_file,
+            llm_provider=self.get_provider(job.provider, job.model),
+            oas_parser=self.get_spec(job.oas_file),
+            payload_cache=self.payload_cache
+        )
+        generator.llm_provider_name = job.provider
+        
+        def _on_cases(endpoint, test_cases):
+            job.test_cases.extend(test_cases)
+            asyncio.run_coroutine_threadsafe(self._notify(), loop)
+        
+        generator.generate_all_tests(
+            valid_cases_per_endpoint=job.valid_per_endpoint,
+            invalid_cases_per_endpoint=job.invalid_per_endpoint,
+            filter_tags=job.tags,
+            on_cases=_on_cases
+        )
+        
+        output_files = export_formats(
+            generator.generated_test_cases,
+            generator.get_export_metadata(),
+            job.output_formats,
+            self.output_dir / "jobs" / job.id
+        )
+        job.output_files = {name: str(path) for name, path in output_files.items()}
+        job.statistics = generator.get_statistics()
+    
+    async def _notify(self) -> None:
+        """Wake up result streams waiting for new test cases"""
+        async with self._changed:
+            self._changed.notify_all()
+    
+    def _get_job(self, request: web.Request) -> GenerationJob:
+        """Get the job named in the request path"""
+        job = self.jobs.get(request.match_info["job_id"])
+        if job is None:
+            raise web.HTTPNotFound(text=json.dumps({"error": "Job not found"}), content_type="application/json")
+        return job
+    
+    async def handle_submit(self, request: web.Request) -> web.Response:
+        """POST /jobs"""
+        try:
+            job = self.submit(await request.json())
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        return web.json_response(job.to_dict(), status=202)
+    
+    async def handle_list(self, request: web.Request) -> web.Response:
+        """GET /jobs"""
+        return web.json_response([job.to_dict() for job in self.jobs.values()])
+    
+    async def handle_status(self, request: web.Request) -> web.Response:
+        """GET /jobs/{id}"""
+        return web.json_response(self._get_job(request).to_dict())
+    
+    async def handle_results(self, request: web.Request) -> web.StreamResponse:
+        """GET /jobs/{id}/results"""
+        job = self._get_job(request)
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(job.test_cases) > sent or job.finished)
+            pending = job.test_cases[sent:]
+            if pending:
+                await response.write("".join(json.dumps(tc) + "\n" for tc in pending).encode("utf-8"))
+                sent += len(pending)
+            if job.finished and sent == len(job.test_cases):
+                break
+        
+        await response.write_eof()
+        return response
+    
+    async def handle_health(self, request: web.Request) -> web.Response:
+        """GET /health"""
+        return web.json_response({
+            "status": "ok",
+            "queued_jobs": self._queue.qsize(),
+            "providers": {
+                f"{name}:{model or 'default'}": provider.get_stats()
+                for (name, model), provider in self._providers.items()
+            },
+            "cached_specs": len(self._specs),
+            "payload_cache": self.payload_cache.get_stats() if self.payload_cache is not None else None
+        })
@@ -0,0 +1,83 @@
+"""
+Latency Baseline - Response-time budgets derived from historical run results
+"""
+import math
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from results_store import ResultsStore
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyBaseline:
+    """Per-endpoint response-time budgets added to generated test cases"""
+    
+    def __init__(self, budgets: Dict[Tuple[str, str], int]):
+        """
+        Initialize latency baseline
+        
+        Args:
+            budgets: Maximum response time (ms) per (method, endpoint)
+        """
+        self.budgets = budgets
+    
+    @classmethod
+    def from_store(
+        cls,
+        store: ResultsStore,
+        percentile: float = 95.0,
+        headroom: float = 1.5,
+        min_samples: int = 5,
+        min_budget_ms: float = 50.0,
+        last_runs: Optional[int] = None
+    ) -> "LatencyBaseline":
+        """
+        Compute budgets from the latencies of passed requests in a results store
+        
+        Args:
+            store: Results store holding past runs
+            percentile: Historical latency percentile the budget is based on
+            headroom: Multiplier applied to the percentile
+            min_samples: Endpoints with fewer recorded requests get no budget
+            min_budget_ms: Lower bound of every budget, so very fast endpoints do not flake
+            last_runs: Only use the most recent runs
+        """
+        budgets = {}
+        for key, latencies in store.endpoint_latencies(last_runs=last_runs).items():
+            if len(latencies) < min_samples:
+                continue
+            budgets[key] = math.ceil(max(min_budget_ms, cls.percentile(latencies, percentile) * headroom))
+        
+        logger.info(f"Computed response-time budgets for {len(budgets)} endpoints")
+        return cls(budgets)
+    
+    @staticmethod
+    def percentile(values: List[float], percentile: float) -> float:
+        """Get the nearest-rank percentile of a list of values"""
+        ordered = sorted(values)
+        rank = max(1, math.ceil(len(ordered) * percentile / 100))
+        return ordered[rank - 1]
+    
+    def budget_for(self, method: str, endpoint: str) -> Optional[int]:
+        """Get the response-time budget (ms) of an endpoint, if known"""
+        return self.budgets.get((method.upper(), endpoint))
+    
+    def apply(self, test_cases: List[Dict[str, Any]]) -> int:
+        """
+        Add a maxResponseTimeMs budget to test cases of endpoints with history
+        
+        Budgets already present on a test case are kept.
+        
+        Returns:
+            Number of test cases that received a budget
+        """
+        applied = 0
+        for test_case in test_cases:
+            if 'maxResponseTimeMs' in test_case:
+                continue
+            budget = self.budget_for(test_case.get('method', 'GET'), test_case.get('endpoint', '/'))
+            if budget is not None:
+                test_case['maxResponseTimeMs'] = budget
+                applied += 1
+        return applied
@@ -0,0 +1,210 @@
+"""
+Lazy JSON - Decodes members of large JSON objects only when they are used
+
+A LazyObject scans one JSON object of a document's text and remembers where
+each member value starts and ends. Values are decoded on first access with the
+C-accelerated json decoder, one at a time, so only the members that are
+actually used are ever materialized. Objects named in a layout are themselves
+scanned as LazyObjects, e.g. "paths" and "definitions" of an OAS document.
+
+Skipped values are never decoded. In indented documents the end of a member
+is found from the line holding the next member (JSON strings cannot contain
+raw newlines, so the search cannot land inside one); otherwise a regular
+expression that tracks brackets and strings matches the value. Syntax errors
+inside a skipped value are only reported when it is decoded.
+"""
+import re
+import json
+from json.decoder import scanstring
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_INDENT = re.compile(r'[ \t]*')
+
+# Patterns are written so each position can only match one way (no nested quantifiers
+# competing for the same characters), which keeps failed matches linear without
+# possessive quantifiers
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_TOKEN = re.compile(_STRING + r'|[{}\[\]]')
+
+# Regular expressions cannot count, so nesting is unrolled this many levels deep;
+# deeper values are skipped token by token
+_MAX_DEPTH = 32
+
+
+def _value_pattern(depth: int) -> "re.Pattern":
+    """Match a string, scalar, or array/object nested at most `depth` levels, without decoding it"""
+    plain = r'[^"{}\[\]]*'
+    content = plain + r'(?:' + _STRING + plain + r')*'
+    for _ in range(depth - 1):
+        content = plain + r'(?:(?:' + _STRING + r'|[{\[]' + content + r'[}\]])' + plain + r')*'
+    return re.compile(r'[{\[]' + content + r'[}\]]|' + _STRING + r'|[^\s,:{}\[\]"]+')
+
+
+_VALUE = _value_pattern(_MAX_DEPTH)
+
+
+def skip_value(text: str, idx: int) -> int:
+    """
+    Find the end of the JSON value starting at text[idx] without decoding it
+    
+    Raises:
+        json.JSONDecodeError: If no value starts at idx or its brackets are unbalanced
+    """
+    match = _VALUE.match(text, idx)
+    if match is not None:
+        return match.end()
+    if text.startswith(('{', '['), idx):
+        depth = 0
+        for token in _TOKEN.finditer(text, idx):
+            bracket = token.group()
+            if bracket in '{[':
+                depth += 1
+            elif bracket in '}]':
+                depth -= 1
+                if depth == 0:
+                    return token.end()
+    raise json.JSONDecodeError("Expecting value", text, idx)
+
+
+def _trailing_whitespace_start(text: str, end: int) -> int:
+    """Get the position where the whitespace before text[end] starts"""
+    while end > 0 and text[end - 1] in ' \t\r\n':
+        end -= 1
+    return end
+
+
+class LazyObject(Mapping):
+    """Read-only mapping over a JSON object whose member values are decoded on demand"""
+    
+    def __init__(self, text: str, start: int = 0, layout: Optional[Dict[str, Any]] = None):
+        """
+        Scan the JSON object starting at text[start]
+        
+        Args:
+            text: JSON document
+            start: Position of the object (leading whitespace is skipped)
+            layout: Member name -> layout of members that are scanned as nested LazyObjects
+                instead of being decoded whole, e.g. {"components": {"schemas": {}}}
+        
+        Raises:
+            json.JSONDecodeError: If the text is not a valid JSON object at start
+        """
+        self._text = text
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        self._values: Dict[str, Any] = {}
+        layout = layout or {}
+        
+        start = _WHITESPACE.match(text, start).end()
+        idx = self._expect(text, start, '{')
+        idx = _WHITESPACE.match(text, idx).end()
+        if text.startswith('}', idx):
+            self.end = idx + 1
+            return
+        lines = self._member_lines(text, start, idx)
+        
+        while True:
+            idx = self._expect(text, idx, '"')
+            key, idx = scanstring(text, idx)
+            idx = self._expect(text, _WHITESPACE.match(text, idx).end(), ':')
+            idx = _WHITESPACE.match(text, idx).end()
+            
+            if key in layout and text.startswith('{', idx):
+                value = LazyObject(text, idx, layout[key])
+                self._values[key] = value
+                end = value.end
+            else:
+                self._values.pop(key, None)
+                end = (lines and self._skip_to_line(text, idx, *lines)) or skip_value(text, idx)
+            self._spans[key] = (idx, end)
+            
+            idx = _WHITESPACE.match(text, end).end()
+            if text.startswith('}', idx):
+                self.end = idx + 1
+                return
+            idx = _WHITESPACE.match(text, self._expect(text, idx, ',')).end()
+    
+    def __getitem__(self, key: str) -> Any:
+        """Get a member value, decoding it on first access"""
+        if key not in self._values:
+            self._values[key] = self.load(key)
+        return self._values[key]
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._spans
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._spans)
+    
+    def __len__(self) -> int:
+        return len(self._spans)
+    
+    def load(self, key: str) -> Any:
+        """Decode a member value without keeping it, for values that are used once"""
+        if key in self._values:
+            return self._values[key]
+        start, _ = self._spans[key]
+        return _decoder.raw_decode(self._text, start)[0]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode the whole object"""
+        return {key: value.to_dict() if isinstance(value, LazyObject) else value for key, value in self.items()}
+    
+    @staticmethod
+    def _member_lines(text: str, start: int, first_key: int) -> Optional[Tuple["re.Pattern", str, int]]:
+        """
+        Get how the lines of an indented object's members start
+        
+        Returns:
+            (pattern of a line starting a member, line break and indent of the members,
+            position of the line holding the closing brace), or None when members do not
+            start their own lines (e.g. minified JSON)
+        """
+        line_start = text.rfind('\n', 0, first_key) + 1
+        if line_start <= start or _INDENT.match(text, line_start).end() != first_key:
+            return None
+        object_line = text.rfind('\n', 0, start) + 1
+        object_indent = text[object_line:_INDENT.match(text, object_line).end()]
+        # Regular expressions find these lines faster than str.find, which stalls on the
+        # line break and indent that begin almost every line of the document
+        closing = re.compile(re.escape('\n' + object_indent) + '}').search(text, first_key)
+        if closing is None:
+            return None
+        member_indent = '\n' + text[line_start:first_key]
+        return re.compile(re.escape(member_indent) + '"'), member_indent, closing.start()
+    
+    @staticmethod
+    def _skip_to_line(text: str, idx: int, next_member: "re.Pattern", member_indent: str, closing: int) -> Optional[int]:
+        """
+        Find the end of an array or object member from the line starting the next one
+        
+        The value must close on a line of its own at the members' indent, as
+        indented JSON writers lay it out.
+        
+        Returns:
+            End of the value, or None if the document's layout does not fit
+        """
+        closer = {'{': '}', '[': ']'}.get(text[idx:idx + 1])
+        if closer is None:
+            return None
+        match = next_member.search(text, idx, closing)
+        end = _trailing_whitespace_start(text, match.start() if match else closing)
+        if match:
+            if not text.startswith(',', end - 1):
+                return None
+            end = _trailing_whitespace_start(text, end - 1)
+        
+        if end - idx == 2 and text.startswith(closer, idx + 1):
+            return end
+        if end - idx > 2 and text.startswith(member_indent + closer, end - 1 - len(member_indent)):
+            return end
+        return None
+    
+    @staticmethod
+    def _expect(text: str, idx: int, char: str) -> int:
+        """Check the character at idx and return the position after it"""
+        if not text.startswith(char, idx):
+            raise json.JSONDecodeError(f"Expecting '{char}'", text, idx)
+        return idx + 1
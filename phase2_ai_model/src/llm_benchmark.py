@@ -0,0 +1,310 @@
+"""
+LLM Benchmark - Compares providers and models on a fixed set of endpoints
+
+Every target (a provider and model, or a replay cassette) gets the same
+prompts for the same endpoints. Per target it reports the latency
+distribution, output tokens per second, valid test cases per call (after
+TestCaseValidator and de-duplication), cost per valid case and how often
+responses were cut off by the token limit.
+
+Cassettes are JSON lines, one recorded call per line, keyed by the SHA-256 of
+the prompt. RecordingProvider writes them during a live run; ReplayProvider
+answers from them with the recorded latency, so runs can be repeated offline.
+"""
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Union
+from pathlib import Path
+from dataclasses import dataclass, field
+
+from oas_parser import Endpoint
+from llm_processor import LLMProvider, LLMResponse, LLMProcessor
+from test_generator import TestCaseGenerator, TestCaseValidator
+from latency_baseline import LatencyBaseline
+
+logger = logging.getLogger(__name__)
+
+# USD per million (input, output) tokens; local models cost nothing
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4": (30.0, 60.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4o": (5.0, 15.0),
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "claude-3-opus-20240229": (15.0, 75.0),
+    "claude-3-sonnet-20240229": (3.0, 15.0),
+    "claude-3-haiku-20240307": (0.25, 1.25)
+}
+
+TRUNCATION_REASONS = ("length", "max_tokens")
+
+
+def prompt_key(prompt: str, max_tokens: int) -> str:
+    """Get the cassette key of a prompt"""
+    return hashlib.sha256(f"{max_tokens}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class RecordingProvider(LLMProvider):
+    """Wraps a provider and appends every call to a cassette"""
+    
+    def __init__(self, provider: LLMProvider, cassette_path: Union[str, Path]):
+        """
+        Initialize recording provider
+        
+        Args:
+            provider: Provider whose calls are recorded
+            cassette_path: JSONL cassette the calls are appended to
+        """
+        self.provider = provider
+        self.cassette_path = Path(cassette_path)
+        self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+    
+    def generate_response(self, prompt: str, max_tokens: int = 2000) -> LLMResponse:
+        """Generate response with the wrapped provider and record it"""
+        start = time.perf_counter()
+        response = self.provider.generate_response(prompt, max_tokens)
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        record = {
+            "key": prompt_key(prompt, max_tokens),
+            "model": response.model,
+            "content": response.content,
+            "stop_reason": response.stop_reason,
+            "prompt_tokens": response.prompt_tokens,
+            "completion_tokens": response.completion_tokens,
+            "latency_ms": round(latency_ms, 1)
+        }
+        with self._lock, open(self.cassette_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+        return response
+    
+    def parse_json_response(self, response: LLMResponse) -> Dict[str, Any]:
+        """Parse JSON with the wrapped provider"""
+        return self.provider.parse_json_response(response)
+
+
+class ReplayProvider(LLMProvider):
+    """Answers prompts from a recorded cassette"""
+    
+    def __init__(self, cassette_path: Union[str, Path]):
+        """
+        Initialize replay provider
+        
+        Args:
+            cassette_path: JSONL cassette written by RecordingProvider; calls recorded
+                several times for one prompt are replayed in turn
+        """
+        self.cassette_path = Path(cassette_path)
+        self.recordings: Dict[str, List[Dict[str, Any]]] = {}
+        with open(self.cassette_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self.recordings.setdefault(record["key"], []).append(record)
+        self.model = next((r[0]["model"] for r in self.recordings.values()), self.cassette_path.stem)
+        self._calls: Dict[str, int] = {}
+    
+    def generate_response(self, prompt: str, max_tokens: int = 2000) -> LLMResponse:
+        """Return the recorded response of a prompt"""
+        key = prompt_key(prompt, max_tokens)
+        if key not in self.recordings:
+            raise KeyError(f"Prompt not recorded in {self.cassette_path}")
+        
+        calls = self._calls.get(key, 0)
+        self._calls[key] = calls + 1
+        record = self.recordings[key][calls % len(self.recordings[key])]
+        return LLMResponse(
+            content=record["content"],
+            model=record["model"],
+            tokens_used=record["prompt_tokens"] + record["completion_tokens"],
+            stop_reason=record["stop_reason"],
+            prompt_tokens=record["prompt_tokens"],
+            completion_tokens=record["completion_tokens"],
+            latency_ms=record["latency_ms"]
+        )
+    
+    def parse_json_response(self, response: LLMResponse) -> Dict[str, Any]:
+        """Parse JSON, accepting responses wrapped in markdown code blocks"""
+        content = response.content
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+        return json.loads(content)
+
+
+@dataclass
+class CallResult:
+    """Outcome of one benchmarked LLM call"""
+    endpoint: str
+    latency_ms: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    truncated: bool = False
+    returned_cases: int = 0
+    valid_cases: int = 0
+    new_cases: int = 0  # valid and not a duplicate of an earlier case
+    error: Optional[str] = None
+
+
+@dataclass
+class TargetResult:
+    """Calls made against one provider and model"""
+    target: str
+    provider: str
+    model: str
+    calls: List[CallResult] = field(default_factory=list)
+    
+    def get_summary(self, prices: Optional[Dict[str, Tuple[float, float]]] = None) -> Dict[str, Any]:
+        """Get the comparable metrics of the target"""
+        prices = MODEL_PRICES if prices is None else prices
+        answered = [c for c in self.calls if c.error is None]
+        latencies = [c.latency_ms for c in answered]
+        completion_tokens = sum(c.completion_tokens for c in answered)
+        valid_cases = sum(c.new_cases for c in answered)
+        
+        cost = None
+        if self.model in prices:
+            input_price, output_price = prices[self.model]
+            cost = sum(c.prompt_tokens * input_price + c.completion_tokens * output_price for c in answered) / 1e6
+        elif self.provider == "ollama":
+            cost = 0.0
+        
+        return {
+            "target": self.target,
+            "provider": self.provider,
+            "model": self.model,
+            "calls": len(self.calls),
+            "errors": len(self.calls) - len(answered),
+            "latency_p50_ms": round(LatencyBaseline.percentile(latencies, 50), 1) if latencies else None,
+            "latency_p95_ms": round(LatencyBaseline.percentile(latencies, 95), 1) if latencies else None,
+            "latency_max_ms": round(max(latencies), 1) if latencies else None,
+            "tokens_per_s": round(completion_tokens / (sum(latencies) / 1000), 1) if completion_tokens and sum(latencies) else None,
+            "valid_cases": valid_cases,
+            "duplicate_cases": sum(c.valid_cases - c.new_cases for c in answered),
+            "invalid_cases": sum(c.returned_cases - c.valid_cases for c in answered),
+            "valid_per_call": round(valid_cases / len(self.calls), 2) if self.calls else 0,
+            "truncation_rate": round(len([c for c in answered if c.truncated]) / len(answered), 3) if answered else None,
+            "cost_usd": round(cost, 4) if cost is not None else None,
+            "cost_per_valid_case_usd": round(cost / valid_cases, 5) if cost is not None and valid_cases else None
+        }
+
+
+class LLMBenchmark:
+    """Runs the same prompts against several LLM targets"""
+    
+    def __init__(
+        self,
+        endpoints: List[Endpoint],
+        num_valid: int = 3,
+        num_invalid: int = 3,
+        max_tokens: int = 4000,
+        repeats: int = 1
+    ):
+        """
+        Initialize LLM benchmark
+        
+        Args:
+            endpoints: Fixed endpoint set every target is prompted with
+            num_valid: VALID cases requested per prompt
+            num_invalid: INVALID cases requested per prompt
+            max_tokens: Output token limit of every call
+            repeats: Times each endpoint is prompted per target
+        """
+        self.endpoints = endpoints
+        self.num_valid = num_valid
+        self.num_invalid = num_invalid
+        self.max_tokens = max_tokens
+        self.repeats = repeats
+        self.validator = TestCaseValidator()
+    
+    def run_target(self, target: str, provider_name: str, model: str, provider: LLMProvider) -> TargetResult:
+        """Prompt one target with every endpoint"""
+        result = TargetResult(target=target, provider=provider_name, model=model)
+        processor = LLMProcessor(provider)
+        prompts = [
+            (endpoint, processor.build_test_generation_prompt(
+                TestCaseGenerator.build_endpoint_info(endpoint), self.num_valid, self.num_invalid
+            ))
+            for endpoint in self.endpoints
+        ]
+        seen = set()
+        
+        for _ in range(self.repeats):
+            for endpoint, prompt in prompts:
+                call = self._call(provider, f"{endpoint.method} {endpoint.path}", prompt, seen)
+                result.calls.append(call)
+                logger.info(
+                    f"{target} {call.endpoint}: {call.latency_ms:.0f} ms, "
+                    f"{call.new_cases}/{call.returned_cases} new valid cases{', ' + call.error if call.error else ''}"
+                )
+        return result
+    
+    def _call(self, provider: LLMProvider, endpoint: str, prompt: str, seen: set) -> CallResult:
+        """Make one call and score its test cases"""
+        start = time.perf_counter()
+        try:
+            response = provider.generate_response(prompt, max_tokens=self.max_tokens)
+        except Exception as e:
+            return CallResult(endpoint=endpoint, latency_ms=(time.perf_counter() - start) * 1000, error=str(e) or type(e).__name__)
+        latency_ms = response.latency_ms if response.latency_ms is not None else (time.perf_counter() - start) * 1000
+        
+        call = CallResult(
+            endpoint=endpoint,
+            latency_ms=latency_ms,
+            prompt_tokens=response.prompt_tokens,
+            completion_tokens=response.completion_tokens,
+            truncated=response.stop_reason in TRUNCATION_REASONS
+        )
+        try:
+            test_cases = (provider.parse_json_response(response) or {}).get("testCases", [])
+        except Exception:
+            test_cases = []
+        
+        call.returned_cases = len(test_cases)
+        for test_case in test_cases:
+            if not isinstance(test_case, dict) or not self.validator.validate_test_case(test_case)[0]:
+                continue
+            call.valid_cases += 1
+            fingerprint = self._fingerprint(test_case)
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                call.new_cases += 1
+        return call
+    
+    @staticmethod
+    def _fingerprint(test_case: Dict[str, Any]) -> str:
+        """Identify a test case by the request it sends and the status it expects"""
+        return json.dumps([
+            test_case.get('method'),
+            test_case.get('endpoint'),
+            test_case.get('pathParams'),
+            test_case.get('queryParams'),
+            test_case.get('requestBody'),
+            test_case.get('expectedStatusCode')
+        ], sort_keys=True, default=str)
+
+
+def format_markdown(summaries: List[Dict[str, Any]]) -> str:
+    """Render target summaries as a Markdown table"""
+    columns = [
+        ("Target", "target"),
+        ("Calls", "calls"),
+        ("Errors", "errors"),
+        ("p50 ms", "latency_p50_ms"),
+        ("p95 ms", "latency_p95_ms"),
+        ("Tokens/s", "tokens_per_s"),
+        ("Valid/call", "valid_per_call"),
+        ("Truncated", "truncation_rate"),
+        ("Cost/valid case $", "cost_per_valid_case_usd")
+    ]
+    lines = [
+        "| " + " | ".join(title for title, _ in columns) + " |",
+        "|" + "|".join("---" for _ in columns) + "|"
+    ]
+    for summary in summaries:
+        lines.append("| " + " | ".join("-" if summary[key] is None else str(summary[key]) for _, key in columns) + " |")
+    return "\n".join(lines) + "\n"
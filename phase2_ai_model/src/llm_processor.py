@@ -1,12 +1,18 @@
 """
 LLM Processor - Handles integration with OpenAI and Anthropic APIs
 """
+import time
 import logging
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Optional, Dict, Any, List
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 import json
 
+from tracing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +23,9 @@ class LLMResponse:
     model: str
     tokens_used: int = 0
     stop_reason: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: Optional[float] = None  # Recorded generation time of replayed responses
 
 
 class LLMProvider(ABC):
@@ -80,7 +89,9 @@ class OpenAIProvider(LLMProvider):
                 content=content,
                 model=self.model,
                 tokens_used=tokens_used,
-                stop_reason=response.choices[0].finish_reason
+                stop_reason=response.choices[0].finish_reason,
+                prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
+                completion_tokens=response.usage.completion_tokens if response.usage else 0
             )
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
@@ -142,7 +153,9 @@ class AnthropicProvider(LLMProvider):
                 content=content,
                 model=self.model,
                 tokens_used=tokens_used,
-                stop_reason=response.stop_reason
+                stop_reason=response.stop_reason,
+                prompt_tokens=response.usage.input_tokens if response.usage else 0,
+                completion_tokens=response.usage.output_tokens if response.usage else 0
             )
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
@@ -224,8 +237,10 @@ class OllamaProvider(LLMProvider):
             return LLMResponse(
                 content=content,
                 model=self.model,
-                tokens_used=result.get('total_duration', 0),
-                stop_reason=result.get('done_reason', 'stop')
+                tokens_used=result.get('prompt_eval_count', 0) + result.get('eval_count', 0),
+                stop_reason=result.get('done_reason', 'stop'),
+                prompt_tokens=result.get('prompt_eval_count', 0),
+                completion_tokens=result.get('eval_count', 0)
             )
         except Exception as e:
             logger.error(f"Ollama generation error: {e}")
@@ -249,6 +264,87 @@ class OllamaProvider(LLMProvider):
             return {}
 
 
+class CachedLLMProvider(LLMProvider):
+    """Wraps a provider and answers repeated prompts from memory"""
+    
+    def __init__(self, provider: LLMProvider, max_entries: int = 1024):
+        """
+        Initialize cached provider
+        
+        Args:
+            provider: Provider that answers prompts not cached yet
+            max_entries: Responses kept; the least recently used one is evicted first
+        """
+        self.provider = provider
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._responses: "OrderedDict[str, LLMResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def generate_response(self, prompt: str, max_tokens: int = 2000) -> LLMResponse:
+        """Generate response, reusing the cached one for a prompt seen before"""
+        key = hashlib.sha256(f"{max_tokens}\0{prompt}".encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._responses:
+                self._responses.move_to_end(key)
+                self.hits += 1
+                return self._responses[key]
+        
+        response = self.provider.generate_response(prompt, max_tokens)
+        
+        with self._lock:
+            self.misses += 1
+            self._responses[key] = response
+            while len(self._responses) > self.max_entries:
+                self._responses.popitem(last=False)
+        return response
+    
+    def parse_json_response(self, response: LLMResponse) -> Dict[str, Any]:
+        """Parse JSON with the wrapped provider"""
+        return self.provider.parse_json_response(response)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        return {"entries": len(self._responses), "hits": self.hits, "misses": self.misses}
+
+
+class RateLimitedProvider(LLMProvider):
+    """Wraps a provider and spaces its requests to stay within a request rate, across all threads"""
+    
+    def __init__(self, provider: LLMProvider, requests_per_minute: float):
+        """
+        Initialize rate-limited provider
+        
+        Args:
+            provider: Provider whose requests are limited
+            requests_per_minute: Requests started per minute at most, by all callers together
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.provider = provider
+        self.interval = 60.0 / requests_per_minute
+        self.waited = 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+    
+    def generate_response(self, prompt: str, max_tokens: int = 2000) -> LLMResponse:
+        """Generate response once the next request slot is due"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+            self.waited += start - now
+        
+        if start > now:
+            time.sleep(start - now)
+        return self.provider.generate_response(prompt, max_tokens)
+    
+    def parse_json_response(self, response: LLMResponse) -> Dict[str, Any]:
+        """Parse JSON with the wrapped provider"""
+        return self.provider.parse_json_response(response)
+
+
 class LLMFactory:
     """Factory for creating LLM providers"""
     
@@ -303,30 +399,41 @@ class LLMProcessor:
         Returns:
             List of generated test cases
         """
-        prompt = self._build_test_generation_prompt(
-            endpoint_info,
-            num_valid_cases,
-            num_invalid_cases
-        )
+        with span("build_prompt", "llm"):
+            prompt = self.build_test_generation_prompt(
+                endpoint_info,
+                num_valid_cases,
+                num_invalid_cases
+            )
         
         logger.info(f"Generating test cases for {endpoint_info.get('path')}")
         
         try:
-            response = self.llm.generate_response(prompt, max_tokens=4000)
-            test_cases = self.llm.parse_json_response(response)
+            with span("llm_request", "llm", provider=type(self.llm).__name__, prompt_chars=len(prompt)):
+                response = self.llm.generate_response(prompt, max_tokens=4000)
+            with span("parse_json", "llm"):
+                test_cases = self.llm.parse_json_response(response)
             
             return test_cases.get("testCases", [])
         except Exception as e:
             logger.error(f"Error generating test cases: {e}")
             return []
     
-    def _build_test_generation_prompt(
+    def build_test_generation_prompt(
         self,
         endpoint_info: Dict[str, Any],
         num_valid_cases: int,
         num_invalid_cases: int
     ) -> str:
         """Build prompt for LLM test case generation"""
+        if endpoint_info.get('validRequestBody') is not None:
+            request_body_field = (
+                "- requestBodyOverrides: Fields to set or change in the valid request body ({} for none)\n"
+                "- requestBodyOmit: Fields to leave out of the valid request body ([] for none)"
+            )
+        else:
+            request_body_field = "- requestBody: Request payload (if applicable)"
+        
         prompt = f"""
 You are an expert API testing specialist. Generate comprehensive test cases for the following API endpoint.
 
@@ -344,7 +451,7 @@ Request Body Schema:
 
 Required Fields:
 {', '.join(endpoint_info.get('requiredFields', []))}
-
+{self._format_valid_request_body(endpoint_info.get('validRequestBody'))}{self._format_examples(endpoint_info.get('examples', []))}{self._format_missing_coverage(endpoint_info.get('missingCoverage', []))}
 REQUIREMENTS:
 1. Generate {num_valid_cases} VALID test cases (correct inputs, expected success)
 2. Generate {num_invalid_cases} INVALID test cases (incorrect inputs, expected failures)
@@ -360,7 +467,9 @@ For each test case, include:
 - description: Clear description of what's being tested
 - priority: "HIGH", "MEDIUM", or "LOW"
 - requestHeaders: HTTP headers
-- requestBody: Request payload (if applicable)
+- pathParams: Values for the path placeholders, keyed by name (if applicable)
+- queryParams: Query string parameters (if applicable)
+{request_body_field}
 - expectedStatusCode: Expected HTTP status code
 - expectedResponseFields: Expected fields in response
 - assertions: List of assertions to validate
@@ -369,6 +478,43 @@ Generate the test cases now in valid JSON format:
 """
         return prompt
     
+    def _format_valid_request_body(self, body: Any) -> str:
+        """Format the cached valid request body the test cases are built from for prompt"""
+        if body is None:
+            return ""
+        
+        return f"""
+VALID REQUEST BODY:
+{json.dumps(body, indent=2)}
+Do not write requestBody. Each test case's body is this one with its requestBodyOverrides
+applied and its requestBodyOmit fields removed.
+"""
+    
+    def _format_examples(self, examples: List[Dict[str, Any]]) -> str:
+        """Format curated test cases of similar endpoints for prompt"""
+        if not examples:
+            return ""
+        
+        lines = "\n".join(json.dumps(example, ensure_ascii=False, separators=(",", ":")) for example in examples)
+        return f"""
+EXAMPLES:
+Human-verified test cases of similar endpoints. Match their realistic values and expected
+status codes, but do not copy them, and use the output format required below.
+{lines}
+"""
+    
+    def _format_missing_coverage(self, missing_coverage: List[str]) -> str:
+        """Format coverage not yet exercised by existing test cases for prompt"""
+        if not missing_coverage:
+            return ""
+        
+        lines = "\n".join(f"- {item}" for item in missing_coverage)
+        return f"""
+MISSING COVERAGE:
+Existing test cases already cover everything else. Only generate test cases that cover at least one of:
+{lines}
+"""
+    
     def _format_parameters(self, parameters: List[Dict[str, Any]]) -> str:
         """Format parameters for prompt"""
         if not parameters:
@@ -0,0 +1,317 @@
+"""
+Load Generator - Drives weighted traffic mixes built from VALID test cases
+"""
+import json
+import math
+import time
+import random
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Tuple, Union
+from pathlib import Path
+
+from test_executor import AsyncTestExecutor
+from execution_planner import ExecutionPlan
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram
+    
+    Values are recorded in microseconds into log-linear buckets: every power
+    of two is split into the same number of linear sub-buckets, so any
+    reported value is within the configured number of significant digits of
+    the recorded one while memory stays bounded.
+    """
+    
+    def __init__(self, significant_digits: int = 2):
+        """
+        Initialize histogram
+        
+        Args:
+            significant_digits: Decimal digits of precision kept for every value (1-5)
+        """
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.counts: Dict[Tuple[int, int], int] = {}
+        self.total_count = 0
+        self.min_value = 0
+        self.max_value = 0
+        self.sum_value = 0
+    
+    def record(self, latency_ms: float) -> None:
+        """Record a latency in milliseconds"""
+        value = max(0, int(round(latency_ms * 1000)))
+        shift = max(0, value.bit_length() - self.sub_bucket_bits)
+        key = (shift, value >> shift)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        
+        self.min_value = value if self.total_count == 0 else min(self.min_value, value)
+        self.max_value = max(self.max_value, value)
+        self.sum_value += value
+        self.total_count += 1
+    
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the values recorded by another histogram with the same precision"""
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        if other.total_count:
+            self.min_value = other.min_value if self.total_count == 0 else min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        self.sum_value += other.sum_value
+        self.total_count += other.total_count
+    
+    def percentile(self, percentile: float) -> float:
+        """Get the latency (ms) at a percentile (0-100)"""
+        if self.total_count == 0:
+            return 0.0
+        
+        target = max(1, math.ceil(self.total_count * percentile / 100))
+        seen = 0
+        for shift, sub_bucket in sorted(self.counts, key=lambda key: key[1] << key[0]):
+            seen += self.counts[(shift, sub_bucket)]
+            if seen >= target:
+                highest_equivalent = ((sub_bucket + 1) << shift) - 1
+                return min(highest_equivalent, self.max_value) / 1000
+        return self.max_value / 1000
+    
+    def get_summary(self) -> Dict[str, float]:
+        """Get latency percentiles in milliseconds"""
+        return {
+            "count": self.total_count,
+            "min_ms": round(self.min_value / 1000, 3),
+            "mean_ms": round(self.sum_value / self.total_count / 1000, 3) if self.total_count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_value / 1000, 3)
+        }
+
+
+class LoadProfile:
+    """Weighted traffic mix of VALID test cases"""
+    
+    def __init__(self, entries: List[Tuple[Dict[str, Any], float]]):
+        """
+        Initialize load profile
+        
+        Args:
+            entries: (test case, weight) pairs
+        """
+        self.entries = [(tc, w) for tc, w in entries if w > 0]
+        if not self.entries:
+            raise ValueError("Load profile has no test cases")
+    
+    @classmethod
+    def from_test_cases(
+        cls,
+        test_cases: List[Dict[str, Any]],
+        endpoints: Optional[List[str]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        include_destructive: bool = False
+    ) -> "LoadProfile":
+        """
+        Build a traffic mix from VALID test cases
+        
+        Each endpoint gets its weight (default 1), split evenly across its cases.
+        
+        Args:
+            test_cases: Generated test cases
+            endpoints: Only use cases whose endpoint path starts with one of these
+            weights: Relative traffic share per endpoint path
+            include_destructive: Also use DELETE cases (off by default, they only succeed once)
+        """
+        weights = weights or {}
+        by_endpoint: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for tc in test_cases:
+            if tc.get('category') != 'VALID':
+                continue
+            if not include_destructive and tc.get('method', 'GET').upper() == 'DELETE':
+                continue
+            path = tc.get('endpoint', '/')
+            if endpoints and not any(path.startswith(e) for e in endpoints):
+                continue
+            by_endpoint.setdefault(path, []).append(tc)
+        
+        entries = []
+        for path, cases in by_endpoint.items():
+            weight = weights.get(path, 1.0)
+            entries.extend((tc, weight / len(cases)) for tc in cases)
+        
+        logger.info(f"Load profile with {len(entries)} test cases across {len(by_endpoint)} endpoints")
+        return cls(entries)
+    
+    def picker(self, seed: Optional[int] = None):
+        """Get a function returning the next test case of the mix"""
+        rng = random.Random(seed)
+        cases = [tc for tc, _ in self.entries]
+        cumulative = []
+        total = 0.0
+        for _, weight in self.entries:
+            total += weight
+            cumulative.append(total)
+        return lambda: rng.choices(cases, cum_weights=cumulative)[0]
+
+
+class LoadGenerator:
+    """Open-loop load generator on top of the async test executor"""
+    
+    def __init__(
+        self,
+        executor: AsyncTestExecutor,
+        profile: LoadProfile,
+        target_rps: float,
+        duration: float,
+        ramp_up: float = 0.0,
+        start_rps: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize load generator
+        
+        Args:
+            executor: Executor providing the pooled HTTP session and response checks
+            profile: Traffic mix to draw requests from
+            target_rps: Requests per second after the ramp
+            duration: Total run time in seconds (including the ramp)
+            ramp_up: Seconds to ramp linearly from start_rps to target_rps
+            start_rps: Request rate at the start of the ramp
+            seed: Random seed for a reproducible request sequence
+        """
+        self.executor = executor
+        self.profile = profile
+        self.target_rps = target_rps
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.start_rps = min(start_rps, target_rps)
+        self.seed = seed
+    
+    def rate_at(self, elapsed: float) -> float:
+        """Get the scheduled request rate after `elapsed` seconds"""
+        if self.ramp_up <= 0 or elapsed >= self.ramp_up:
+            return self.target_rps
+        return self.start_rps + (self.target_rps - self.start_rps) * elapsed / self.ramp_up
+    
+    def schedule(self) -> List[float]:
+        """Get the send offsets (seconds) of every request of the run"""
+        offsets = []
+        elapsed = 0.0
+        while elapsed < self.duration:
+            offsets.append(elapsed)
+            elapsed += 1.0 / max(self.rate_at(elapsed), 1e-6)
+        return offsets
+    
+    async def run(self, plan: Optional[ExecutionPlan] = None) -> Dict[str, Any]:
+        """
+        Run the load test
+        
+        Requests are sent on schedule whether or not earlier ones have
+        completed, and latency is measured from the scheduled send time, so
+        a slow server is not hidden by a slower request rate.
+        
+        Args:
+            plan: Optional execution plan whose fixtures are created before the run;
+                  the profile's test cases are then bound to the created resources
+        
+        Returns:
+            Load test report
+        """
+        histograms: Dict[str, LatencyHistogram] = {}
+        errors: Dict[str, int] = {}
+        tasks = []
+        
+        async with self.executor.create_session() as session:
+            profile = self.profile
+            if plan is not None:
+                profile = await self.bind_profile(session, plan)
+            pick = profile.picker(self.seed)
+            
+            async def _send(test_case: Dict[str, Any], scheduled: float) -> None:
+                result = await self.executor.execute_test_case(session, test_case)
+                latency_ms = (time.perf_counter() - scheduled) * 1000
+                key = f"{result.method} {result.endpoint}"
+                histograms.setdefault(key, LatencyHistogram()).record(latency_ms)
+                if not result.passed:
+                    errors[key] = errors.get(key, 0) + 1
+            
+            start = time.perf_counter()
+            for offset in self.schedule():
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.ensure_future(_send(pick(), start + offset)))
+            
+            await asyncio.gather(*tasks)
+            wall_time = time.perf_counter() - start
+        
+        return self.build_report(histograms, errors, wall_time)
+    
+    async def bind_profile(self, session, plan: ExecutionPlan) -> LoadProfile:
+        """
+        Create the fixtures of a plan and bind the profile's test cases to them
+        
+        Test cases are matched to the plan by identity, so the plan must be built
+        from the profile's own test cases. Cases whose fixtures could not be
+        created are left out of the traffic mix instead of being sent unbound.
+        """
+        bound_cases = await self.executor.bind_plan(session, plan)
+        bound = {id(planned.test_case): tc for planned, tc in zip(plan.cases, bound_cases)}
+        
+        entries = []
+        left_out = []
+        for tc, weight in self.profile.entries:
+            bound_case = bound.get(id(tc), tc)
+            if bound_case is None:
+                left_out.append(str(tc.get('testId', '')))
+                continue
+            entries.append((bound_case, weight))
+        
+        if left_out:
+            logger.warning(f"Left {len(left_out)} test cases out of the load profile, their fixtures "
+                           f"could not be created: {', '.join(left_out)}")
+        return LoadProfile(entries)
+    
+    def build_report(
+        self,
+        histograms: Dict[str, LatencyHistogram],
+        errors: Dict[str, int],
+        wall_time: float
+    ) -> Dict[str, Any]:
+        """Build the load test report from per-endpoint histograms"""
+        overall = LatencyHistogram()
+        endpoints = {}
+        for key, histogram in sorted(histograms.items()):
+            overall.merge(histogram)
+            endpoints[key] = {
+                **histogram.get_summary(),
+                "errors": errors.get(key, 0),
+                "error_rate": round(errors.get(key, 0) / histogram.total_count, 4)
+            }
+        
+        total_errors = sum(errors.values())
+        return {
+            "target_rps": self.target_rps,
+            "ramp_up_s": self.ramp_up,
+            "duration_s": self.duration,
+            "achieved_rps": round(overall.total_count / wall_time, 2) if wall_time else 0.0,
+            "overall": {
+                **overall.get_summary(),
+                "errors": total_errors,
+                "error_rate": round(total_errors / overall.total_count, 4) if overall.total_count else 0.0
+            },
+            "endpoints": endpoints
+        }
+
+
+def write_load_report(report: Dict[str, Any], output_path: Union[str, Path]) -> None:
+    """Write a load test report to a JSON file"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    
+    logger.info(f"Load report written to {output_path}")
@@ -0,0 +1,267 @@
+"""
+Mock Server - Serves a local stand-in for an API from its OpenAPI specification
+
+Requests are routed to the parsed endpoints through a PathRouter, so routing
+costs the same for a handful of endpoints or thousands. Requests are validated against the
+declared parameters and body schema (400 on mismatch), and request bodies
+against the media types the operation consumes (415, or the declared 400 when
+the operation declares no 415). Responses use the
+schema examples, or sample values built from the response schemas. In
+stateful mode, POST/GET/PUT/DELETE on collections keep resources in memory,
+so dependent test cases and 404 cases behave like they do against the real API.
+"""
+import json
+import logging
+from itertools import count
+from typing import Dict, List, Any, Optional, Tuple
+
+from aiohttp import web
+
+from oas_parser import Endpoint, Parameter
+from endpoint_index import PLACEHOLDER, PathRouter, path_shape
+from schema_sampler import SchemaSampler
+
+logger = logging.getLogger(__name__)
+
+
+class MockServer:
+    """Async mock of an API described by parsed OAS endpoints"""
+    
+    def __init__(
+        self,
+        endpoints: List[Endpoint],
+        document: Optional[Dict[str, Any]] = None,
+        base_path: str = "",
+        stateful: bool = False
+    ):
+        """
+        Initialize mock server
+        
+        Args:
+            endpoints: Parsed endpoints to serve
+            document: OAS document, used to resolve $ref in schemas
+            base_path: Prefix of every route (e.g. the spec's basePath)
+            stateful: Keep created resources in memory (CRUD) instead of static responses
+        """
+        self.endpoints = endpoints
+        self.sampler = SchemaSampler(document)
+        self.base_path = base_path.rstrip('/')
+        self.stateful = stateful
+        self.resources: Dict[str, Dict[str, Dict[str, Any]]] = {}  # concrete collection path -> id -> resource
+        self._ids = count(1)
+        self._collections = {
+            path_shape(endpoint.path) for endpoint in endpoints if endpoint.method == 'POST'
+        }
+    
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application serving every endpoint"""
+        # One catch-all aiohttp route; the trie prefers literal segments, so /maisProximo beats /{id}
+        router = PathRouter()
+        for endpoint in self.endpoints:
+            handlers = router.get(endpoint.path)
+            if handlers is None:
+                handlers = {}
+                router.add(endpoint.path, handlers)
+            handlers.setdefault(endpoint.method, self._create_handler(endpoint))
+        
+        async def dispatch(request: web.Request) -> web.Response:
+            route = router.match(request.path[len(self.base_path):])
+            if route is None:
+                return self._json_response({"error": "Not Found"}, 404)
+            handler = route.value.get(request.method)
+            if handler is None:
+                return web.Response(status=405, headers={"Allow": ", ".join(route.value)})
+            return await handler(request, route.params)
+        
+        app = web.Application()
+        app.router.add_route('*', self.base_path + '/{tail:.*}', dispatch)
+        logger.info(f"Mock server routes {len(self.endpoints)} endpoints ({'stateful' if self.stateful else 'stateless'})")
+        return app
+    
+    def run(self, host: str = "127.0.0.1", port: int = 8090) -> None:
+        """Serve the mock until interrupted"""
+        web.run_app(self.create_app(), host=host, port=port, access_log=None, print=None)
+    
+    def _create_handler(self, endpoint: Endpoint):
+        """Create the request handler of one endpoint"""
+        body_schema = endpoint.request_body_schema
+        query_params = [p for p in endpoint.parameters or [] if p.in_ == 'query']
+        path_params = [p for p in endpoint.parameters or [] if p.in_ == 'path']
+        status, response_schema = self._success_response(endpoint)
+        consumes = endpoint.consumes or ["application/json"]
+        declared = {response.status_code for response in endpoint.responses or []}
+        unsupported_status = 400 if 400 in declared and 415 not in declared else 415
+        static_body = None if status == 204 else json.dumps(self._sample_response(response_schema)).encode()
+        
+        segments = [s for s in endpoint.path.split('/') if s]
+        is_item = bool(segments) and PLACEHOLDER.match(segments[-1]) is not None \
+            and path_shape(endpoint.path.rsplit('/', 1)[0]) in self._collections
+        is_collection = path_shape(endpoint.path) in self._collections
+        id_field = self._id_field(response_schema)
+        
+        async def handler(request: web.Request, path_values: Dict[str, str]) -> web.Response:
+            errors = self._validate_parameters(request, path_values, path_params, query_params)
+            body = None
+            if body_schema is not None and request.method in ('POST', 'PUT', 'PATCH'):
+                if request.can_read_body and not self._accepts(consumes, request.content_type):
+                    return self._json_response({
+                        "error": "Unsupported Media Type",
+                        "details": [f"content type {request.content_type} is not one of {', '.join(consumes)}"]
+                    }, unsupported_status)
+                body, body_errors = await self._read_body(request, body_schema, endpoint.request_body_required)
+                errors.extend(body_errors)
+            if errors:
+                return self._json_response({"error": "Bad Request", "details": errors}, 400)
+            
+            if self.stateful and (is_item or is_collection):
+                if body is not None and not isinstance(body, dict):
+                    return self._json_response({"error": "Bad Request", "details": ["request body must be a JSON object"]}, 400)
+                return self._handle_stateful(request, endpoint, status, response_schema, id_field, is_item, body)
+            
+            if static_body is None:
+                return web.Response(status=status)
+            return web.Response(body=static_body, status=status, content_type="application/json")
+        
+        return handler
+    
+    def _handle_stateful(
+        self,
+        request: web.Request,
+        endpoint: Endpoint,
+        status: int,
+        response_schema: Optional[Dict[str, Any]],
+        id_field: str,
+        is_item: bool,
+        body: Any
+    ) -> web.Response:
+        """Serve a CRUD request from the in-memory resources"""
+        path = request.path[len(self.base_path):].rstrip('/')
+        if not self._parents_exist(endpoint.path, path, is_item):
+            return self._json_response({"error": "Not Found"}, 404)
+        
+        if not is_item:
+            resources = self.resources.setdefault(path, {})
+            if request.method == 'POST':
+                resource_id = str(next(self._ids))
+                resource = self._sample_response(response_schema)
+                resource = {**(resource if isinstance(resource, dict) else {}), **(body or {}), id_field: resource_id}
+                resources[resource_id] = resource
+                return self._json_response(resource, status)
+            return self._json_response(list(resources.values()), status)
+        
+        collection, resource_id = path.rsplit('/', 1)
+        resources = self.resources.get(collection, {})
+        if resource_id not in resources:
+            return self._json_response({"error": "Not Found"}, 404)
+        
+        if request.method == 'DELETE':
+            del resources[resource_id]
+            return web.Response(status=status) if status == 204 else self._json_response({}, status)
+        if request.method in ('PUT', 'PATCH'):
+            resources[resource_id] = {**resources[resource_id], **(body or {}), id_field: resource_id}
+        return self._json_response(resources[resource_id], status)
+    
+    def _parents_exist(self, template: str, path: str, is_item: bool) -> bool:
+        """Check that every parent resource named in the request path was created"""
+        template_segments = [s for s in template.split('/') if s]
+        segments = [s for s in path.split('/') if s]
+        last = len(template_segments) - 1 if is_item else len(template_segments)
+        for index, segment in enumerate(template_segments[:last]):
+            if not PLACEHOLDER.match(segment):
+                continue
+            collection = '/' + '/'.join(segments[:index])
+            if path_shape('/'.join(template_segments[:index])) in self._collections \
+                    and segments[index] not in self.resources.get(collection, {}):
+                return False
+        return True
+    
+    def _validate_parameters(
+        self,
+        request: web.Request,
+        path_values: Dict[str, str],
+        path_params: List[Parameter],
+        query_params: List[Parameter]
+    ) -> List[str]:
+        """Validate path and query parameters against their declarations"""
+        errors = []
+        for param in path_params:
+            errors.extend(self._validate_parameter(param, path_values.get(param.name)))
+        for param in query_params:
+            value = request.query.get(param.name)
+            if value is None:
+                if param.required:
+                    errors.append(f"query parameter {param.name} is required")
+                continue
+            errors.extend(self._validate_parameter(param, value))
+        return errors
+    
+    def _validate_parameter(self, param: Parameter, raw_value: Optional[str]) -> List[str]:
+        """Convert a raw parameter to its declared type and check its constraints"""
+        if raw_value is None:
+            return []
+        location = f"{param.in_} parameter {param.name}"
+        try:
+            value = {
+                "integer": int,
+                "number": float,
+                "boolean": lambda v: {"true": True, "false": False}[v.lower()]
+            }.get(param.data_type, str)(raw_value)
+        except (ValueError, KeyError):
+            return [f"{location} must be of type {param.data_type}"]
+        
+        schema = {
+            "enum": param.enum_values,
+            "minimum": param.minimum,
+            "maximum": param.maximum,
+            "minLength": param.min_length,
+            "maxLength": param.max_length,
+            "pattern": param.pattern
+        }
+        return self.sampler.validate(value, {k: v for k, v in schema.items() if v is not None}, location)
+    
+    async def _read_body(self, request: web.Request, schema: Dict[str, Any], required: bool) -> Tuple[Any, List[str]]:
+        """Parse the JSON request body and validate it against the body schema; an omitted optional body is valid"""
+        raw = await request.read()
+        if not raw:
+            return None, ["request body is required"] if required else []
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            return None, ["request body must be valid JSON"]
+        return body, self.sampler.validate(body, schema)
+    
+    def _sample_response(self, schema: Optional[Dict[str, Any]]) -> Any:
+        """Build the response body for a response schema"""
+        return self.sampler.sample(schema) if schema else {}
+    
+    def _id_field(self, schema: Optional[Dict[str, Any]]) -> str:
+        """Find the identifier field of a response schema"""
+        properties = self.sampler.resolve(schema).get('properties', {})
+        if 'id' in properties:
+            return 'id'
+        return next((name for name in properties if name.lower().endswith('id')), 'id')
+    
+    @staticmethod
+    def _accepts(consumes: List[str], content_type: str) -> bool:
+        """Check a request media type against the consumed ones, which may be wildcards such as application/*"""
+        main_type = content_type.split('/', 1)[0]
+        return any(
+            media_type.split(';', 1)[0].strip().lower() in (content_type, f"{main_type}/*", "*/*")
+            for media_type in consumes
+        )
+    
+    @staticmethod
+    def _success_response(endpoint: Endpoint) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Pick the declared success response (201 for creations when declared)"""
+        successes = sorted(
+            (r for r in endpoint.responses or [] if 200 <= r.status_code < 300),
+            key=lambda r: (not (endpoint.method == 'POST' and r.status_code == 201), r.status_code)
+        )
+        if not successes:
+            return (204 if endpoint.method == 'DELETE' else 200), None
+        return successes[0].status_code, successes[0].schema
+    
+    @staticmethod
+    def _json_response(data: Any, status: int) -> web.Response:
+        """Create a JSON response"""
+        return web.Response(body=json.dumps(data).encode(), status=status, content_type="application/json")
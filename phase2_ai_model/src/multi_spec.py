@@ -0,0 +1,307 @@
+"""
+Multi Spec - Test case generation for a whole tree of OAS files in one run
+
+Specs are discovered from files, directories and glob patterns and parsed in a
+process pool, one spec per process. Generation for the endpoints of every spec
+then shares one thread pool and one LLM request rate, so the concurrency and
+rate limits hold for the run as a whole however many specs it covers. Each
+spec's cases are exported to a directory of its own, and index.json lists every
+spec with its statistics, output files or error.
+"""
+import os
+import glob
+import json
+import logging
+from typing import Dict, List, Any, Optional, Callable, Sequence, Union
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, field
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from oas_parser import OASParser
+from llm_processor import LLMProvider, CachedLLMProvider, RateLimitedProvider
+from payload_cache import PayloadCache
+from test_generator import TestCaseGenerator
+from output_formatter import export_formats
+
+logger = logging.getLogger(__name__)
+
+SPEC_SUFFIXES = (".json", ".yaml", ".yml")
+
+
+@dataclass
+class SpecRun:
+    """One spec of a multi-spec run"""
+    oas_file: Path
+    name: str
+    oas_parser: Optional[OASParser] = None
+    test_cases: List[Dict[str, Any]] = field(default_factory=list)
+    statistics: Dict[str, Any] = field(default_factory=dict)
+    output_files: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the index entry of the spec"""
+        return {
+            "name": self.name,
+            "oasFile": str(self.oas_file),
+            "title": self.oas_parser.api_title if self.oas_parser is not None else None,
+            "endpoints": len(self.oas_parser.endpoints) if self.oas_parser is not None else 0,
+            "testCases": len(self.test_cases),
+            "statistics": self.statistics,
+            "outputFiles": self.output_files,
+            "error": self.error
+        }
+
+
+def discover_specs(sources: Sequence[Union[str, Path]]) -> List[Path]:
+    """
+    Find the spec files named by files, directories and glob patterns
+    
+    Directories are searched recursively for .json, .yaml and .yml files, as are
+    "**" glob patterns. Files found more than once are returned once, in the
+    order they were first found.
+    """
+    found: Dict[Path, None] = {}
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            candidates = sorted(p for p in path.rglob("*") if p.suffix.lower() in SPEC_SUFFIXES)
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = sorted(
+                Path(p) for p in glob.glob(str(source), recursive=True)
+                if Path(p).suffix.lower() in SPEC_SUFFIXES
+            )
+        for candidate in candidates:
+            if candidate.is_file():
+                found.setdefault(candidate.resolve(), None)
+    return list(found)
+
+
+def spec_names(spec_files: List[Path]) -> List[str]:
+    """
+    Name each spec's output directory after its path below the specs' common directory
+    
+    e.g. billing/openapi.yaml and pharmacy/openapi.yaml become billing-openapi and pharmacy-openapi
+    """
+    if len(spec_files) == 1:
+        return [spec_files[0].stem]
+    root = Path(os.path.commonpath([p.parent for p in spec_files]))
+    return ["-".join(p.relative_to(root).with_suffix("").parts) for p in spec_files]
+
+
+def parse_spec(
+    oas_file: Path,
+    tags: Optional[List[str]] = None,
+    methods: Optional[List[str]] = None,
+    paths: Optional[List[str]] = None,
+    lazy: bool = False,
+    cache_dir: Optional[Path] = None
+) -> OASParser:
+    """
+    Parse one spec (runs in a worker process)
+    
+    The parser is returned without its document, which is reloaded only if used.
+    
+    Raises:
+        ValueError: If the file is not an OpenAPI/Swagger document
+    """
+    oas_parser = OASParser(oas_file, lazy=lazy, cache_dir=cache_dir)
+    oas_parser.parse(tags=tags, methods=methods, paths=paths)
+    if not oas_parser.endpoints and not ("swagger" in oas_parser.oas_doc or "openapi" in oas_parser.oas_doc):
+        raise ValueError(f"Not an OpenAPI/Swagger document: {oas_file}")
+    return oas_parser
+
+
+class MultiSpecGenerator:
+    """Generates test cases for many specs under one concurrency and rate budget"""
+    
+    def __init__(
+        self,
+        llm_provider: LLMProvider,
+        output_dir: Union[str, Path],
+        concurrency: int = 4,
+        requests_per_minute: float = 0,
+        parse_workers: Optional[int] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        payload_cache: Optional[PayloadCache] = None,
+        provider_name: str = ""
+    ):
+        """
+        Initialize multi-spec generator
+        
+        Args:
+            llm_provider: Provider shared by every spec
+            output_dir: Directory receiving index.json and one directory per spec
+            concurrency: Endpoints generated at the same time, across all specs
+            requests_per_minute: LLM requests started per minute, across all specs (0 = unlimited)
+            parse_workers: Processes parsing specs (default: one per CPU)
+            cache_dir: Spec cache directory passed to the parsers
+            payload_cache: Valid request bodies shared by the endpoints of every spec
+            provider_name: Provider name recorded in the exported metadata
+        """
+        if requests_per_minute > 0:
+            llm_provider = RateLimitedProvider(llm_provider, requests_per_minute)
+        # Cached in front of the rate limit, so repeated prompts do not use up the budget
+        self.llm_provider = CachedLLMProvider(llm_provider)
+        self.output_dir = Path(output_dir)
+        self.concurrency = max(1, concurrency)
+        self.parse_workers = parse_workers
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.payload_cache = payload_cache
+        self.provider_name = provider_name
+    
+    def run(
+        self,
+        sources: Sequence[Union[str, Path]],
+        valid_per_endpoint: int = 3,
+        invalid_per_endpoint: int = 3,
+        tags: Optional[List[str]] = None,
+        methods: Optional[List[str]] = None,
+        paths: Optional[List[str]] = None,
+        lazy: bool = False,
+        output_formats: Optional[List[str]] = None,
+        formatter_options: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse, generate and export every spec, then write the combined index
+        
+        A spec that fails to parse or generate is recorded with its error in the
+        index; the other specs are not affected.
+        
+        Args:
+            sources: Spec files, directories and glob patterns
+            valid_per_endpoint: Number of valid test cases per endpoint
+            invalid_per_endpoint: Number of invalid test cases per endpoint
+            tags: Filter endpoints by tags
+            methods: Filter endpoints by HTTP methods
+            paths: Filter endpoints by path glob patterns
+            lazy: Parse JSON specs lazily
+            output_formats: Formats written for each spec (default: json)
+            formatter_options: Per-format formatter options
+        
+        Returns:
+            The combined index
+        
+        Raises:
+            FileNotFoundError: If the sources name no spec files
+        """
+        # Outputs of earlier runs are not specs, even when the output directory is below a source
+        output_dir = self.output_dir.resolve()
+        spec_files = [path for path in discover_specs(sources) if not path.is_relative_to(output_dir)]
+        if not spec_files:
+            raise FileNotFoundError(f"No OAS files found in: {', '.join(map(str, sources))}")
+        
+        runs = [SpecRun(oas_file=path, name=name) for path, name in zip(spec_files, spec_names(spec_files))]
+        logger.info(f"Processing {len(runs)} specs")
+        
+        self.parse_all(runs, tags, methods, paths, lazy)
+        
+        parsed = [run for run in runs if run.oas_parser is not None]
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="generation") as pool:
+            # One thread per spec only waits for its endpoints, which all run in the shared pool
+            with ThreadPoolExecutor(max_workers=max(1, len(parsed)), thread_name_prefix="spec") as specs:
+                list(specs.map(
+                    lambda run: self.generate(
+                        run, pool, valid_per_endpoint, invalid_per_endpoint,
+                        tags, output_formats or ["json"], formatter_options
+                    ),
+                    parsed
+                ))
+        
+        return self.write_index(runs)
+    
+    def parse_all(
+        self,
+        runs: List[SpecRun],
+        tags: Optional[List[str]],
+        methods: Optional[List[str]],
+        paths: Optional[List[str]],
+        lazy: bool
+    ) -> None:
+        """Parse the specs of the runs in a process pool (in this process for a single spec)"""
+        args = [(run.oas_file, tags, methods, paths, lazy, self.cache_dir) for run in runs]
+        if len(runs) == 1 or self.parse_workers == 1:
+            for run, run_args in zip(runs, args):
+                self._set_parser(run, lambda: parse_spec(*run_args))
+            return
+        
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as executor:
+            futures = [executor.submit(parse_spec, *run_args) for run_args in args]
+            for run, future in zip(runs, futures):
+                self._set_parser(run, future.result)
+    
+    @staticmethod
+    def _set_parser(run: SpecRun, parse: Callable[[], OASParser]) -> None:
+        """Record the parsed spec of a run, or the error parsing it"""
+        try:
+            run.oas_parser = parse()
+        except Exception as e:
+            logger.error(f"Failed to parse {run.oas_file}: {e}")
+            run.error = str(e)
+    
+    def generate(
+        self,
+        run: SpecRun,
+        pool: Executor,
+        valid_per_endpoint: int,
+        invalid_per_endpoint: int,
+        tags: Optional[List[str]],
+        output_formats: List[str],
+        formatter_options: Optional[Dict[str, Dict[str, Any]]]
+    ) -> None:
+        """Generate and export the test cases of one parsed spec, with endpoints running in the shared pool"""
+        try:
+            generator = TestCaseGenerator(
+                run.oas_file,
+                llm_provider=self.llm_provider,
+                oas_parser=run.oas_parser,
+                payload_cache=self.payload_cache
+            )
+            if self.provider_name:
+                generator.llm_provider_name = self.provider_name
+            
+            run.test_cases = generator.generate_all_tests(
+                valid_cases_per_endpoint=valid_per_endpoint,
+                invalid_cases_per_endpoint=invalid_per_endpoint,
+                filter_tags=tags,
+                executor=pool
+            )
+            
+            metadata = generator.get_export_metadata()
+            metadata["baseUrl"] = "http://localhost:8080"
+            output_files = export_formats(
+                run.test_cases, metadata, output_formats, self.output_dir / run.name,
+                formatter_options=formatter_options
+            )
+            run.output_files = {name: str(path) for name, path in output_files.items()}
+            run.statistics = generator.get_statistics()
+            logger.info(f"Generated {len(run.test_cases)} test cases for {run.name}")
+        except Exception as e:
+            logger.error(f"Failed to generate test cases for {run.oas_file}: {e}", exc_info=True)
+            run.error = str(e)
+    
+    def write_index(self, runs: List[SpecRun]) -> Dict[str, Any]:
+        """Write index.json listing every spec of the run"""
+        index = {
+            "generatedAt": datetime.now().isoformat(),
+            "specs": [run.to_dict() for run in runs],
+            "totals": {
+                "specs": len(runs),
+                "failed": sum(1 for run in runs if run.error),
+                "endpoints": sum(len(run.oas_parser.endpoints) for run in runs if run.oas_parser is not None),
+                "testCases": sum(len(run.test_cases) for run in runs)
+            },
+            "llmCache": self.llm_provider.get_stats()
+        }
+        if self.payload_cache is not None:
+            index["payloadCache"] = self.payload_cache.get_stats()
+            self.payload_cache.save()
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        index_path = self.output_dir / "index.json"
+        index_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        index["indexFile"] = str(index_path)
+        return index
@@ -0,0 +1,328 @@
+"""
+Mutation Engine - Derives INVALID test cases from validated VALID ones
+
+An INVALID case written by the LLM costs as many output tokens as a VALID one,
+yet most of them are a valid request with one thing broken. The engine breaks
+validated VALID cases locally instead: typed mutators driven by the parsed
+parameters and body schema drop required fields, swap types, overflow lengths
+and numbers, send malformed IDs and injection strings, oversize the payload
+and send the wrong content type. Each variant expects the 4xx status the spec
+declares for its kind of error; mutations whose statuses the operation does
+not declare are skipped rather than guessed. Variants repeating an existing
+request and expectation are dropped.
+"""
+import copy
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+
+from oas_parser import Endpoint, parse_status_code
+from schema_resolver import SchemaResolver
+from schema_sampler import SchemaSampler
+from coverage_index import CONSTRAINT_DESCRIPTIONS, constraint_violations, endpoint_fields
+
+logger = logging.getLogger(__name__)
+
+OMIT = object()  # Change removing a field
+
+SOURCES = {"path": "pathParams", "query": "queryParams", "header": "requestHeaders", "body": "requestBody"}
+
+MUTATION_DESCRIPTIONS = {
+    **CONSTRAINT_DESCRIPTIONS,
+    "overflow": "send {location} beyond the 64-bit integer range",
+    "injection": "send an injection string in {location}",
+    "malformed_id": "send a malformed {location}",
+    "oversized": "send a request body larger than the API accepts",
+    "content_type": "send the request body as text/plain",
+    "malformed_json": "send a truncated JSON request body"
+}
+
+# Expected statuses per kind of error; the first one the operation declares wins,
+# and a mutation is skipped when the operation declares none of them
+VALIDATION_STATUSES = (400, 422)
+MALFORMED_ID_STATUSES = (404, 400)  # an ID naming no resource is not found before it is validated
+OVERSIZED_STATUSES = (413, 400)
+CONTENT_TYPE_STATUSES = (415,)  # frameworks reject unsupported media types before validating
+
+WRONG_TYPE_VALUES = {
+    "integer": "not-a-number",
+    "number": "not-a-number",
+    "boolean": "not-a-boolean",
+    "string": 12345,
+    "object": "not-an-object",
+    "array": "not-an-array"
+}
+INJECTION_VALUES = ("' OR '1'='1", "<script>alert(1)</script>")
+MALFORMED_IDS = ("not-a-valid-id", "' OR '1'='1")
+PATTERN_MISMATCH_VALUE = "!@#$%"
+INT64_MAX = 2 ** 63 - 1
+
+# Fields describing the expected success response, dropped from the variants
+RESPONSE_FIELDS = ("expectedResponseFields", "assertions", "maxResponseTimeMs")
+
+
+def fingerprint(test_case: Dict[str, Any]) -> str:
+    """Hash the request and expected status of a test case"""
+    key = json.dumps(
+        [
+            str(test_case.get("method", "GET")).upper(),
+            test_case.get("endpoint"),
+            test_case.get("pathParams") or {},
+            test_case.get("queryParams") or {},
+            test_case.get("requestHeaders") or {},
+            test_case.get("requestBody"),
+            test_case.get("expectedStatusCode")
+        ],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class MutationEngine:
+    """Derives INVALID variants of validated VALID test cases"""
+    
+    def __init__(
+        self,
+        definitions: Optional[Dict[str, Any]] = None,
+        variants_per_item: int = 1,
+        max_body_bytes: int = 0
+    ):
+        """
+        Initialize mutation engine
+        
+        Args:
+            definitions: Schema definitions used to follow $ref in body schemas
+            variants_per_item: Variants kept per endpoint and mutation item (kind and
+                field, e.g. "too_long:body.name"), across all of its VALID cases
+            max_body_bytes: Request body size limit of the API; when set, a variant
+                exceeding it is derived per body (0 = unknown, none derived)
+        """
+        self.resolver = SchemaResolver(definitions=definitions or {})
+        self.sampler = SchemaSampler()
+        self.variants_per_item = variants_per_item
+        self.max_body_bytes = max_body_bytes
+        self.derived = 0
+        self.duplicates = 0
+        self._seen: set = set()
+        self._items: Dict[Tuple[str, str, str], int] = {}  # (method, path, item) -> variants kept
+        self._fields: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any], bool]]] = {}
+        self._lock = threading.Lock()
+    
+    def seed(self, test_cases: List[Dict[str, Any]]) -> None:
+        """Record existing test cases, so variants repeating them are dropped"""
+        with self._lock:
+            self._seen.update(fingerprint(test_case) for test_case in test_cases)
+    
+    def mutate(self, endpoint: Endpoint, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Derive INVALID variants from an endpoint's test cases
+        
+        Only VALID cases whose parameters and body satisfy the spec are mutated, so
+        each variant breaks exactly one thing. All given cases count as existing.
+        
+        Args:
+            endpoint: Endpoint the test cases were generated for
+            test_cases: Generated test cases of the endpoint
+        
+        Returns:
+            New INVALID test cases
+        """
+        fields = self._endpoint_fields(endpoint)
+        self.seed(test_cases)
+        
+        variants = []
+        for test_case in test_cases:
+            if not self.is_valid_case(test_case, endpoint, fields):
+                continue
+            number = 0
+            for kind, location, changes, statuses in self._mutations(test_case, endpoint, fields):
+                expected_status = self.expected_status(endpoint, statuses)
+                if expected_status is None:
+                    continue
+                item = f"{kind}:{location}"
+                variant = self._apply(test_case, changes)
+                variant.update({
+                    "testId": f"{test_case.get('testId', 'TC')}-M{number + 1:02d}",
+                    "category": "INVALID",
+                    "priority": "MEDIUM",
+                    "description": f"{test_case.get('description', '')} - {self.describe(kind, location)}".lstrip(" -"),
+                    "expectedStatusCode": expected_status,
+                    "mutation": item,
+                    "derivedFrom": test_case.get("testId")
+                })
+                key = fingerprint(variant)
+                count_key = (endpoint.method, endpoint.path, item)
+                with self._lock:
+                    if key in self._seen:
+                        self.duplicates += 1
+                        continue
+                    if self._items.get(count_key, 0) >= self.variants_per_item:
+                        continue
+                    self._seen.add(key)
+                    self._items[count_key] = self._items.get(count_key, 0) + 1
+                    self.derived += 1
+                number += 1
+                variants.append(variant)
+        
+        logger.debug(f"Derived {len(variants)} INVALID cases for {endpoint.method} {endpoint.path}")
+        return variants
+    
+    def is_valid_case(
+        self,
+        test_case: Dict[str, Any],
+        endpoint: Endpoint,
+        fields: Optional[List[Tuple[str, Dict[str, Any], bool]]] = None
+    ) -> bool:
+        """Whether a test case is VALID, expects success and sends values the spec allows"""
+        if test_case.get("category") != "VALID":
+            return False
+        status = parse_status_code(test_case.get("expectedStatusCode") or 0)
+        if status is None:
+            logger.warning(f"Not deriving cases from {test_case.get('testId')}: "
+                           f"invalid expected status {test_case.get('expectedStatusCode')!r}")
+            return False
+        if status >= 400:
+            return False
+        for location, constraints, _ in fields if fields is not None else self._endpoint_fields(endpoint):
+            source, name = location.split(".", 1)
+            if source == "body":
+                continue
+            value = (test_case.get(SOURCES[source]) or {}).get(name)
+            if value is not None and constraint_violations(value, constraints, from_string=True):
+                return False
+        body = test_case.get("requestBody")
+        schema = self.resolver.resolve(endpoint.request_body_schema or {})
+        return not (schema and body is not None and self.sampler.validate(body, schema))
+    
+    @staticmethod
+    def expected_status(endpoint: Endpoint, statuses: Tuple[int, ...]) -> Optional[int]:
+        """Get the first preferred status the endpoint declares, or None if it declares none of them"""
+        declared = {response.status_code for response in endpoint.responses or []}
+        return next((status for status in statuses if status in declared), None)
+    
+    @staticmethod
+    def describe(kind: str, location: str) -> str:
+        """Describe a mutation"""
+        if "." in location:
+            source, name = location.split(".", 1)
+            location = f"{'request body field' if source == 'body' else source + ' parameter'} {name}"
+        return MUTATION_DESCRIPTIONS[kind].format(location=location)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get mutation statistics"""
+        return {"derived": self.derived, "duplicates": self.duplicates}
+    
+    def _endpoint_fields(self, endpoint: Endpoint) -> List[Tuple[str, Dict[str, Any], bool]]:
+        """Get an endpoint's fields, computed once per endpoint"""
+        key = (endpoint.method, endpoint.path)
+        if key not in self._fields:
+            self._fields[key] = endpoint_fields(endpoint, self.resolver)
+        return self._fields[key]
+    
+    def _mutations(
+        self,
+        test_case: Dict[str, Any],
+        endpoint: Endpoint,
+        fields: List[Tuple[str, Dict[str, Any], bool]]
+    ) -> Iterator[Tuple[str, str, Dict[str, Any], Tuple[int, ...]]]:
+        """
+        Yield the mutations of a VALID test case
+        
+        Yields:
+            (kind, location, changes, preferred statuses), where changes maps a
+            location ("body.name", or "body" for the whole body) to its new value or OMIT
+        """
+        body = test_case.get("requestBody")
+        
+        # Path parameters are named by the test case's template, which may differ from the spec's
+        for name in test_case.get("pathParams") or {}:
+            for value in MALFORMED_IDS:
+                yield "malformed_id", f"path.{name}", {f"path.{name}": value}, MALFORMED_ID_STATUSES
+        
+        for location, constraints, required in fields:
+            source, name = location.split(".", 1)
+            if source == "path":
+                continue
+            if source == "body" and not isinstance(body, dict):
+                continue
+            from_string = source != "body"
+            present = (test_case.get(SOURCES[source]) or {}).get(name) is not None
+            
+            if required and present:
+                yield "missing", location, {location: OMIT}, VALIDATION_STATUSES
+            for kind, value in self._invalid_values(constraints, from_string):
+                yield kind, location, {location: value}, VALIDATION_STATUSES
+        
+        if endpoint.request_body_schema and isinstance(body, (dict, list)):
+            text = json.dumps(body)
+            if self.max_body_bytes > 0:
+                yield "oversized", "body", {"body": self._oversized(body)}, OVERSIZED_STATUSES
+            yield "content_type", "body", {"header.Content-Type": "text/plain", "body": text}, CONTENT_TYPE_STATUSES
+            yield "malformed_json", "body", {
+                "header.Content-Type": "application/json", "body": text[:-1]
+            }, VALIDATION_STATUSES
+    
+    @staticmethod
+    def _invalid_values(constraints: Dict[str, Any], from_string: bool) -> Iterator[Tuple[str, Any]]:
+        """Yield (kind, value) pairs a field's constraints reject"""
+        field_type = constraints.get("type")
+        if field_type in WRONG_TYPE_VALUES and not (from_string and field_type == "string"):
+            yield "wrong_type", WRONG_TYPE_VALUES[field_type]
+        
+        if field_type in ("integer", "number"):
+            if constraints.get("minimum") is not None:
+                yield "below_minimum", constraints["minimum"] - 1
+            if constraints.get("maximum") is not None:
+                yield "above_maximum", constraints["maximum"] + 1
+            elif field_type == "integer":
+                yield "overflow", INT64_MAX + 1
+        
+        if field_type in (None, "string"):
+            if constraints.get("maxLength") is not None:
+                yield "too_long", "x" * (constraints["maxLength"] + 1)
+            if constraints.get("minLength"):
+                yield "too_short", "x" * (constraints["minLength"] - 1)
+            if constraints.get("pattern") and constraint_violations(PATTERN_MISMATCH_VALUE, constraints, from_string):
+                yield "pattern_mismatch", PATTERN_MISMATCH_VALUE
+        
+        if constraints.get("enum"):
+            value = f"NOT_{constraints['enum'][0]}"
+            if value not in constraints["enum"]:
+                yield "invalid_enum", value
+        
+        # Free text may legitimately hold these strings; only fields that reject them get one
+        for value in INJECTION_VALUES:
+            if constraint_violations(value, constraints, from_string):
+                yield "injection", value
+                break
+    
+    def _oversized(self, body: Any) -> Any:
+        """Pad a body past max_body_bytes, in its first string field or a new one"""
+        padding = "x" * (self.max_body_bytes + 1)
+        if not isinstance(body, dict):
+            return {"padding": padding}
+        oversized = copy.deepcopy(body)
+        name = next((key for key, value in body.items() if isinstance(value, str)), "padding")
+        oversized[name] = padding
+        return oversized
+    
+    @staticmethod
+    def _apply(test_case: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a test case with changes applied"""
+        variant = copy.deepcopy({key: value for key, value in test_case.items() if key not in RESPONSE_FIELDS})
+        for location, value in changes.items():
+            if location == "body":
+                variant["requestBody"] = value
+                continue
+            source, name = location.split(".", 1)
+            target = variant.get(SOURCES[source])
+            if not isinstance(target, dict):
+                target = variant[SOURCES[source]] = {}
+            if value is OMIT:
+                target.pop(name, None)
+            else:
+                target[name] = value
+        return variant
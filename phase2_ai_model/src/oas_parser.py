@@ -2,17 +2,56 @@
 OpenAPI Specification (OAS) Parser
 Extracts endpoints, parameters, schemas, and constraints from OAS documents
 """
+import os
+import re
+import sys
 import json
-import yaml
-from typing import Dict, List, Any, Optional, Union
+import pickle
+import hashlib
+import inspect
+from fnmatch import fnmatch
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple, Union
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 import logging
 
+from tracing import span
+from schema_resolver import SchemaResolver, definitions_of
+from lazy_json import LazyObject
+from endpoint_index import EndpointIndex
+
 logger = logging.getLogger(__name__)
 
+HTTP_METHODS = ['get', 'post', 'put', 'delete', 'patch', 'options', 'head']
+
+# Parts of a JSON spec that lazy parsing scans member by member instead of decoding whole
+LAZY_LAYOUT = {
+    "paths": {},
+    "definitions": {},
+    "parameters": {},
+    "responses": {},
+    "components": {"schemas": {}, "parameters": {}, "responses": {}, "requestBodies": {}}
+}
+
+STATUS_CODE = re.compile(r"^\s*(\d{3})\b")
+
+
+def parse_status_code(value: Any) -> Optional[int]:
+    """
+    Read an expected status code written as 201, "201" or "201 Created"
+    
+    Returns:
+        The status code, or None when the value holds none (e.g. "4xx")
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    match = STATUS_CODE.match(str(value))
+    return int(match.group(1)) if match else None
+
 
-@dataclass
+@dataclass(slots=True)
 class Parameter:
     """Represents an API parameter"""
     name: str
@@ -28,18 +67,31 @@ class Parameter:
     max_length: Optional[int] = None
     pattern: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the fields as a dict; enum values are shared, not copied"""
+        return {name: getattr(self, name) for name in self.__slots__}
 
-@dataclass
+
+@dataclass(slots=True)
 class ResponseSchema:
     """Represents API response schema"""
     status_code: int
     content_type: str = "application/json"
     schema: Dict[str, Any] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the fields as a dict; the schema is shared, not copied"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
-@dataclass
+@dataclass(slots=True)
 class Endpoint:
-    """Represents an API endpoint"""
+    """
+    Represents an API endpoint
+    
+    Resolved schemas are shared between the endpoints that reference the same
+    definitions; treat them as read-only.
+    """
     path: str
     method: str
     summary: str = ""
@@ -49,78 +101,280 @@ class Endpoint:
     parameters: List[Parameter] = None
     request_body_schema: Dict[str, Any] = None
     request_required_fields: List[str] = None
+    request_body_required: bool = False
     responses: List[ResponseSchema] = None
     produces: List[str] = None
     consumes: List[str] = None
+    _parameter_views: Optional[Tuple[Mapping[str, Any], ...]] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the fields as a dict; schemas are shared, not copied"""
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+        data["parameters"] = [p.to_dict() for p in self.parameters] if self.parameters is not None else None
+        data["responses"] = [r.to_dict() for r in self.responses] if self.responses is not None else None
+        return data
 
-    def to_dict(self):
-        return asdict(self)
+    def parameter_views(self) -> Tuple[Mapping[str, Any], ...]:
+        """Read-only dict views of the parameters, built once and reused by every prompt"""
+        if self._parameter_views is None:
+            self._parameter_views = tuple(MappingProxyType(p.to_dict()) for p in self.parameters or [])
+        return self._parameter_views
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the fields only; the views are rebuilt on demand"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._parameter_views = None
 
 
 class OASParser:
     """Parse OpenAPI/Swagger specifications"""
 
-    def __init__(self, oas_file_path: Union[str, Path]):
+    def __init__(self, oas_file_path: Union[str, Path], lazy: bool = False, cache_dir: Optional[Union[str, Path]] = None):
         """
         Initialize OAS Parser
         
         Args:
             oas_file_path: Path to OAS file (YAML or JSON)
+            lazy: Decode path items and definitions of a JSON spec only when they are used,
+                so memory and parse time follow the operations selected in parse();
+                YAML specs are always loaded whole
+            cache_dir: Directory caching parsed endpoints per spec content and parser version;
+                with a cache the document itself is only loaded when parse() misses or it is used
         """
         self.file_path = Path(oas_file_path)
-        self.oas_doc = self._load_oas_document()
+        self.lazy = lazy
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
         self.endpoints: List[Endpoint] = []
-        self.api_version = self.oas_doc.get("info", {}).get("version", "1.0.0")
-        self.base_path = self.oas_doc.get("basePath", "")
-        self.api_title = self.oas_doc.get("info", {}).get("title", "API")
+        self._oas_doc: Optional[Dict[str, Any]] = None
+        self._api_info: Optional[Dict[str, str]] = None
+        self._definitions: Optional[Dict[str, Any]] = None
+        self._resolver: Optional[SchemaResolver] = None
+        self._enums: Dict[Tuple[Any, ...], List[Any]] = {}
+        self._index: Optional[EndpointIndex] = None
+        if self.cache_dir is None:
+            self._oas_doc = self._load_oas_document()
+
+    @property
+    def oas_doc(self) -> Dict[str, Any]:
+        """The OAS document, loaded on first use"""
+        if self._oas_doc is None:
+            self._oas_doc = self._load_oas_document()
+        return self._oas_doc
+
+    @property
+    def resolver(self) -> SchemaResolver:
+        """$ref resolver of the document"""
+        if self._resolver is None:
+            self._resolver = SchemaResolver(self.oas_doc)
+        return self._resolver
+
+    @property
+    def api_info(self) -> Dict[str, str]:
+        """Title, version and base path of the API"""
+        if self._api_info is None:
+            info = self.oas_doc.get("info", {})
+            self._api_info = {
+                "title": info.get("title", "API"),
+                "version": info.get("version", "1.0.0"),
+                "base_path": self.oas_doc.get("basePath", "")
+            }
+        return self._api_info
+
+    @property
+    def api_title(self) -> str:
+        """Title of the API"""
+        return self.api_info["title"]
+
+    @property
+    def api_version(self) -> str:
+        """Version of the API"""
+        return self.api_info["version"]
+
+    @property
+    def base_path(self) -> str:
+        """Swagger 2.0 base path of the API"""
+        return self.api_info["base_path"]
+
+    @property
+    def index(self) -> EndpointIndex:
+        """Tag, method, operationId and path indexes of the parsed endpoints, rebuilt after parse() adds some"""
+        if self._index is None or len(self._index) != len(self.endpoints):
+            self._index = EndpointIndex(self.endpoints, self.base_path)
+        return self._index
+
+    @property
+    def definitions(self) -> Dict[str, Any]:
+        """
+        Named schemas of the document (definitions or components/schemas)
+        
+        After parse() hit the spec cache, these are the schemas the parsed endpoints
+        reference, so the document is not loaded for them.
+        """
+        if self._definitions is not None:
+            return self._definitions
+        return definitions_of(self.oas_doc)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the parsed endpoints and API info without the document, which reloads on use"""
+        if self._oas_doc is not None:
+            self.api_info  # computed while the document is at hand
+        state = self.__dict__.copy()
+        state.update(_oas_doc=None, _resolver=None, _enums={}, _index=None)
+        return state
 
     def _load_oas_document(self) -> Dict[str, Any]:
         """Load OAS document from YAML or JSON file"""
         try:
-            if self.file_path.suffix.lower() in ['.yaml', '.yml']:
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f)
-            else:  # JSON
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            with span("load_spec", "oas", file=self.file_path.name):
+                if self.file_path.suffix.lower() in ['.yaml', '.yml']:
+                    import yaml  # only YAML specs need it
+                    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)  # libyaml when available
+                    with open(self.file_path, 'r', encoding='utf-8') as f:
+                        return yaml.load(f, Loader=loader)
+                elif self.lazy:
+                    return LazyObject(self.file_path.read_text(encoding='utf-8'), layout=LAZY_LAYOUT)
+                else:  # JSON
+                    with open(self.file_path, 'r', encoding='utf-8') as f:
+                        return json.load(f)
         except Exception as e:
             logger.error(f"Failed to load OAS document: {e}")
             raise
 
-    def parse(self) -> List[Endpoint]:
-        """Parse all endpoints from OAS document"""
-        paths = self.oas_doc.get("paths", {})
+    def parse(
+        self,
+        tags: Optional[List[str]] = None,
+        methods: Optional[List[str]] = None,
+        paths: Optional[List[str]] = None
+    ) -> List[Endpoint]:
+        """
+        Parse endpoints from OAS document
+        
+        Operations the filters exclude are skipped before anything is built for them;
+        in lazy mode, path items excluded by the path filter are not even decoded.
+        
+        Args:
+            tags: Only parse operations with at least one of these tags
+            methods: Only parse these HTTP methods
+            paths: Only parse paths matching one of these glob patterns, e.g. "/v1/hospitais*"
+        
+        Returns:
+            Parsed endpoints
+        """
+        cache_path = self._cache_path(tags, methods, paths) if self.cache_dir is not None else None
+        if cache_path is not None and self._load_cache(cache_path):
+            logger.info(f"Loaded {len(self.endpoints)} endpoints from spec cache {cache_path.name}")
+            return self.endpoints
         
-        for path, path_item in paths.items():
-            for method, operation in path_item.items():
-                if method.lower() not in ['get', 'post', 'put', 'delete', 'patch', 'options', 'head']:
+        methods = [m.lower() for m in methods] if methods else HTTP_METHODS
+        with span("parse_spec", "oas", file=self.file_path.name):
+            path_items = self.oas_doc.get("paths", {})
+            
+            for path in path_items:
+                if paths and not any(fnmatch(path, pattern) for pattern in paths):
                     continue
+                # Lazy path items are decoded for this loop only and not kept in the document
+                path_item = path_items.load(path) if isinstance(path_items, LazyObject) else path_items[path]
                 
-                endpoint = self._parse_operation(path, method.upper(), operation)
-                self.endpoints.append(endpoint)
+                for method, operation in path_item.items():
+                    if method.lower() not in HTTP_METHODS or method.lower() not in methods:
+                        continue
+                    if tags and not any(tag in (operation.get("tags") or []) for tag in tags):
+                        continue
+                    
+                    endpoint = self._parse_operation(path, method.upper(), operation)
+                    self.endpoints.append(endpoint)
         
         logger.info(f"Parsed {len(self.endpoints)} endpoints from OAS document")
+        if cache_path is not None:
+            self._write_cache(cache_path)
         return self.endpoints
 
+    def _cache_path(self, tags: Optional[List[str]], methods: Optional[List[str]], paths: Optional[List[str]]) -> Path:
+        """Get the cache file of this spec's content, the parser version and the filters"""
+        selection = json.dumps([
+            str(self.file_path.resolve()),
+            sorted(tags or []),
+            sorted(m.lower() for m in methods or []),
+            sorted(paths or [])
+        ])
+        content = hashlib.sha256(self.file_path.read_bytes()).hexdigest()
+        version = hashlib.sha256(f"{parser_fingerprint()}{content}".encode()).hexdigest()[:16]
+        return self.cache_dir / f"{self.file_path.stem}-{hashlib.sha256(selection.encode()).hexdigest()[:12]}-{version}.pickle"
+
+    def _load_cache(self, cache_path: Path) -> bool:
+        """Restore parsed endpoints from a cache file; False if there is none or it is unreadable"""
+        if not cache_path.exists():
+            return False
+        try:
+            with span("load_spec_cache", "oas", file=self.file_path.name):
+                with open(cache_path, 'rb') as f:
+                    cached = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable spec cache {cache_path}: {e}")
+            return False
+        self._api_info = cached["api_info"]
+        self._definitions = cached["definitions"]
+        self.endpoints.extend(cached["endpoints"])
+        return True
+
+    def _write_cache(self, cache_path: Path) -> None:
+        """Write the parsed endpoints to a cache file, replacing stale caches of the same selection"""
+        selection = cache_path.name.rsplit('-', 1)[0]
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                # One pickle keeps the $ref definitions shared between endpoints shared
+                pickle.dump({
+                    "api_info": self.api_info,
+                    "endpoints": self.endpoints,
+                    "definitions": self.resolver.used_definitions()
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+            for stale in self.cache_dir.glob(f"{selection}-*.pickle"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            temp_path.unlink(missing_ok=True)
+            logger.warning(f"Could not write spec cache {cache_path}: {e}")
+
     def _parse_operation(self, path: str, method: str, operation: Dict[str, Any]) -> Endpoint:
         """Parse a single operation/endpoint"""
-        parameters = self._parse_parameters(operation.get("parameters", []))
-        request_body_schema, required_fields = self._parse_request_body(operation.get("requestBody"))
+        raw_parameters = [self.resolver.resolve(p) for p in operation.get("parameters", [])]
+        parameters = self._parse_parameters([p for p in raw_parameters if p.get("in") != "body"])
+        request_body = self.resolver.resolve(operation.get("requestBody"))
+        request_body_schema, required_fields = self._parse_request_body(request_body)
+        body_required = bool(request_body and request_body.get("required"))
+        # OpenAPI 3 lists the accepted media types in requestBody.content, Swagger 2.0 in consumes
+        consumes = list((request_body or {}).get("content") or []) \
+            or operation.get("consumes") or self.oas_doc.get("consumes") or ["application/json"]
+        if request_body_schema is None:
+            # Swagger 2.0 declares the request body as an "in: body" parameter
+            body_param = next((p for p in raw_parameters if p.get("in") == "body"), None)
+            if body_param and body_param.get("schema"):
+                request_body_schema = body_param["schema"]
+                required_fields = request_body_schema.get("required", [])
+                body_required = bool(body_param.get("required"))
         responses = self._parse_responses(operation.get("responses", {}))
 
         endpoint = Endpoint(
-            path=path,
-            method=method,
+            path=sys.intern(path),
+            method=sys.intern(method),
             summary=operation.get("summary", ""),
             description=operation.get("description", ""),
             operation_id=operation.get("operationId", ""),
-            tags=operation.get("tags", []),
+            tags=[sys.intern(tag) for tag in operation.get("tags", [])],
             parameters=parameters,
             request_body_schema=request_body_schema,
             request_required_fields=required_fields or [],
+            request_body_required=body_required,
             responses=responses,
             produces=operation.get("produces", ["application/json"]),
-            consumes=operation.get("consumes", ["application/json"])
+            consumes=consumes
         )
         return endpoint
 
@@ -133,13 +387,13 @@ class OASParser:
             param_type = param.get("type", schema.get("type", "string"))
             
             parsed_param = Parameter(
-                name=param.get("name", ""),
-                in_=param.get("in", ""),
+                name=sys.intern(param.get("name", "")),
+                in_=sys.intern(param.get("in", "")),
                 required=param.get("required", False),
-                data_type=param_type,
+                data_type=sys.intern(param_type),
                 description=param.get("description", ""),
                 example=param.get("example", schema.get("example")),
-                enum_values=param.get("enum", schema.get("enum")),
+                enum_values=self._shared_enum(param.get("enum", schema.get("enum"))),
                 minimum=param.get("minimum", schema.get("minimum")),
                 maximum=param.get("maximum", schema.get("maximum")),
                 min_length=param.get("minLength", schema.get("minLength")),
@@ -150,6 +404,18 @@ class OASParser:
         
         return parsed_params
 
+    def _shared_enum(self, values: Optional[List[Any]]) -> Optional[List[Any]]:
+        """Get one shared list (with interned strings) per distinct enum, e.g. a status enum on every listing"""
+        if not values:
+            return values
+        try:
+            shared = self._enums.get(tuple(values))
+        except TypeError:  # unhashable enum values
+            return values
+        if shared is None:
+            shared = self._enums[tuple(values)] = [sys.intern(v) if isinstance(v, str) else v for v in values]
+        return shared
+
     def _parse_request_body(self, request_body: Dict[str, Any]) -> tuple[Optional[Dict], Optional[List[str]]]:
         """Parse request body schema"""
         if not request_body:
@@ -177,11 +443,15 @@ class OASParser:
             except ValueError:
                 continue
             
+            response_obj = self.resolver.resolve(response_obj)
+            
             content = response_obj.get("content", {})
             schema = None
             
             if "application/json" in content:
                 schema = content["application/json"].get("schema")
+            elif "schema" in response_obj:  # Swagger 2.0
+                schema = response_obj["schema"]
             
             parsed_response = ResponseSchema(
                 status_code=code,
@@ -198,7 +468,23 @@ class OASParser:
 
     def get_endpoints_by_tag(self, tag: str) -> List[Endpoint]:
         """Get endpoints filtered by tag"""
-        return [e for e in self.endpoints if tag in (e.tags or [])]
+        return list(self.index.by_tag.get(tag, []))
+
+    def get_endpoints_by_method(self, method: str) -> List[Endpoint]:
+        """Get endpoints filtered by HTTP method"""
+        return list(self.index.by_method.get(method.upper(), []))
+
+    def get_endpoint_by_operation_id(self, operation_id: str) -> Optional[Endpoint]:
+        """Get the endpoint with an operationId"""
+        return self.index.by_operation_id.get(operation_id)
+
+    def get_endpoints_by_path_prefix(self, prefix: str) -> List[Endpoint]:
+        """Get endpoints whose path template starts with a prefix, e.g. /v1/hospitais"""
+        return self.index.with_path_prefix(prefix)
+
+    def match_url(self, url: str, method: Optional[str] = None) -> Optional[Endpoint]:
+        """Map a concrete URL, e.g. from a run result or log, back to its endpoint"""
+        return self.index.match(url, method)
 
     def get_endpoint_summary(self) -> Dict[str, Any]:
         """Get summary of parsed endpoints"""
@@ -223,10 +509,23 @@ class OASParser:
         endpoints_data = {
             "api_title": self.api_title,
             "api_version": self.api_version,
-            "endpoints": [asdict(e) for e in self.endpoints]
+            "endpoints": [e.to_dict() for e in self.endpoints]
         }
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(endpoints_data, f, indent=2, default=str)
         
         logger.info(f"Exported {len(self.endpoints)} endpoints to {output_path}")
+
+
+@lru_cache(maxsize=None)
+def parser_fingerprint() -> str:
+    """
+    Hash of the source of the parser and the modules shaping what it pickles
+    
+    Cached parses of another version of any of them are not reused.
+    """
+    digest = hashlib.sha256()
+    for source in (__file__, inspect.getfile(SchemaResolver), inspect.getfile(LazyObject), inspect.getfile(EndpointIndex)):
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()
@@ -3,18 +3,28 @@ Output Formatter - Formats generated test cases for various output formats
 """
 import json
 import csv
+import re
+import heapq
 import logging
-from typing import Dict, List, Any, Union
+import statistics
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+from tracing import span
+from case_templates import PLACEHOLDER, is_template, template_rows, expand_templates
+
 logger = logging.getLogger(__name__)
 
 
 class OutputFormatter(ABC):
     """Abstract base class for output formatters"""
     
+    file_extension = "json"
+    
     @abstractmethod
     def format(self, test_cases: List[Dict[str, Any]], metadata: Dict[str, Any]) -> Any:
         """Format test cases"""
@@ -38,18 +48,34 @@ class JSONFormatter(OutputFormatter):
         }
     
     def write(self, output_path: Union[str, Path], formatted_data: Dict[str, Any]) -> None:
-        """Write JSON to file"""
+        """Write JSON to file, with each row of a template's data table on one line"""
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(formatted_data, f, indent=2)
+        tables = {}
+        test_cases = []
+        for tc in formatted_data.get("testCases", []):
+            if is_template(tc):
+                marker = f"@@rows-{len(tables)}@@"
+                tables[json.dumps(marker)] = tc["data"]["rows"]
+                tc = {**tc, "data": {**tc["data"], "rows": marker}}
+            test_cases.append(tc)
+        
+        content = json.dumps({**formatted_data, "testCases": test_cases}, indent=2)
+        for marker, rows in tables.items():
+            start = content.index(marker)
+            indent = " " * (start - content.rindex("\n", 0, start) - 1 - len('"rows": '))
+            lines = ",\n".join(f"{indent}  {json.dumps(row)}" for row in rows)
+            content = content[:start] + (f"[\n{lines}\n{indent}]" if rows else "[]") + content[start + len(marker):]
+        
+        output_path.write_text(content, encoding='utf-8')
         
         logger.info(f"JSON output written to {output_path}")
     
     @staticmethod
     def _create_summary(test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Create summary statistics"""
+        """Create summary statistics, counting each row of a template as a test case"""
+        test_cases = expand_templates(test_cases)
         valid_count = len([tc for tc in test_cases if tc.get('category') == 'VALID'])
         invalid_count = len([tc for tc in test_cases if tc.get('category') == 'INVALID'])
         
@@ -74,12 +100,35 @@ class JSONFormatter(OutputFormatter):
         }
 
 
+class JSONLFormatter(OutputFormatter):
+    """Format test cases as JSON Lines (one test case per line)"""
+    
+    file_extension = "jsonl"
+    
+    def format(self, test_cases: List[Dict[str, Any]], metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format test cases for JSONL output"""
+        return test_cases
+    
+    def write(self, output_path: Union[str, Path], formatted_data: List[Dict[str, Any]]) -> None:
+        """Write JSONL to file"""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for test_case in formatted_data:
+                f.write(json.dumps(test_case) + "\n")
+        
+        logger.info(f"JSONL output written to {output_path}")
+
+
 class CSVFormatter(OutputFormatter):
     """Format test cases as CSV"""
     
+    file_extension = "csv"
+    
     def format(self, test_cases: List[Dict[str, Any]], metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Format test cases for CSV output"""
-        return test_cases
+        """Format test cases for CSV output, one row per test case of a template"""
+        return expand_templates(test_cases)
     
     def write(self, output_path: Union[str, Path], formatted_data: List[Dict[str, Any]]) -> None:
         """Write CSV to file"""
@@ -112,29 +161,231 @@ class CSVFormatter(OutputFormatter):
         logger.info(f"CSV output written to {output_path}")
 
 
+class PostmanTimingProfile:
+    """Historical request times taken from Postman run reports"""
+    
+    def __init__(self, default_time: float = 1.0):
+        """
+        Initialize timing profile
+        
+        Args:
+            default_time: Time (ms) assumed for requests with no history and no recorded runs
+        """
+        self.default_time = default_time
+        self._times: Dict[Tuple[str, str], List[float]] = {}
+    
+    @classmethod
+    def from_reports(cls, report_paths: List[Union[str, Path]]) -> "PostmanTimingProfile":
+        """Build a timing profile from Postman run export files"""
+        profile = cls()
+        for report_path in report_paths:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                profile.add_report(json.load(f))
+        return profile
+    
+    def add_report(self, report: Dict[str, Any]) -> None:
+        """Add the request times recorded in one Postman run export"""
+        methods = {
+            request.get("id"): request.get("method", "GET")
+            for request in report.get("collection", {}).get("requests", [])
+        }
+        
+        for result in report.get("results", []):
+            method = result.get("method") or methods.get(result.get("id"), "GET")
+            path = urlsplit(result.get("url", "")).path or "/"
+            times = result.get("times") or [result.get("time", 0)]
+            self._times.setdefault((method.upper(), path), []).extend(float(t) for t in times)
+    
+    def estimate(self, method: str, endpoint: str) -> float:
+        """
+        Estimate the time (ms) of a request
+        
+        The endpoint may be a path template; its placeholders match any concrete
+        path segment recorded in the reports. Exact path matches take priority.
+        """
+        method = method.upper()
+        exact = self._times.get((method, endpoint))
+        if exact:
+            return statistics.mean(exact)
+        
+        pattern = re.compile("^" + re.sub(r"\\\{[^/]*?\\\}", "[^/]+", re.escape(endpoint)) + "$")
+        matched = [
+            t for (m, path), times in self._times.items()
+            if m == method and pattern.match(path)
+            for t in times
+        ]
+        if matched:
+            return statistics.mean(matched)
+        
+        all_times = [t for times in self._times.values() for t in times]
+        return statistics.median(all_times) if all_times else self.default_time
+
+
 class PostmanFormatter(OutputFormatter):
     """Format test cases as Postman Collection"""
     
+    def __init__(
+        self,
+        group_by_folder: bool = True,
+        shards: int = 1,
+        timing_reports: Optional[List[Union[str, Path]]] = None
+    ):
+        """
+        Initialize Postman formatter
+        
+        Args:
+            group_by_folder: Group requests into tag and path folders
+            shards: Number of balanced collection files written next to the full collection
+            timing_reports: Postman run exports used to weight shards by request time
+        """
+        self.group_by_folder = group_by_folder
+        self.shards = max(1, shards)
+        self.timing_profile = PostmanTimingProfile.from_reports(timing_reports or [])
+    
     def format(self, test_cases: List[Dict[str, Any]], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Format test cases as Postman collection"""
-        return {
+        """
+        Format test cases as Postman collection
+        
+        Templates are left out of the collection; each becomes a single-request
+        collection with an iteration data file, listed under "dataDriven" until written.
+        """
+        templates = [tc for tc in test_cases if is_template(tc)]
+        test_cases = [tc for tc in test_cases if not is_template(tc)]
+        items = self._create_postman_items(test_cases)
+        if self.group_by_folder:
+            items = self._group_into_folders(test_cases, items)
+        
+        collection = {
             "info": {
                 "name": metadata.get("projectName", "Generated API Tests"),
                 "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
             },
-            "item": self._create_postman_items(test_cases),
+            "item": items,
             "variable": self._create_postman_variables(metadata)
         }
+        if templates:
+            collection["dataDriven"] = [self._create_data_driven_collection(tc, metadata) for tc in templates]
+        return collection
     
     def write(self, output_path: Union[str, Path], formatted_data: Dict[str, Any]) -> None:
-        """Write Postman collection to file"""
+        """
+        Write Postman collection (and its shards, if configured) to file
+        
+        Each data-driven collection is written next to it with its iteration data file,
+        e.g. generated_tests_postman.data-1-get-v1-hospitais-maisproximo.json and
+        ...maisproximo.iterations.json, to run with `newman run COLLECTION -d ITERATIONS`.
+        """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        formatted_data = dict(formatted_data)
+        data_driven = formatted_data.pop("dataDriven", [])
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(formatted_data, f, indent=2)
         
         logger.info(f"Postman collection written to {output_path}")
+        
+        for index, (collection, iterations) in enumerate(data_driven, start=1):
+            request = collection["item"][0]["request"]
+            slug = re.sub(r"[^a-z0-9]+", "-", f"{request['method']} {'/'.join(request['url']['path'])}".lower()).strip("-")
+            collection_path = output_path.with_name(f"{output_path.stem}.data-{index}-{slug}{output_path.suffix}")
+            with open(collection_path, 'w', encoding='utf-8') as f:
+                json.dump(collection, f, indent=2)
+            with open(collection_path.with_suffix(".iterations.json"), 'w', encoding='utf-8') as f:
+                f.write("[\n" + ",\n".join("  " + json.dumps(row) for row in iterations) + "\n]\n")
+            logger.info(f"Data-driven Postman collection written to {collection_path} ({len(iterations)} iterations)")
+        
+        if self.shards > 1:
+            for index, shard in enumerate(self.shard_collection(formatted_data), start=1):
+                shard_path = output_path.with_name(
+                    f"{output_path.stem}.shard-{index}-of-{self.shards}{output_path.suffix}"
+                )
+                with open(shard_path, 'w', encoding='utf-8') as f:
+                    json.dump(shard, f, indent=2)
+                logger.info(f"Postman shard written to {shard_path}")
+    
+    def shard_collection(self, collection: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split a collection into balanced collections for parallel runners
+        
+        Path folders are kept whole so requests against one resource path run
+        in order on a single runner. Folders are assigned longest-first to the
+        least loaded shard, weighted by historical request time.
+        
+        Returns:
+            One collection per shard
+        """
+        units = []
+        for tag_folder in collection.get("item", []):
+            if "request" in tag_folder:
+                units.append((None, {"name": tag_folder["name"], "item": [tag_folder]}))
+                continue
+            for path_folder in tag_folder.get("item", []):
+                units.append((tag_folder["name"], path_folder))
+        
+        weighted = sorted(
+            ((self._folder_weight(folder), order, tag, folder) for order, (tag, folder) in enumerate(units)),
+            key=lambda unit: (-unit[0], unit[1])
+        )
+        
+        loads = [(0.0, index) for index in range(self.shards)]
+        assigned: List[List[Tuple[int, Optional[str], Dict[str, Any]]]] = [[] for _ in range(self.shards)]
+        totals = [0.0] * self.shards
+        for weight, order, tag, folder in weighted:
+            load, index = heapq.heappop(loads)
+            assigned[index].append((order, tag, folder))
+            totals[index] = load + weight
+            heapq.heappush(loads, (load + weight, index))
+        
+        shards = []
+        for index, units_in_shard in enumerate(assigned):
+            items: List[Dict[str, Any]] = []
+            tag_folders: Dict[str, Dict[str, Any]] = {}
+            for _, tag, folder in sorted(units_in_shard, key=lambda unit: unit[0]):
+                if tag is None:
+                    items.extend(folder["item"])
+                    continue
+                if tag not in tag_folders:
+                    tag_folders[tag] = {"name": tag, "item": []}
+                    items.append(tag_folders[tag])
+                tag_folders[tag]["item"].append(folder)
+            
+            info = dict(collection.get("info", {}))
+            info["name"] = f"{info.get('name', 'Generated API Tests')} (shard {index + 1}/{self.shards})"
+            info["description"] = f"Estimated run time: {totals[index]:.0f} ms"
+            shards.append({**collection, "info": info, "item": items})
+        
+        return shards
+    
+    def _folder_weight(self, folder: Dict[str, Any]) -> float:
+        """Estimate the run time of every request in a folder"""
+        weight = 0.0
+        for item in folder.get("item", []):
+            if "request" not in item:
+                weight += self._folder_weight(item)
+                continue
+            request = item["request"]
+            path = request["url"]["raw"].replace("{{baseUrl}}", "", 1)
+            weight += self.timing_profile.estimate(request.get("method", "GET"), path)
+        return weight
+    
+    @staticmethod
+    def _group_into_folders(test_cases: List[Dict[str, Any]], items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Group request items into tag folders containing one folder per endpoint path"""
+        folders: Dict[str, Dict[str, Any]] = {}
+        
+        for tc, item in zip(test_cases, items):
+            tag = (tc.get('tags') or ["default"])[0]
+            path = tc.get('endpoint', '/')
+            
+            tag_folder = folders.setdefault(tag, {"name": tag, "item": []})
+            path_folder = next((f for f in tag_folder["item"] if f["name"] == path), None)
+            if path_folder is None:
+                path_folder = {"name": path, "item": []}
+                tag_folder["item"].append(path_folder)
+            path_folder["item"].append(item)
+        
+        return list(folders.values())
     
     @staticmethod
     def _create_postman_items(test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -167,6 +418,60 @@ class PostmanFormatter(OutputFormatter):
         
         return items
     
+    def _create_data_driven_collection(
+        self,
+        template: Dict[str, Any],
+        metadata: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Convert a template into a single-request collection and its iteration data
+        
+        Path and query parameters go into the URL. Body fields holding a whole
+        placeholder are written unquoted and their values JSON-encoded in the
+        iteration data, so numbers and booleans keep their types.
+        
+        Returns:
+            (collection, iteration data rows)
+        """
+        item = self._create_postman_items([template])[0]
+        request = item["request"]
+        
+        path = template.get('endpoint', '/')
+        for name, value in (template.get('pathParams') or {}).items():
+            path = path.replace('{' + name + '}', str(value))
+        query = [{"key": k, "value": str(v)} for k, v in (template.get('queryParams') or {}).items()]
+        request["url"] = {
+            "raw": "{{baseUrl}}" + path + ("?" + "&".join(f"{q['key']}={q['value']}" for q in query) if query else ""),
+            "host": ["{{baseUrl}}"],
+            "path": path.strip('/').split('/'),
+            **({"query": query} if query else {})
+        }
+        
+        body = template.get('requestBody')
+        json_columns = set()
+        if isinstance(body, dict):
+            for value in body.values():
+                match = PLACEHOLDER.fullmatch(value) if isinstance(value, str) else None
+                if match:
+                    json_columns.add(match.group(1))
+                    request["body"]["raw"] = request["body"]["raw"].replace(json.dumps(value), value)
+        
+        rows = template_rows(template)
+        item["name"] = f"{template.get('method', 'GET')} {template.get('endpoint', '/')} ({len(rows)} iterations)"
+        iterations = [
+            {name: json.dumps(value) if name in json_columns else value for name, value in row.items()}
+            for row in rows
+        ]
+        collection = {
+            "info": {
+                "name": f"{metadata.get('projectName', 'Generated API Tests')} - {item['name']}",
+                "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+            },
+            "item": [item],
+            "variable": self._create_postman_variables(metadata)
+        }
+        return collection, iterations
+    
     @staticmethod
     def _create_postman_variables(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create Postman variables"""
@@ -190,8 +495,14 @@ class PostmanFormatter(OutputFormatter):
         scripts = []
         
         # Add status code assertion
-        expected_status = test_case.get('expectedStatusCode', 200)
-        scripts.append(f"pm.test('Status code is {expected_status}', function() {{\n    pm.response.to.have.status({expected_status});\n}});")
+        expected_status, label = PostmanFormatter._script_value(test_case.get('expectedStatusCode', 200))
+        scripts.append(f"pm.test('Status code is {label}', function() {{\n    pm.response.to.have.status({expected_status});\n}});")
+        
+        # Add response-time budget assertion
+        max_response_time = test_case.get('maxResponseTimeMs')
+        if max_response_time is not None:
+            max_response_time, label = PostmanFormatter._script_value(max_response_time)
+            scripts.append(f"pm.test('Response time is below {label} ms', function() {{\n    pm.expect(pm.response.responseTime).to.be.below({max_response_time});\n}});")
         
         # Add custom assertions
         for assertion in assertions:
@@ -199,6 +510,20 @@ class PostmanFormatter(OutputFormatter):
         
         return scripts
     
+    @staticmethod
+    def _script_value(value: Any) -> Tuple[str, str]:
+        """
+        Get a script expression for a number, read from the iteration data if it is a placeholder
+        
+        Returns:
+            (expression, text for inside a test name literal)
+        """
+        match = PLACEHOLDER.fullmatch(value) if isinstance(value, str) else None
+        if match:
+            expression = f"Number(pm.iterationData.get({json.dumps(match.group(1))}))"
+            return expression, f"' + {expression} + '"
+        return str(value), str(value)
+    
     @staticmethod
     def _create_headers(headers: Dict[str, str]) -> List[Dict[str, str]]:
         """Convert headers dict to Postman headers array"""
@@ -235,19 +560,75 @@ class FormatterFactory:
     
     _formatters = {
         "json": JSONFormatter,
+        "jsonl": JSONLFormatter,
         "csv": CSVFormatter,
         "postman": PostmanFormatter
     }
     
     @classmethod
-    def create_formatter(cls, format_name: str) -> OutputFormatter:
-        """Create formatter for given format"""
+    def create_formatter(cls, format_name: str, **options) -> OutputFormatter:
+        """Create formatter for given format, passing formatter-specific options"""
         formatter_class = cls._formatters.get(format_name.lower())
         if not formatter_class:
             raise ValueError(f"Unknown format: {format_name}")
-        return formatter_class()
+        return formatter_class(**options)
     
     @classmethod
     def register_formatter(cls, format_name: str, formatter_class: type) -> None:
         """Register a custom formatter"""
         cls._formatters[format_name.lower()] = formatter_class
+    
+    @classmethod
+    def available_formats(cls) -> List[str]:
+        """List the names of all registered formats"""
+        return list(cls._formatters)
+
+
+def export_formats(
+    test_cases: List[Dict[str, Any]],
+    metadata: Dict[str, Any],
+    formats: List[str],
+    output_dir: Union[str, Path],
+    file_stem: str = "generated_tests",
+    max_workers: Optional[int] = None,
+    formatter_options: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Path]:
+    """
+    Export one set of test cases through several formatters concurrently
+    
+    Args:
+        test_cases: Test cases produced by a single generation pass
+        metadata: Metadata shared by every formatter
+        formats: Registered format names (duplicates are ignored)
+        output_dir: Directory the files are written to
+        file_stem: Prefix of every output file name
+        max_workers: Maximum number of concurrent writers (default: one per format)
+        formatter_options: Per-format keyword arguments for the formatter constructors
+    
+    Returns:
+        Mapping of format name to written file path
+    """
+    output_dir = Path(output_dir)
+    formats = list(dict.fromkeys(f.lower() for f in formats))
+    formatter_options = formatter_options or {}
+    formatters = {
+        name: FormatterFactory.create_formatter(name, **formatter_options.get(name, {}))
+        for name in formats
+    }
+    
+    def _export(name: str) -> Path:
+        formatter = formatters[name]
+        output_path = output_dir / f"{file_stem}_{name}.{formatter.file_extension}"
+        with span("format", "formatter", format=name, test_cases=len(test_cases)):
+            formatted_data = formatter.format(test_cases, metadata)
+        with span("write", "formatter", format=name, file=output_path.name):
+            formatter.write(output_path, formatted_data)
+        return output_path
+    
+    if not formatters:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers or len(formatters)) as pool:
+        paths = dict(zip(formatters, pool.map(_export, formatters)))
+    
+    return paths
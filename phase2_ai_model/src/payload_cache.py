@@ -0,0 +1,160 @@
+"""
+Payload Cache - Valid request bodies shared by every endpoint using a schema
+
+Write endpoints often share a body schema, e.g. POST /v1/hospitais/ and PUT
+/v1/hospitais/{id} both take HospitalInput. The cache holds one valid example
+payload per resolved schema, keyed by a hash of the schema's content, so the
+LLM writes a complete valid body once per schema instead of once per test
+case. Prompts then show the cached body and ask only for the fields each case
+changes or leaves out, and the full bodies are assembled from it.
+
+A schema's payload comes from the first source that yields a valid one: the
+schema's example in the spec, a VALID case the LLM wrote for the first
+endpoint using the schema, or the rule-based SchemaSampler.
+"""
+import copy
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Union
+from pathlib import Path
+
+from schema_sampler import SchemaSampler
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadCache:
+    """Valid example payloads keyed by resolved schema hash"""
+    
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize payload cache
+        
+        Args:
+            path: JSON file the payloads are loaded from and saved to, so later runs
+                reuse them (None = this run only)
+        """
+        self.path = Path(path) if path is not None else None
+        self.sampler = SchemaSampler()
+        self.hits = 0
+        self.misses = 0
+        self._payloads: Dict[str, Dict[str, Any]] = {}  # schema hash -> {"payload": ..., "source": ...}
+        self._keys: Dict[int, Tuple[Dict[str, Any], str]] = {}  # id(schema) -> (schema, hash)
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self._payloads = json.loads(self.path.read_text(encoding="utf-8"))
+    
+    def __len__(self) -> int:
+        return len(self._payloads)
+    
+    def schema_key(self, schema: Dict[str, Any]) -> str:
+        """
+        Hash a resolved schema's content
+        
+        Resolved schemas are shared between endpoints, so each object is hashed once.
+        """
+        entry = self._keys.get(id(schema))
+        if entry is None or entry[0] is not schema:
+            content = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+            entry = (schema, hashlib.sha256(content.encode("utf-8")).hexdigest()[:16])
+            self._keys[id(schema)] = entry
+        return entry[1]
+    
+    def get(self, schema: Optional[Dict[str, Any]]) -> Optional[Any]:
+        """
+        Get a copy of the cached payload of a schema
+        
+        On a miss, the schema's own example is cached and returned when it is valid.
+        
+        Returns:
+            A valid payload, or None when the schema has none cached yet
+        """
+        if not schema:
+            return None
+        key = self.schema_key(schema)
+        with self._lock:
+            entry = self._payloads.get(key)
+            if entry is not None:
+                self.hits += 1
+                return copy.deepcopy(entry["payload"])
+            self.misses += 1
+        
+        if "example" in schema and self.put(schema, schema["example"], "example"):
+            return copy.deepcopy(schema["example"])
+        return None
+    
+    def put(self, schema: Dict[str, Any], payload: Any, source: str) -> bool:
+        """
+        Cache a payload for a schema unless it is invalid or one is cached already
+        
+        Args:
+            schema: Resolved schema
+            payload: Candidate payload
+            source: Where the payload came from ("example", "llm" or "sampler")
+        
+        Returns:
+            True if the payload was cached
+        """
+        if payload is None or self.sampler.validate(payload, schema):
+            return False
+        key = self.schema_key(schema)
+        with self._lock:
+            if key in self._payloads:
+                return False
+            self._payloads[key] = {"payload": copy.deepcopy(payload), "source": source}
+        logger.debug(f"Cached {source} payload for schema {key}")
+        return True
+    
+    def learn(self, schema: Optional[Dict[str, Any]], test_cases: List[Dict[str, Any]]) -> None:
+        """
+        Fill a schema's entry from generated test cases, or from the sampler if none is valid
+        
+        Args:
+            schema: Resolved request body schema of the endpoint the cases were generated for
+            test_cases: Generated test cases; the body of the first VALID case that
+                validates against the schema is cached
+        """
+        if not schema or self.schema_key(schema) in self._payloads:
+            return
+        for test_case in test_cases:
+            if test_case.get("category") == "VALID" and self.put(schema, test_case.get("requestBody"), "llm"):
+                return
+        self.put(schema, self.sampler.sample(schema), "sampler")
+    
+    def save(self) -> None:
+        """Write the payloads to the cache file"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            content = json.dumps(self._payloads, indent=2, sort_keys=True)
+        self.path.write_text(content, encoding="utf-8")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        return {"entries": len(self._payloads), "hits": self.hits, "misses": self.misses}
+
+
+def assemble_request_body(payload: Any, test_case: Dict[str, Any]) -> None:
+    """
+    Give a test case the full request body built from a cached payload
+    
+    The case's requestBodyOverrides are set on a copy of the payload and the fields
+    in requestBodyOmit are removed. Cases that already carry a requestBody keep it.
+    """
+    overrides = test_case.pop("requestBodyOverrides", None)
+    omit = test_case.pop("requestBodyOmit", None)
+    if "requestBody" in test_case:
+        return
+    
+    body = copy.deepcopy(payload)
+    if isinstance(body, dict):
+        if isinstance(overrides, dict):
+            body.update(overrides)
+        for name in omit or []:
+            body.pop(name, None)
+    elif overrides is not None:
+        body = overrides
+    test_case["requestBody"] = body
@@ -0,0 +1,274 @@
+"""
+Results Store - Indexed SQLite store of test execution results
+"""
+import json
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, List, Any, Optional, Union
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from endpoint_index import PathRouter
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT NOT NULL UNIQUE,
+    name TEXT,
+    source TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    imported_at TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    passed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test_id TEXT NOT NULL,
+    name TEXT,
+    method TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    url TEXT,
+    status_code INTEGER,
+    expected_status_code INTEGER,
+    passed INTEGER NOT NULL,
+    elapsed_ms REAL NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assertions (
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    passed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_results_endpoint ON results(endpoint, method, run_id, elapsed_ms, passed);
+CREATE INDEX IF NOT EXISTS idx_results_test_id ON results(test_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_timestamp ON results(timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_elapsed ON results(elapsed_ms);
+CREATE INDEX IF NOT EXISTS idx_assertions_result ON assertions(result_id);
+"""
+
+
+class ResultsStore:
+    """Stores execution results from Postman runs and the built-in executor"""
+    
+    def __init__(self, db_path: Union[str, Path], endpoint_templates: Optional[List[str]] = None):
+        """
+        Initialize results store
+        
+        Args:
+            db_path: SQLite database file (created if missing)
+            endpoint_templates: OAS path templates used to map concrete URLs back to endpoints;
+                unmatched URLs are stored by their concrete path
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+        
+        # Literal segments win over placeholders, so /maisProximo is not taken for /{id}
+        self._router = PathRouter()
+        for template in endpoint_templates or []:
+            self._router.add(template, template)
+        self._unmapped: set = set()
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        self.connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def resolve_endpoint(self, url: str) -> str:
+        """Map a concrete URL (or path) to its endpoint template, keeping the path if none matches"""
+        path = urlsplit(url).path or "/"
+        route = self._router.match(path)
+        if route is None:
+            self._unmapped.add(path)
+            return path
+        return route.template
+    
+    def import_postman_run(self, report_path: Union[str, Path]) -> Optional[int]:
+        """
+        Import a Postman run export
+        
+        Returns:
+            Run id, or None if this run was imported before
+        """
+        with open(report_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        
+        methods = {
+            request.get("id"): request.get("method", "GET")
+            for request in report.get("collection", {}).get("requests", [])
+        }
+        started_at = report.get("startedAt") or report.get("timestamp") or datetime.now().isoformat()
+        
+        rows = []
+        for result in report.get("results", []):
+            tests = result.get("tests") or {}
+            name = result.get("name", "")
+            test_id = name.split(" - ", 1)[0] if " - " in name else result.get("id", name)
+            rows.append({
+                "test_id": test_id,
+                "name": name,
+                "method": (result.get("method") or methods.get(result.get("id"), "GET")).upper(),
+                "endpoint": self.resolve_endpoint(result.get("url", "")),
+                "url": result.get("url", ""),
+                "status_code": (result.get("responseCode") or {}).get("code"),
+                "expected_status_code": None,
+                "passed": all(tests.values()),
+                "elapsed_ms": float(result.get("time", 0)),
+                "timestamp": started_at,
+                "assertions": tests
+            })
+        
+        return self._insert_run(
+            run_key=f"postman:{report.get('id') or self._file_hash(report_path)}",
+            name=report.get("name", Path(report_path).stem),
+            source="postman",
+            started_at=started_at,
+            rows=rows
+        )
+    
+    def import_execution_results(self, results_path: Union[str, Path], name: Optional[str] = None) -> Optional[int]:
+        """
+        Import the JSONL results written by the built-in executor
+        
+        Returns:
+            Run id, or None if these results were imported before
+        """
+        rows = []
+        with open(results_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                rows.append({
+                    "test_id": result.get("test_id", ""),
+                    "name": result.get("test_id", ""),
+                    "method": result.get("method", "GET").upper(),
+                    "endpoint": result.get("endpoint") or self.resolve_endpoint(result.get("url", "")),
+                    "url": result.get("url", ""),
+                    "status_code": result.get("status_code"),
+                    "expected_status_code": result.get("expected_status_code"),
+                    "passed": bool(result.get("passed")),
+                    "elapsed_ms": float(result.get("elapsed_ms", 0)),
+                    "timestamp": result.get("started_at") or datetime.now().isoformat(),
+                    "assertions": {failure: False for failure in result.get("failures", [])}
+                })
+        
+        started_at = min((row["timestamp"] for row in rows), default=datetime.now().isoformat())
+        return self._insert_run(
+            run_key=f"executor:{self._file_hash(results_path)}",
+            name=name or Path(results_path).stem,
+            source="executor",
+            started_at=started_at,
+            rows=rows
+        )
+    
+    def _insert_run(self, run_key: str, name: str, source: str, started_at: str, rows: List[Dict[str, Any]]) -> Optional[int]:
+        """Insert a run and its results in one transaction"""
+        unmapped, self._unmapped = self._unmapped, set()
+        if self.connection.execute("SELECT 1 FROM runs WHERE run_key = ?", (run_key,)).fetchone():
+            logger.info(f"Run {run_key} already imported")
+            return None
+        
+        passed = len([row for row in rows if row["passed"]])
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (run_key, name, source, started_at, imported_at, total, passed, failed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_key, name, source, started_at, datetime.now().isoformat(), len(rows), passed, len(rows) - passed)
+            )
+            run_id = cursor.lastrowid
+            
+            for row in rows:
+                cursor = self.connection.execute(
+                    "INSERT INTO results (run_id, test_id, name, method, endpoint, url, status_code, "
+                    "expected_status_code, passed, elapsed_ms, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, row["test_id"], row["name"], row["method"], row["endpoint"], row["url"],
+                     row["status_code"], row["expected_status_code"], int(row["passed"]),
+                     row["elapsed_ms"], row["timestamp"])
+                )
+                if row["assertions"]:
+                    self.connection.executemany(
+                        "INSERT INTO assertions (result_id, name, passed) VALUES (?, ?, ?)",
+                        [(cursor.lastrowid, assertion, int(ok)) for assertion, ok in row["assertions"].items()]
+                    )
+        
+        logger.info(f"Imported {len(rows)} results from {source} run {name}")
+        if unmapped:
+            # Per-endpoint queries and latency baselines only match rows stored under templates
+            logger.warning(f"{len(unmapped)} URL paths of run {name} match no endpoint template and are "
+                           f"stored as concrete paths, e.g. {sorted(unmapped)[0]}")
+        return run_id
+    
+    @staticmethod
+    def _file_hash(path: Union[str, Path]) -> str:
+        """Get the content hash of a file"""
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+    
+    def latency_trend(self, endpoint: str, method: Optional[str] = None, last_runs: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the average and maximum latency of an endpoint per run, oldest first"""
+        query = (
+            "SELECT r.id AS run_id, r.name, r.started_at, COUNT(*) AS requests, "
+            "AVG(x.elapsed_ms) AS avg_ms, MAX(x.elapsed_ms) AS max_ms "
+            "FROM results x JOIN runs r ON r.id = x.run_id "
+            "WHERE x.endpoint = ?" + (" AND x.method = ?" if method else "") +
+            " GROUP BY x.run_id ORDER BY r.started_at DESC" + (" LIMIT ?" if last_runs else "")
+        )
+        params = [endpoint] + ([method.upper()] if method else []) + ([last_runs] if last_runs else [])
+        return [dict(row) for row in reversed(self.connection.execute(query, params).fetchall())]
+    
+    def failure_rates(self, last_runs: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the failure rate of every endpoint across runs, highest first"""
+        query = (
+            "SELECT x.method, x.endpoint, COUNT(*) AS total, SUM(1 - x.passed) AS failed, "
+            "ROUND(AVG(1.0 - x.passed), 4) AS failure_rate, COUNT(DISTINCT x.run_id) AS runs "
+            "FROM results x" + (" WHERE x.run_id IN (SELECT id FROM runs ORDER BY started_at DESC LIMIT ?)" if last_runs else "") +
+            " GROUP BY x.endpoint, x.method ORDER BY failure_rate DESC, total DESC"
+        )
+        return [dict(row) for row in self.connection.execute(query, [last_runs] if last_runs else []).fetchall()]
+    
+    def slowest_tests(self, limit: int = 10, last_runs: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the tests with the highest average latency"""
+        query = (
+            "SELECT x.test_id, MAX(x.name) AS name, x.method, x.endpoint, COUNT(*) AS executions, "
+            "AVG(x.elapsed_ms) AS avg_ms, MAX(x.elapsed_ms) AS max_ms FROM results x" +
+            (" WHERE x.run_id IN (SELECT id FROM runs ORDER BY started_at DESC LIMIT ?)" if last_runs else "") +
+            " GROUP BY x.test_id, x.method, x.endpoint ORDER BY avg_ms DESC LIMIT ?"
+        )
+        params = ([last_runs] if last_runs else []) + [limit]
+        return [dict(row) for row in self.connection.execute(query, params).fetchall()]
+    
+    def endpoint_latencies(self, last_runs: Optional[int] = None, passed_only: bool = True) -> Dict[tuple, List[float]]:
+        """Get every recorded latency grouped by (method, endpoint)"""
+        query = (
+            "SELECT x.method, x.endpoint, x.elapsed_ms FROM results x WHERE 1 = 1" +
+            (" AND x.passed = 1" if passed_only else "") +
+            (" AND x.run_id IN (SELECT id FROM runs ORDER BY started_at DESC LIMIT ?)" if last_runs else "")
+        )
+        latencies: Dict[tuple, List[float]] = {}
+        for method, endpoint, elapsed_ms in self.connection.execute(query, [last_runs] if last_runs else []):
+            latencies.setdefault((method, endpoint), []).append(elapsed_ms)
+        return latencies
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get summary of stored runs"""
+        runs, results = self.connection.execute(
+            "SELECT (SELECT COUNT(*) FROM runs), (SELECT COUNT(*) FROM results)"
+        ).fetchone()
+        return {"runs": runs, "results": results, "database": str(self.db_path)}
@@ -0,0 +1,104 @@
+"""
+Schema Resolver - Replaces local $ref pointers with the schemas they name
+
+Each referenced definition is resolved once and the result is shared by every
+schema that references it, so hundreds of operations reusing a few definitions
+cost a few resolved objects instead of a deep copy per use. Subtrees without
+references are returned as they are. A reference back to a definition that is
+still being resolved (a cycle) is left as its {"$ref": ...} node; calling
+resolve() on that node later resolves it on demand.
+"""
+import logging
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFINITION_PREFIXES = ("#/definitions/", "#/components/schemas/")
+
+
+class SchemaResolver:
+    """Resolves $ref pointers of one OAS document (Swagger 2.0 or OpenAPI 3)"""
+    
+    def __init__(self, document: Optional[Dict[str, Any]] = None, definitions: Optional[Dict[str, Any]] = None):
+        """
+        Initialize schema resolver
+        
+        Args:
+            document: OAS document; any local JSON pointer into it can be resolved
+            definitions: Named schemas, when there is no document (e.g. the planner's
+                definitions); "#/definitions/X" and "#/components/schemas/X" resolve by name
+        """
+        self.document = document or {}
+        self.definitions = definitions if definitions is not None else definitions_of(self.document)
+        self._resolved: Dict[str, Any] = {}
+    
+    def resolve(self, schema: Any) -> Any:
+        """
+        Resolve every $ref below a schema
+        
+        Returns:
+            The schema with references replaced by their shared resolved definitions,
+            or the schema itself when it contains no references
+        """
+        return self._resolve(schema, ())
+    
+    def lookup(self, ref: str) -> Optional[Any]:
+        """Get the raw (unresolved) target of a local $ref, or None if it does not exist"""
+        if not ref.startswith('#/'):
+            return None
+        for prefix in DEFINITION_PREFIXES:
+            if ref.startswith(prefix) and ref[len(prefix):] in self.definitions:
+                return self.definitions[ref[len(prefix):]]
+        
+        target: Any = self.document
+        for part in ref[2:].split('/'):
+            if not isinstance(target, Mapping):
+                return None
+            target = target.get(part.replace('~1', '/').replace('~0', '~'))
+        return target
+    
+    def used_definitions(self) -> Dict[str, Any]:
+        """
+        Get the raw named schemas that the references resolved so far lead to
+        
+        A resolver over just these resolves the cycles left in the schemas it already
+        returned, without the rest of the document.
+        """
+        names = (ref[len(prefix):] for ref in self._resolved for prefix in DEFINITION_PREFIXES if ref.startswith(prefix))
+        return {name: self.definitions[name] for name in names if name in self.definitions}
+    
+    def _resolve(self, node: Any, resolving: Tuple[str, ...]) -> Any:
+        """Resolve one node; resolving holds the references on the current path"""
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if isinstance(ref, str):
+                if ref in self._resolved:
+                    return self._resolved[ref]
+                if ref in resolving:
+                    return node  # cycle, resolved when this node is resolved on its own
+                target = self.lookup(ref)
+                if target is None:
+                    logger.warning(f"Unresolvable $ref: {ref}")
+                    return node
+                resolved = self._resolve(target, resolving + (ref,))
+                self._resolved[ref] = resolved
+                return resolved
+            
+            items = {key: self._resolve(value, resolving) for key, value in node.items()}
+            if all(items[key] is value for key, value in node.items()):
+                return node
+            return items
+        
+        if isinstance(node, list):
+            values = [self._resolve(value, resolving) for value in node]
+            if all(new is old for new, old in zip(values, node)):
+                return node
+            return values
+        
+        return node
+
+
+def definitions_of(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the named schemas of a Swagger 2.0 (definitions) or OpenAPI 3 (components/schemas) document"""
+    return document.get('definitions') or (document.get('components') or {}).get('schemas') or {}
@@ -0,0 +1,137 @@
+"""
+Schema Sampler - Builds values from JSON schemas and validates values against them
+
+Sampling is rule-based: examples and defaults first, then the first enum value,
+then a minimal value of the declared type honouring formats, lengths and
+minimums. The mock server answers with these samples and validates requests
+with the same rules; the payload cache falls back to them for request bodies.
+"""
+import re
+from typing import Dict, List, Any, Optional
+
+from schema_resolver import SchemaResolver
+
+JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool
+}
+
+
+class SchemaSampler:
+    """Builds sample values from JSON schemas and validates values against them"""
+    
+    def __init__(self, document: Optional[Dict[str, Any]] = None, max_depth: int = 5):
+        """
+        Initialize schema sampler
+        
+        Args:
+            document: OAS document used to resolve local $ref pointers
+            max_depth: Nesting depth after which objects are sampled empty (stops recursive schemas)
+        """
+        self.document = document or {}
+        self.max_depth = max_depth
+        self.resolver = SchemaResolver(self.document)
+    
+    def resolve(self, schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Follow local $ref pointers (e.g. #/definitions/Hospital) to their schema"""
+        return self.resolver.resolve(schema) or {}
+    
+    def sample(self, schema: Optional[Dict[str, Any]], depth: int = 0) -> Any:
+        """Build a value that satisfies a schema"""
+        schema = self.resolve(schema)
+        for key in ('example', 'default'):
+            if key in schema:
+                return schema[key]
+        if schema.get('enum'):
+            return schema['enum'][0]
+        if schema.get('allOf'):
+            merged: Dict[str, Any] = {}
+            for part in schema['allOf']:
+                value = self.sample(part, depth)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+        for key in ('oneOf', 'anyOf'):
+            if schema.get(key):
+                return self.sample(schema[key][0], depth)
+        
+        schema_type = schema.get('type') or ('object' if 'properties' in schema else 'string')
+        if schema_type == 'object':
+            if depth >= self.max_depth:
+                return {}
+            return {
+                name: self.sample(property_schema, depth + 1)
+                for name, property_schema in (schema.get('properties') or {}).items()
+            }
+        if schema_type == 'array':
+            return [] if depth >= self.max_depth else [self.sample(schema.get('items'), depth + 1)]
+        if schema_type == 'integer':
+            return int(schema.get('minimum', 1))
+        if schema_type == 'number':
+            return float(schema.get('minimum', 1.0))
+        if schema_type == 'boolean':
+            return True
+        return self._sample_string(schema)
+    
+    @staticmethod
+    def _sample_string(schema: Dict[str, Any]) -> str:
+        """Build a string honouring format and length constraints"""
+        value = {
+            "date": "2024-01-01",
+            "date-time": "2024-01-01T00:00:00Z",
+            "uuid": "00000000-0000-4000-8000-000000000000",
+            "email": "user@example.com",
+            "uri": "http://example.com"
+        }.get(schema.get('format'), "string")
+        value = value.ljust(schema.get('minLength') or 0, 'x')
+        if schema.get('maxLength') is not None:
+            value = value[:schema['maxLength']]
+        return value
+    
+    def validate(self, value: Any, schema: Optional[Dict[str, Any]], location: str = "body") -> List[str]:
+        """
+        Validate a value against a schema
+        
+        Returns:
+            Validation errors (empty if the value is valid)
+        """
+        schema = self.resolve(schema)
+        errors = []
+        for part in schema.get('allOf') or []:
+            errors.extend(self.validate(value, part, location))
+        
+        schema_type = schema.get('type') or ('object' if 'properties' in schema else None)
+        expected = JSON_TYPES.get(schema_type)
+        if expected and (not isinstance(value, expected) or (isinstance(value, bool) and schema_type != 'boolean')):
+            return errors + [f"{location} must be of type {schema_type}"]
+        
+        if schema.get('enum') and value not in schema['enum']:
+            errors.append(f"{location} must be one of {schema['enum']}")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if schema.get('minimum') is not None and value < schema['minimum']:
+                errors.append(f"{location} must be >= {schema['minimum']}")
+            if schema.get('maximum') is not None and value > schema['maximum']:
+                errors.append(f"{location} must be <= {schema['maximum']}")
+        if isinstance(value, str):
+            if schema.get('minLength') is not None and len(value) < schema['minLength']:
+                errors.append(f"{location} must have at least {schema['minLength']} characters")
+            if schema.get('maxLength') is not None and len(value) > schema['maxLength']:
+                errors.append(f"{location} must have at most {schema['maxLength']} characters")
+            if schema.get('pattern') and not re.search(schema['pattern'], value):
+                errors.append(f"{location} must match {schema['pattern']}")
+        if isinstance(value, dict):
+            for name in schema.get('required') or []:
+                if value.get(name) is None:
+                    errors.append(f"{location}.{name} is required")
+            for name, property_schema in (schema.get('properties') or {}).items():
+                if value.get(name) is not None:
+                    errors.extend(self.validate(value[name], property_schema, f"{location}.{name}"))
+        if isinstance(value, list) and schema.get('items'):
+            for index, item in enumerate(value):
+                errors.extend(self.validate(item, schema['items'], f"{location}[{index}]"))
+        
+        return errors
@@ -0,0 +1,85 @@
+"""
+Startup Profiler - Reports the import time of each module a command loads
+
+Runs a command in a fresh interpreter with "python -X importtime" and turns
+the per-import timings it writes to stderr into a table, so a slow startup
+can be traced back to the dependency that caused it.
+"""
+import sys
+import time
+import subprocess
+from typing import Dict, List, Any, Union
+from pathlib import Path
+from dataclasses import dataclass
+
+IMPORT_TIME_PREFIX = "import time:"
+
+
+@dataclass
+class ImportTiming:
+    """Import time of one module"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 = imported by the command itself, higher = nested import
+
+
+def parse_import_times(stderr: str) -> List[ImportTiming]:
+    """
+    Parse "-X importtime" output
+    
+    Args:
+        stderr: Standard error of a run with -X importtime
+    
+    Returns:
+        One timing per imported module, in import order
+    """
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        self_us, cumulative_us, name = line[len(IMPORT_TIME_PREFIX):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header line
+        stripped = name.lstrip()
+        timings.append(ImportTiming(
+            module=stripped,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(name) - len(stripped) - 1) // 2
+        ))
+    return timings
+
+
+def profile_startup(script: Union[str, Path], argv: List[str]) -> Dict[str, Any]:
+    """
+    Run a script once with import timing enabled
+    
+    Args:
+        script: Python script to run
+        argv: Arguments passed to the script
+    
+    Returns:
+        Dictionary with wall time, total import time, all timings, the top-level
+        imports (slowest first), the script's exit code and its own stderr lines
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", str(script), *argv],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    
+    timings = parse_import_times(process.stderr)
+    top_level = sorted((t for t in timings if t.depth == 0), key=lambda t: t.cumulative_us, reverse=True)
+    return {
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(sum(t.cumulative_us for t in top_level) / 1000, 1),
+        "modules": len(timings),
+        "timings": timings,
+        "top_level": top_level,
+        "returncode": process.returncode,
+        "stderr": [line for line in process.stderr.splitlines() if not line.startswith(IMPORT_TIME_PREFIX)]
+    }
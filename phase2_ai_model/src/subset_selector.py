@@ -0,0 +1,205 @@
+"""
+Subset Selector - Picks a small test subset that keeps the coverage of the full suite
+
+Each test case covers a set of requirements: its operation, its expected
+status code, the required body fields it leaves out and the enum values it
+sends. The selector builds this coverage matrix once and runs a greedy set
+cover over it, giving a smoke tier that exercises everything the full suite
+exercises with a fraction of the requests.
+"""
+import heapq
+import logging
+from typing import Dict, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+from oas_parser import Endpoint, parse_status_code
+from schema_resolver import SchemaResolver
+from endpoint_index import path_shape
+
+logger = logging.getLogger(__name__)
+
+CRITERIA = ("operation", "status", "missing_field", "enum_value")
+
+Requirement = Tuple[Any, ...]
+
+
+@dataclass
+class CoverageSubset:
+    """Selected test cases and the requirements they cover"""
+    test_cases: List[Dict[str, Any]] = field(default_factory=list)
+    total_cases: int = 0
+    covered: Set[Requirement] = field(default_factory=set)
+    uncovered: Set[Requirement] = field(default_factory=set)  # declared in the spec but covered by no test case
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get summary of the subset"""
+        per_criterion = {}
+        for criterion in CRITERIA:
+            count = len([r for r in self.covered if r[0] == criterion])
+            if count:
+                per_criterion[criterion] = count
+        return {
+            "selected_test_cases": len(self.test_cases),
+            "total_test_cases": self.total_cases,
+            "covered_requirements": len(self.covered),
+            "covered_by_criterion": per_criterion,
+            "uncovered_requirements": sorted(" ".join(str(part) for part in r) for r in self.uncovered)
+        }
+
+
+class SubsetSelector:
+    """Selects a minimal set of test cases covering the chosen criteria"""
+    
+    def __init__(
+        self,
+        endpoints: Optional[List[Endpoint]] = None,
+        definitions: Optional[Dict[str, Any]] = None,
+        criteria: Optional[List[str]] = None
+    ):
+        """
+        Initialize subset selector
+        
+        Args:
+            endpoints: Parsed endpoints, the source of required fields, enum values and
+                declared status codes; without them required fields are inferred from
+                the fields every VALID body of an operation sends
+            definitions: Schema definitions used to follow $ref in body schemas
+            criteria: Criteria to cover (default: all of CRITERIA)
+        """
+        self.endpoints = {(e.method, path_shape(e.path)): e for e in endpoints or []}
+        self.definitions = definitions or {}
+        self.resolver = SchemaResolver(definitions=self.definitions)
+        self.criteria = list(criteria or CRITERIA)
+        unknown = set(self.criteria) - set(CRITERIA)
+        if unknown:
+            raise ValueError(f"Unknown coverage criteria: {', '.join(sorted(unknown))}")
+    
+    def select(self, test_cases: List[Dict[str, Any]]) -> CoverageSubset:
+        """
+        Select the subset
+        
+        Greedy set cover: repeatedly take the case covering the most requirements
+        still uncovered. Gains only shrink as cases are taken, so stale heap
+        entries are re-scored lazily instead of rescanning every case per pick.
+        Ties go to the earlier case.
+        """
+        matrix = self.coverage_matrix(test_cases)
+        remaining = set().union(*matrix) if matrix else set()
+        subset = CoverageSubset(total_cases=len(test_cases), covered=set(remaining))
+        subset.uncovered = self.declared_requirements() - remaining
+        
+        heap = [(-len(cover), index) for index, cover in enumerate(matrix) if cover]
+        heapq.heapify(heap)
+        selected = []
+        while remaining and heap:
+            stale_gain, index = heapq.heappop(heap)
+            gain = len(matrix[index] & remaining)
+            if gain == 0:
+                continue
+            if gain < -stale_gain:
+                heapq.heappush(heap, (-gain, index))
+                continue
+            selected.append(index)
+            remaining -= matrix[index]
+        
+        subset.test_cases = [test_cases[index] for index in sorted(selected)]
+        logger.info(f"Selected {len(subset.test_cases)} of {len(test_cases)} test cases covering {len(subset.covered)} requirements")
+        return subset
+    
+    def coverage_matrix(self, test_cases: List[Dict[str, Any]]) -> List[Set[Requirement]]:
+        """Get the set of requirements covered by each test case"""
+        inferred_required = {} if self.endpoints else self._infer_required_fields(test_cases)
+        enum_fields = {operation: self._enum_fields(endpoint) for operation, endpoint in self.endpoints.items()}
+        matrix = []
+        for test_case in test_cases:
+            operation = (test_case.get('method', 'GET').upper(), path_shape(test_case.get('endpoint', '/')))
+            endpoint = self.endpoints.get(operation)
+            body = test_case.get('requestBody')
+            cover: Set[Requirement] = set()
+            
+            if "operation" in self.criteria:
+                cover.add(("operation",) + operation)
+            status = parse_status_code(test_case.get('expectedStatusCode'))
+            if "status" in self.criteria and status is not None:
+                cover.add(("status",) + operation + (status,))
+            if "missing_field" in self.criteria and isinstance(body, dict):
+                required = self._required_fields(endpoint) if endpoint else inferred_required.get(operation, [])
+                cover.update(("missing_field",) + operation + (name,) for name in required if body.get(name) is None)
+            if "enum_value" in self.criteria and endpoint:
+                cover.update(("enum_value",) + operation + pair for pair in self._enum_values(enum_fields[operation], test_case))
+            
+            matrix.append(cover)
+        return matrix
+    
+    def declared_requirements(self) -> Set[Requirement]:
+        """Get the requirements the specification declares for the chosen criteria"""
+        requirements = set()
+        for operation, endpoint in self.endpoints.items():
+            if "operation" in self.criteria:
+                requirements.add(("operation",) + operation)
+            if "status" in self.criteria:
+                requirements.update(("status",) + operation + (r.status_code,) for r in endpoint.responses or [])
+            if "missing_field" in self.criteria:
+                requirements.update(("missing_field",) + operation + (name,) for name in self._required_fields(endpoint))
+            if "enum_value" in self.criteria:
+                for name, values in self._enum_fields(endpoint).items():
+                    requirements.update(("enum_value",) + operation + (name, value) for value in values)
+        return requirements
+    
+    def _required_fields(self, endpoint: Endpoint) -> List[str]:
+        """Get the required top-level fields of an endpoint's request body"""
+        if endpoint.request_required_fields:
+            return list(endpoint.request_required_fields)
+        return list(self.resolver.resolve(endpoint.request_body_schema or {}).get('required', []))
+    
+    def _enum_fields(self, endpoint: Endpoint) -> Dict[str, List[Any]]:
+        """Map every enum-typed parameter and body field (dotted path) to its values"""
+        fields = {
+            f"{param.in_}.{param.name}": list(param.enum_values)
+            for param in endpoint.parameters or []
+            if param.enum_values and param.in_ in ('query', 'path', 'header')
+        }
+        
+        def _walk(schema: Dict[str, Any], prefix: str, depth: int) -> None:
+            schema = self.resolver.resolve(schema)
+            if schema.get('enum'):
+                fields[prefix] = list(schema['enum'])
+            if depth < 5:
+                for name, property_schema in (schema.get('properties') or {}).items():
+                    _walk(property_schema, f"{prefix}.{name}", depth + 1)
+        
+        if endpoint.request_body_schema:
+            _walk(endpoint.request_body_schema, "body", 0)
+        return fields
+    
+    @staticmethod
+    def _enum_values(enum_fields: Dict[str, List[Any]], test_case: Dict[str, Any]) -> Set[Tuple[str, Any]]:
+        """Get the (field, value) enum pairs a test case sends"""
+        sources = {
+            "body": test_case.get('requestBody'),
+            "query": test_case.get('queryParams') or {},
+            "path": test_case.get('pathParams') or {},
+            "header": test_case.get('requestHeaders') or {}
+        }
+        pairs = set()
+        for name, values in enum_fields.items():
+            location, *parts = name.split('.')
+            value = sources[location]
+            for part in parts:
+                value = value.get(part) if isinstance(value, dict) else None
+            if value in values:
+                pairs.add((name, value))
+        return pairs
+    
+    @staticmethod
+    def _infer_required_fields(test_cases: List[Dict[str, Any]]) -> Dict[Tuple[str, str], List[str]]:
+        """Infer required body fields as those present in every VALID body of an operation"""
+        bodies: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for test_case in test_cases:
+            if test_case.get('category') == 'VALID' and isinstance(test_case.get('requestBody'), dict):
+                operation = (test_case.get('method', 'GET').upper(), path_shape(test_case.get('endpoint', '/')))
+                bodies.setdefault(operation, []).append(test_case['requestBody'])
+        return {
+            operation: [name for name in cases[0] if all(body.get(name) is not None for body in cases)]
+            for operation, cases in bodies.items()
+        }
@@ -0,0 +1,141 @@
+"""
+Synthetic Spec - Builds Swagger 2.0 and OpenAPI 3 documents of any size
+
+Used by the benchmarks to exercise the pipeline at scales the real Hospital
+API spec never reaches. Operations come in CRUD groups of five per resource;
+every resource body references a chain of nested definitions ($ref depth) and
+carries a large enum, both in the body and as a query parameter.
+"""
+from typing import Dict, List, Any
+
+CRUD_OPERATIONS = [
+    ("collection", "get"),
+    ("collection", "post"),
+    ("item", "get"),
+    ("item", "put"),
+    ("item", "delete")
+]
+
+
+def build_synthetic_spec(
+    operations: int,
+    version: str = "swagger2",
+    ref_depth: int = 5,
+    enum_size: int = 100
+) -> Dict[str, Any]:
+    """
+    Build a synthetic API specification
+    
+    Args:
+        operations: Number of operations (path + method pairs)
+        version: "swagger2" (definitions, in: body) or "oas3" (components, requestBody)
+        ref_depth: Length of the $ref chain below every resource schema
+        enum_size: Number of values of each resource's status enum
+    
+    Returns:
+        Specification document
+    """
+    if version not in ("swagger2", "oas3"):
+        raise ValueError(f"Unknown spec version: {version}. Use 'swagger2' or 'oas3'")
+    
+    ref_prefix = "#/definitions/" if version == "swagger2" else "#/components/schemas/"
+    statuses = [f"STATUS_{i}" for i in range(enum_size)]
+    schemas: Dict[str, Any] = {}
+    paths: Dict[str, Any] = {}
+    
+    for index in range((operations + len(CRUD_OPERATIONS) - 1) // len(CRUD_OPERATIONS)):
+        name = f"Resource{index}"
+        schemas[name] = _resource_schema(name, ref_prefix, ref_depth, statuses)
+        for depth in range(ref_depth):
+            schemas[f"{name}Nested{depth}"] = _nested_schema(name, ref_prefix, depth, ref_depth)
+        
+        collection = f"/v1/resources{index}"
+        for kind, method in CRUD_OPERATIONS[:operations - index * len(CRUD_OPERATIONS)]:
+            path = collection if kind == "collection" else f"{collection}/{{id}}"
+            paths.setdefault(path, {})[method] = _operation(name, kind, method, ref_prefix, version, statuses)
+    
+    document: Dict[str, Any] = {
+        "info": {"title": f"Synthetic API ({operations} operations)", "version": "1.0.0"},
+        "paths": paths
+    }
+    if version == "swagger2":
+        document.update({"swagger": "2.0", "basePath": "/", "definitions": schemas})
+    else:
+        document.update({"openapi": "3.0.3", "components": {"schemas": schemas}})
+    return document
+
+
+def _resource_schema(name: str, ref_prefix: str, ref_depth: int, statuses: List[str]) -> Dict[str, Any]:
+    """Schema of a resource body"""
+    properties: Dict[str, Any] = {
+        "id": {"type": "integer", "format": "int64", "minimum": 1},
+        "name": {"type": "string", "minLength": 1, "maxLength": 120},
+        "code": {"type": "string", "pattern": "^[A-Z]{3}-[0-9]{4}$"},
+        "quantity": {"type": "integer", "minimum": 0, "maximum": 100000},
+        "status": {"type": "string", "enum": statuses}
+    }
+    if ref_depth:
+        properties["details"] = {"$ref": f"{ref_prefix}{name}Nested0"}
+    return {"type": "object", "required": ["name", "code", "status"], "properties": properties}
+
+
+def _nested_schema(name: str, ref_prefix: str, depth: int, ref_depth: int) -> Dict[str, Any]:
+    """Schema of one link of a resource's $ref chain"""
+    properties: Dict[str, Any] = {
+        "label": {"type": "string", "maxLength": 60},
+        "weight": {"type": "number", "minimum": 0}
+    }
+    if depth + 1 < ref_depth:
+        properties["child"] = {"$ref": f"{ref_prefix}{name}Nested{depth + 1}"}
+    return {"type": "object", "required": ["label"], "properties": properties}
+
+
+def _operation(name: str, kind: str, method: str, ref_prefix: str, version: str, statuses: List[str]) -> Dict[str, Any]:
+    """One operation of a resource"""
+    body_ref = {"$ref": f"{ref_prefix}{name}"}
+    parameters: List[Dict[str, Any]] = []
+    if kind == "item":
+        parameters.append(_parameter("id", "path", {"type": "integer", "format": "int64", "minimum": 1}, version))
+    elif method == "get":
+        parameters.append(_parameter("status", "query", {"type": "string", "enum": statuses}, version))
+        parameters.append(_parameter("limit", "query", {"type": "integer", "minimum": 1, "maximum": 500}, version))
+    
+    responses: Dict[str, Any] = {
+        "400": {"description": "Bad Request"},
+        "500": {"description": "Internal Server Error"}
+    }
+    if kind == "item":
+        responses["404"] = {"description": "Not Found"}
+    if method == "delete":
+        responses["204"] = {"description": "No Content"}
+    else:
+        response_schema = {"type": "array", "items": body_ref} if kind == "collection" and method == "get" else body_ref
+        status = "201" if method == "post" else "200"
+        if version == "swagger2":
+            responses[status] = {"description": "OK", "schema": response_schema}
+        else:
+            responses[status] = {"description": "OK", "content": {"application/json": {"schema": response_schema}}}
+    
+    operation: Dict[str, Any] = {
+        "tags": [name],
+        "summary": f"{method.upper()} {name} {kind}",
+        "operationId": f"{method}{name}{kind.capitalize()}",
+        "parameters": parameters,
+        "responses": responses
+    }
+    if method in ("post", "put"):
+        if version == "swagger2":
+            parameters.append({"name": "body", "in": "body", "required": True, "schema": body_ref})
+        else:
+            operation["requestBody"] = {"required": True, "content": {"application/json": {"schema": body_ref}}}
+    return operation
+
+
+def _parameter(name: str, location: str, schema: Dict[str, Any], version: str) -> Dict[str, Any]:
+    """A path or query parameter in the layout of the spec version"""
+    parameter: Dict[str, Any] = {"name": name, "in": location, "required": location == "path"}
+    if version == "swagger2":
+        parameter.update(schema)
+    else:
+        parameter["schema"] = schema
+    return parameter
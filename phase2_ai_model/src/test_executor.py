@@ -0,0 +1,419 @@
+"""
+Test Executor - Runs generated test cases against the API with an async HTTP client
+"""
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Callable, Union
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+
+from oas_parser import parse_status_code
+from execution_planner import ExecutionPlan, Fixture
+from case_templates import iter_expanded
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExecutionResult:
+    """Outcome of executing one test case"""
+    test_id: str
+    endpoint: str
+    method: str
+    url: str
+    category: str = ""
+    expected_status_code: Optional[int] = None
+    status_code: Optional[int] = None
+    passed: bool = False
+    elapsed_ms: float = 0.0
+    failures: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    started_at: str = ""
+    
+    def to_dict(self):
+        return asdict(self)
+
+
+def load_test_cases(input_path: Union[str, Path], expand: bool = True) -> List[Dict[str, Any]]:
+    """
+    Load test cases written by the JSON or JSONL formatters
+    
+    Args:
+        input_path: Path to a .json file (with a "testCases" list) or a .jsonl file
+        expand: Expand data-driven templates into one test case per row
+    
+    Returns:
+        List of test cases
+    """
+    input_path = Path(input_path)
+    
+    with open(input_path, 'r', encoding='utf-8') as f:
+        if input_path.suffix.lower() == ".jsonl":
+            test_cases = [json.loads(line) for line in f if line.strip()]
+        else:
+            data = json.load(f)
+            test_cases = data if isinstance(data, list) else data.get("testCases", [])
+    
+    return list(iter_expanded(test_cases)) if expand else test_cases
+
+
+class AsyncTestExecutor:
+    """Executes test cases concurrently over pooled keep-alive connections"""
+    
+    def __init__(
+        self,
+        base_url: str,
+        concurrency: int = 10,
+        timeout: float = 30.0,
+        keepalive_timeout: float = 30.0
+    ):
+        """
+        Initialize test executor
+        
+        Args:
+            base_url: Base URL of the API under test
+            concurrency: Maximum number of requests (and pooled connections) in flight
+            timeout: Per-request timeout in seconds
+            keepalive_timeout: Seconds an idle pooled connection is kept open
+        """
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+    
+    def create_session(self):
+        """Create an HTTP session backed by a keep-alive connection pool"""
+        try:
+            import aiohttp
+        except ImportError:
+            logger.error("aiohttp library not installed. Install with: pip install aiohttp")
+            raise
+        
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+    
+    async def run(
+        self,
+        test_cases: List[Dict[str, Any]],
+        on_result: Optional[Callable[[ExecutionResult], None]] = None
+    ) -> List[ExecutionResult]:
+        """
+        Execute test cases concurrently
+        
+        Args:
+            test_cases: Test cases to execute; data-driven templates run once per row
+            on_result: Called with each result as soon as its request completes
+        
+        Returns:
+            Results in completion order
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = []
+        
+        async with self.create_session() as session:
+            async def _bounded(test_case):
+                async with semaphore:
+                    return await self.execute_test_case(session, test_case)
+            
+            for next_result in asyncio.as_completed([_bounded(tc) for tc in iter_expanded(test_cases)]):
+                result = await next_result
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        
+        return results
+    
+    async def run_plan(
+        self,
+        plan: ExecutionPlan,
+        on_result: Optional[Callable[[ExecutionResult], None]] = None
+    ) -> List[ExecutionResult]:
+        """
+        Execute an execution plan
+        
+        Fixtures are created once, each as soon as its parent exists, so
+        independent fixture chains and the test cases waiting on them run in
+        parallel. Test cases have their bound path parameters replaced by the
+        identifiers of the created fixtures.
+        
+        Args:
+            plan: Plan built by ExecutionPlanner
+            on_result: Called with each result as soon as its request completes
+        
+        Returns:
+            Results in completion order
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = []
+        
+        async with self.create_session() as session:
+            fixture_ids = self.start_fixtures(session, plan, semaphore)
+            
+            async def _run(planned) -> ExecutionResult:
+                test_case = planned.test_case
+                path_params = dict(test_case.get('pathParams') or {})
+                for name, key in planned.bindings.items():
+                    path_params[name] = await fixture_ids[key]
+                    if path_params[name] is None:
+                        return ExecutionResult(
+                            test_id=str(test_case.get('testId', '')),
+                            endpoint=test_case.get('endpoint', '/'),
+                            method=test_case.get('method', 'GET').upper(),
+                            url="",
+                            category=test_case.get('category', ''),
+                            expected_status_code=test_case.get('expectedStatusCode'),
+                            error=f"Fixture could not be created: {key}",
+                            started_at=datetime.now().isoformat()
+                        )
+                async with semaphore:
+                    return await self.execute_test_case(session, {**test_case, 'pathParams': path_params})
+            
+            for next_result in asyncio.as_completed([_run(planned) for planned in plan.cases]):
+                result = await next_result
+                results.append(result)
+                if on_result:
+                    on_result(result)
+            
+            await asyncio.gather(*fixture_ids.values())
+        
+        return results
+    
+    def start_fixtures(self, session, plan: ExecutionPlan, semaphore: asyncio.Semaphore) -> Dict[str, asyncio.Task]:
+        """
+        Start creating every fixture of a plan
+        
+        Returns:
+            Mapping of fixture key to a task resolving to the created identifier
+            (None if the fixture or one of its parents could not be created)
+        """
+        fixture_ids: Dict[str, asyncio.Task] = {}
+        
+        async def _create(fixture: Fixture) -> Optional[str]:
+            parent_ids = {}
+            for name, key in fixture.parents.items():
+                parent_ids[name] = await fixture_ids[key]
+                if parent_ids[name] is None:
+                    return None
+            async with semaphore:
+                return await self.create_fixture(session, fixture, parent_ids)
+        
+        for fixture in plan.fixtures:
+            fixture_ids[fixture.key] = asyncio.ensure_future(_create(fixture))
+        
+        return fixture_ids
+    
+    async def bind_plan(self, session, plan: ExecutionPlan) -> List[Optional[Dict[str, Any]]]:
+        """
+        Create every fixture of a plan and return its test cases bound to them
+        
+        Returns:
+            One entry per planned case, in plan order: the bound test case, or
+            None where its fixtures could not be created
+        """
+        fixture_ids = self.start_fixtures(session, plan, asyncio.Semaphore(self.concurrency))
+        created = dict(zip(fixture_ids, await asyncio.gather(*fixture_ids.values())))
+        
+        bound = []
+        for planned in plan.cases:
+            ids = {name: created[key] for name, key in planned.bindings.items()}
+            if None in ids.values():
+                bound.append(None)
+                continue
+            test_case = planned.test_case
+            bound.append({**test_case, 'pathParams': {**(test_case.get('pathParams') or {}), **ids}})
+        return bound
+    
+    async def create_fixture(self, session, fixture: Fixture, parent_ids: Dict[str, str]) -> Optional[str]:
+        """
+        Create a fixture resource and return its identifier
+        
+        The producer's identifier field is dropped from the request body so the
+        server assigns a fresh one to every fixture.
+        """
+        producer = fixture.producer_case
+        body = {k: v for k, v in producer.get('requestBody', {}).items() if k != fixture.id_field}
+        request = self.build_request({
+            **producer,
+            'pathParams': {**(producer.get('pathParams') or {}), **parent_ids},
+            'requestBody': body
+        })
+        
+        try:
+            async with session.request(**request) as response:
+                if not 200 <= response.status < 300:
+                    logger.error(f"Fixture {fixture.key} creation returned status {response.status}")
+                    return None
+                data = await response.json(content_type=None)
+                fixture_id = data.get(fixture.id_field) if isinstance(data, dict) else None
+                if fixture_id is None and response.headers.get('Location'):
+                    fixture_id = response.headers['Location'].rstrip('/').rsplit('/', 1)[-1]
+        except Exception as e:
+            logger.error(f"Fixture {fixture.key} creation failed: {e}")
+            return None
+        
+        if fixture_id is None:
+            logger.error(f"Fixture {fixture.key} response has no '{fixture.id_field}' field")
+            return None
+        
+        logger.debug(f"Created fixture {fixture.key} with id {fixture_id}")
+        return str(fixture_id)
+    
+    async def execute_test_case(self, session, test_case: Dict[str, Any]) -> ExecutionResult:
+        """Send one test case request and check the response"""
+        request = self.build_request(test_case)
+        result = ExecutionResult(
+            test_id=str(test_case.get('testId', '')),
+            endpoint=test_case.get('endpoint', '/'),
+            method=request["method"],
+            url=request["url"],
+            category=test_case.get('category', ''),
+            expected_status_code=test_case.get('expectedStatusCode'),
+            started_at=datetime.now().isoformat()
+        )
+        
+        start = time.perf_counter()
+        try:
+            async with session.request(**request) as response:
+                body = await response.read()
+                result.elapsed_ms = (time.perf_counter() - start) * 1000
+                result.status_code = response.status
+                result.failures = self.check_response(test_case, response.status, body, result.elapsed_ms)
+        except asyncio.TimeoutError:
+            result.elapsed_ms = (time.perf_counter() - start) * 1000
+            result.error = f"Request timed out after {self.timeout}s"
+        except Exception as e:
+            result.elapsed_ms = (time.perf_counter() - start) * 1000
+            result.error = f"{type(e).__name__}: {e}"
+        
+        result.passed = result.error is None and not result.failures
+        return result
+    
+    def build_request(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
+        """Build aiohttp request arguments from a test case"""
+        path = test_case.get('endpoint', '/')
+        for name, value in (test_case.get('pathParams') or {}).items():
+            path = path.replace('{' + name + '}', str(value))
+        
+        request = {
+            "method": test_case.get('method', 'GET').upper(),
+            "url": self.base_url + path,
+            "headers": test_case.get('requestHeaders') or {},
+            "params": {k: str(v) for k, v in (test_case.get('queryParams') or {}).items()}
+        }
+        
+        body = test_case.get('requestBody')
+        if isinstance(body, (dict, list)):
+            request["json"] = body
+        elif body:
+            request["data"] = str(body)
+        
+        return request
+    
+    @staticmethod
+    def check_response(
+        test_case: Dict[str, Any],
+        status_code: int,
+        body: bytes,
+        elapsed_ms: Optional[float] = None
+    ) -> List[str]:
+        """
+        Check a response against the test case expectations
+        
+        Returns:
+            List of failure messages (empty if the test case passed)
+        """
+        failures = []
+        
+        expected_status = test_case.get('expectedStatusCode')
+        if expected_status is not None:
+            expected_code = parse_status_code(expected_status)
+            if expected_code is None:
+                failures.append(f"Invalid expected status {expected_status!r}")
+            elif expected_code != status_code:
+                failures.append(f"Expected status {expected_status}, got {status_code}")
+        
+        max_response_time = test_case.get('maxResponseTimeMs')
+        if max_response_time is not None and elapsed_ms is not None and elapsed_ms >= float(max_response_time):
+            failures.append(f"Response time {elapsed_ms:.0f} ms exceeded budget of {max_response_time} ms")
+        
+        expected_fields = test_case.get('expectedResponseFields') or []
+        if expected_fields and not any(f.startswith("Expected status") for f in failures):
+            try:
+                data = json.loads(body) if body else None
+            except ValueError:
+                return failures + ["Response body is not valid JSON"]
+            
+            if isinstance(data, list):
+                data = data[0] if data else {}
+            for field_name in expected_fields:
+                if not AsyncTestExecutor._has_field(data, field_name):
+                    failures.append(f"Missing response field: {field_name}")
+        
+        return failures
+    
+    @staticmethod
+    def _has_field(data: Any, field_path: str) -> bool:
+        """Check a (dotted) field path exists in a JSON object"""
+        for part in field_path.split('.'):
+            if not isinstance(data, dict) or part not in data:
+                return False
+            data = data[part]
+        return True
+    
+    def execute(
+        self,
+        test_cases: Union[List[Dict[str, Any]], ExecutionPlan],
+        output_path: Optional[Union[str, Path]] = None
+    ) -> List[ExecutionResult]:
+        """
+        Execute test cases, streaming each result to a JSONL file as it completes
+        
+        Args:
+            test_cases: Test cases to execute, or an execution plan
+            output_path: JSONL file receiving one result per line
+        
+        Returns:
+            Results in completion order
+        """
+        run = self.run_plan if isinstance(test_cases, ExecutionPlan) else self.run
+        
+        if output_path is None:
+            return asyncio.run(run(test_cases))
+        
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            def _write(result: ExecutionResult) -> None:
+                f.write(json.dumps(result.to_dict()) + "\n")
+                f.flush()
+            
+            results = asyncio.run(run(test_cases, on_result=_write))
+        
+        logger.info(f"Execution results written to {output_path}")
+        return results
+    
+    @staticmethod
+    def summarize(results: List[ExecutionResult]) -> Dict[str, Any]:
+        """Get summary statistics for executed test cases"""
+        passed = len([r for r in results if r.passed])
+        errors = len([r for r in results if r.error])
+        times = sorted(r.elapsed_ms for r in results)
+        
+        return {
+            "total": len(results),
+            "passed": passed,
+            "failed": len(results) - passed,
+            "errors": errors,
+            "total_time_ms": round(sum(times), 1),
+            "max_time_ms": round(times[-1], 1) if times else 0
+        }
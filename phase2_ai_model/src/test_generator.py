@@ -2,14 +2,19 @@
 Test Case Generator - Orchestrates test case generation using OAS parser and LLM
 """
 import logging
-import json
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Callable
 from pathlib import Path
 from datetime import datetime
-from dataclasses import asdict
+from concurrent.futures import Executor
 
 from oas_parser import OASParser, Endpoint
-from llm_processor import LLMProcessor, LLMFactory
+from llm_processor import LLMProvider, LLMProcessor, LLMFactory
+from output_formatter import FormatterFactory
+from coverage_index import CoverageIndex
+from payload_cache import PayloadCache, assemble_request_body
+from example_retriever import ExampleRetriever
+from mutation_engine import MutationEngine
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -47,28 +52,50 @@ class TestCaseGenerator:
     def __init__(
         self,
         oas_file_path: Union[str, Path],
-        llm_provider: str = "openai",
-        llm_config: Optional[Dict[str, str]] = None
+        llm_provider: Union[str, LLMProvider] = "openai",
+        llm_config: Optional[Dict[str, str]] = None,
+        oas_parser: Optional[OASParser] = None,
+        payload_cache: Optional[PayloadCache] = None,
+        example_retriever: Optional[ExampleRetriever] = None,
+        mutation_engine: Optional[MutationEngine] = None
     ):
         """
         Initialize test case generator
         
         Args:
             oas_file_path: Path to OAS specification
-            llm_provider: "openai" or "anthropic"
+            llm_provider: "openai", "anthropic", "ollama", or an already created provider to reuse
             llm_config: LLM configuration dict with api_key, model, temperature
+            oas_parser: Already parsed specification to reuse instead of parsing oas_file_path
+            payload_cache: Valid request bodies per schema; when given, the LLM only writes
+                what each case changes in a cached body instead of whole bodies
+            example_retriever: Curated test cases; the most relevant ones are added to each
+                prompt as few-shot examples
+            mutation_engine: Derives INVALID variants of each endpoint's validated VALID
+                cases locally, on top of the INVALID cases the LLM writes
         """
-        self.oas_parser = OASParser(oas_file_path)
-        self.endpoints = self.oas_parser.parse()
+        if oas_parser is not None:
+            self.oas_parser = oas_parser
+            self.endpoints = oas_parser.get_all_endpoints()
+        else:
+            self.oas_parser = OASParser(oas_file_path)
+            self.endpoints = self.oas_parser.parse()
         
         # Initialize LLM
         if llm_config is None:
             llm_config = {}
         
-        self.llm_provider_name = llm_provider
-        self.llm = LLMFactory.create_provider(llm_provider, **llm_config)
+        if isinstance(llm_provider, LLMProvider):
+            self.llm_provider_name = type(llm_provider).__name__.replace("Provider", "").lower()
+            self.llm = llm_provider
+        else:
+            self.llm_provider_name = llm_provider
+            self.llm = LLMFactory.create_provider(llm_provider, **llm_config)
         self.llm_processor = LLMProcessor(self.llm)
         
+        self.payload_cache = payload_cache
+        self.example_retriever = example_retriever
+        self.mutation_engine = mutation_engine
         self.generated_test_cases: List[Dict[str, Any]] = []
         self.validator = TestCaseValidator()
     
@@ -77,7 +104,11 @@ class TestCaseGenerator:
         valid_cases_per_endpoint: int = 3,
         invalid_cases_per_endpoint: int = 3,
         filter_tags: Optional[List[str]] = None,
-        validate: bool = True
+        validate: bool = True,
+        coverage_index: Optional[CoverageIndex] = None,
+        max_rounds: int = 3,
+        on_cases: Optional[Callable[[Endpoint, List[Dict[str, Any]]], None]] = None,
+        executor: Optional[Executor] = None
     ) -> List[Dict[str, Any]]:
         """
         Generate test cases for all endpoints
@@ -87,6 +118,13 @@ class TestCaseGenerator:
             invalid_cases_per_endpoint: Number of invalid test cases per endpoint
             filter_tags: Only generate for endpoints with these tags
             validate: Whether to validate generated test cases
+            coverage_index: Spec coverage of existing cases; when given, the LLM is only asked
+                for missing coverage, and endpoints are skipped once saturated
+            max_rounds: Maximum LLM requests per endpoint in coverage-driven mode
+            on_cases: Called with each endpoint and its test cases as soon as they are generated
+            executor: Pool generating endpoints concurrently, e.g. one shared by several specs;
+                results are still collected in endpoint order. Coverage-driven generation
+                always runs one endpoint at a time.
         
         Returns:
             List of all generated test cases
@@ -95,24 +133,47 @@ class TestCaseGenerator:
         endpoints_to_process = self.endpoints
         
         if filter_tags:
-            endpoints_to_process = [
-                e for e in self.endpoints
-                if any(tag in (e.tags or []) for tag in filter_tags)
-            ]
+            endpoints_to_process = self.oas_parser.index.with_tags(filter_tags)
         
         logger.info(f"Generating test cases for {len(endpoints_to_process)} endpoints")
         
-        for endpoint in endpoints_to_process:
-            endpoint_cases = self.generate_tests_for_endpoint(
-                endpoint,
-                valid_cases_per_endpoint,
-                invalid_cases_per_endpoint
-            )
-            
-            if validate:
-                endpoint_cases = self._validate_and_filter_cases(endpoint_cases)
-            
+        def _generate(endpoint: Endpoint) -> List[Dict[str, Any]]:
+            with span("generate_endpoint", "generator", method=endpoint.method, path=endpoint.path):
+                if coverage_index is not None:
+                    endpoint_cases = self._generate_until_saturated(
+                        endpoint,
+                        coverage_index,
+                        valid_cases_per_endpoint,
+                        invalid_cases_per_endpoint,
+                        validate,
+                        max_rounds
+                    )
+                else:
+                    endpoint_cases = self.generate_tests_for_endpoint(
+                        endpoint,
+                        valid_cases_per_endpoint,
+                        invalid_cases_per_endpoint
+                    )
+                    if validate:
+                        endpoint_cases = self._validate_and_filter_cases(endpoint_cases)
+                
+                if self.mutation_engine is not None:
+                    variants = self.mutation_engine.mutate(endpoint, endpoint_cases)
+                    if coverage_index is not None:
+                        coverage_index.add_all(variants)
+                    endpoint_cases = endpoint_cases + variants
+                return endpoint_cases
+        
+        if executor is not None and coverage_index is None:
+            futures = [executor.submit(_generate, endpoint) for endpoint in endpoints_to_process]
+            results = (future.result() for future in futures)
+        else:
+            results = (_generate(endpoint) for endpoint in endpoints_to_process)
+        
+        for endpoint, endpoint_cases in zip(endpoints_to_process, results):
             self.generated_test_cases.extend(endpoint_cases)
+            if on_cases is not None:
+                on_cases(endpoint, endpoint_cases)
             logger.info(f"Generated {len(endpoint_cases)} test cases for {endpoint.path}")
         
         logger.info(f"Total generated test cases: {len(self.generated_test_cases)}")
@@ -122,111 +183,151 @@ class TestCaseGenerator:
         self,
         endpoint: Endpoint,
         num_valid: int = 3,
-        num_invalid: int = 3
+        num_invalid: int = 3,
+        missing_coverage: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Generate test cases for a specific endpoint"""
-        endpoint_info = {
+        """Generate test cases for a specific endpoint, optionally targeting missing coverage"""
+        schema = endpoint.request_body_schema
+        valid_body = self.payload_cache.get(schema) if self.payload_cache is not None else None
+        examples = self.example_retriever.select(endpoint) if self.example_retriever is not None else []
+        
+        test_cases = self.llm_processor.generate_test_cases_for_endpoint(
+            self.build_endpoint_info(endpoint, missing_coverage, valid_body, examples),
+            num_valid,
+            num_invalid
+        )
+        
+        # The LLM is not asked for tags; exports group requests by the endpoint's
+        for test_case in test_cases:
+            test_case.setdefault('tags', list(endpoint.tags or []))
+        
+        if valid_body is not None:
+            for test_case in test_cases:
+                assemble_request_body(valid_body, test_case)
+        elif self.payload_cache is not None:
+            self.payload_cache.learn(schema, test_cases)
+        return test_cases
+    
+    @staticmethod
+    def build_endpoint_info(
+        endpoint: Endpoint,
+        missing_coverage: Optional[List[str]] = None,
+        valid_request_body: Any = None,
+        examples: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Get the endpoint details the LLM prompt is built from"""
+        return {
             'path': endpoint.path,
             'method': endpoint.method,
             'summary': endpoint.summary,
             'description': endpoint.description,
-            'parameters': [asdict(p) for p in (endpoint.parameters or [])],
+            'parameters': endpoint.parameter_views(),
             'requestBodySchema': endpoint.request_body_schema,
-            'requiredFields': endpoint.request_required_fields or []
+            'requiredFields': endpoint.request_required_fields or [],
+            'missingCoverage': missing_coverage or [],
+            'validRequestBody': valid_request_body,
+            'examples': examples or []
         }
+    
+    def _generate_until_saturated(
+        self,
+        endpoint: Endpoint,
+        coverage_index: CoverageIndex,
+        num_valid: int,
+        num_invalid: int,
+        validate: bool,
+        max_rounds: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Ask the LLM for missing coverage only, until the endpoint is saturated
         
-        test_cases = self.llm_processor.generate_test_cases_for_endpoint(
-            endpoint_info,
-            num_valid,
-            num_invalid
-        )
+        Each round requests at most num_valid/num_invalid cases, sized down to the
+        number of missing items of each kind. Generation stops once every item is
+        covered, after max_rounds, or when a round adds no new coverage.
+        """
+        coverage = coverage_index.for_endpoint(endpoint)
+        endpoint_cases = []
         
-        return test_cases
+        for _ in range(max_rounds):
+            missing = coverage.missing()
+            if not missing:
+                break
+            
+            # Sending optional fields and expecting 2xx needs VALID cases; everything else INVALID ones
+            valid_items = [
+                item for item in missing
+                if item.startswith("present:") or item.startswith("status:2")
+            ]
+            round_cases = self.generate_tests_for_endpoint(
+                endpoint,
+                min(num_valid, len(valid_items)),
+                min(num_invalid, len(missing) - len(valid_items)),
+                missing_coverage=[coverage_index.describe(item) for item in missing]
+            )
+            
+            if validate:
+                round_cases = self._validate_and_filter_cases(round_cases)
+            
+            endpoint_cases.extend(round_cases)
+            if coverage_index.add_all(round_cases) == 0:
+                logger.info(f"No new coverage for {endpoint.method} {endpoint.path}, stopping")
+                break
+        
+        if coverage.saturated:
+            logger.info(f"Coverage of {endpoint.method} {endpoint.path} is saturated")
+        return endpoint_cases
     
     def _validate_and_filter_cases(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Validate test cases and remove invalid ones"""
         valid_cases = []
         
-        for test_case in test_cases:
-            is_valid, errors = self.validator.validate_test_case(test_case)
-            
-            if is_valid:
-                valid_cases.append(test_case)
-            else:
-                logger.warning(f"Invalid test case: {errors}")
+        with span("validate", "generator", test_cases=len(test_cases)):
+            for test_case in test_cases:
+                is_valid, errors = self.validator.validate_test_case(test_case)
+                
+                if is_valid:
+                    valid_cases.append(test_case)
+                else:
+                    logger.warning(f"Invalid test case: {errors}")
         
         return valid_cases
     
-    def export_to_json(self, output_path: Union[str, Path]) -> None:
-        """Export test cases to JSON"""
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        output_data = {
+    def get_export_metadata(self) -> Dict[str, Any]:
+        """Get metadata passed to output formatters"""
+        return {
             "projectName": self.oas_parser.api_title,
             "apiVersion": self.oas_parser.api_version,
             "generatedAt": datetime.now().isoformat(),
             "generatorInfo": {
                 "type": "AI-Generated",
-                "llmProvider": self.llm_provider_name,
-                "oasFile": str(self.oas_parser.file_path)
+                "llmProvider": self.llm_provider_name
             },
-            "totalTestCases": len(self.generated_test_cases),
-            "testCases": self.generated_test_cases
+            "oasFile": str(self.oas_parser.file_path)
         }
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2)
-        
-        logger.info(f"Exported {len(self.generated_test_cases)} test cases to {output_path}")
     
-    def export_to_csv(self, output_path: Union[str, Path]) -> None:
-        """Export test cases to CSV format"""
-        import csv
-        
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
+    def export(self, output_path: Union[str, Path], output_format: str) -> None:
+        """Export test cases through a registered output formatter"""
         if not self.generated_test_cases:
             logger.warning("No test cases to export")
             return
         
-        # Get all possible keys from test cases
-        all_keys = set()
-        for tc in self.generated_test_cases:
-            all_keys.update(tc.keys())
-        
-        # Define CSV columns (simplified)
-        csv_columns = [
-            'testId', 'endpoint', 'method', 'category', 'description',
-            'priority', 'expectedStatusCode'
-        ]
-        
-        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(
-                csvfile,
-                fieldnames=csv_columns,
-                extrasaction='ignore'
-            )
-            writer.writeheader()
-            
-            for test_case in self.generated_test_cases:
-                # Convert complex fields to strings
-                row = {}
-                for col in csv_columns:
-                    value = test_case.get(col, '')
-                    if isinstance(value, (dict, list)):
-                        value = json.dumps(value)
-                    row[col] = value
-                writer.writerow(row)
+        formatter = FormatterFactory.create_formatter(output_format)
+        formatted_data = formatter.format(self.generated_test_cases, self.get_export_metadata())
+        formatter.write(output_path, formatted_data)
         
         logger.info(f"Exported {len(self.generated_test_cases)} test cases to {output_path}")
     
+    def export_to_json(self, output_path: Union[str, Path]) -> None:
+        """Export test cases to JSON"""
+        self.export(output_path, "json")
+    
+    def export_to_csv(self, output_path: Union[str, Path]) -> None:
+        """Export test cases to CSV format"""
+        self.export(output_path, "csv")
+    
     def export_to_postman(self, output_path: Union[str, Path]) -> None:
         """Export test cases to Postman collection format"""
-        # This would create a Postman collection JSON
-        # Implementation depends on Postman collection schema
-        logger.warning("Postman export not yet implemented")
+        self.export(output_path, "postman")
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about generated test cases"""
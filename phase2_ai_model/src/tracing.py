@@ -0,0 +1,121 @@
+"""
+Tracing - Lightweight spans around the stages of a generation run
+
+Spec parsing, prompt building, LLM requests, JSON parsing, validation and
+formatting each open a span. Tracing is off by default and a span is then a
+shared no-op context manager. Once enabled, spans are recorded per thread and
+exported in the Chrome trace-event format (chrome://tracing, ui.perfetto.dev),
+where spans of concurrent threads show up on separate tracks.
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Any, Optional, Union
+from pathlib import Path
+from contextlib import contextmanager, nullcontext
+
+_NO_SPAN = nullcontext()
+
+
+class Tracer:
+    """Records completed spans as Chrome trace events"""
+    
+    def __init__(self):
+        """Initialize tracer; event timestamps are relative to its creation"""
+        self.events: List[Dict[str, Any]] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def span(self, name: str, category: str = "", **args: Any):
+        """Record the time spent in the with-block as one span"""
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, category, start_ns, time.perf_counter_ns(), args)
+    
+    def record(self, name: str, category: str, start_ns: int, end_ns: int, args: Optional[Dict[str, Any]] = None) -> None:
+        """Record a completed span of the calling thread"""
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": {key: value if isinstance(value, (int, float, bool)) else str(value) for key, value in (args or {}).items()}
+        }
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+    
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Get the recorded spans in the Chrome trace-event format"""
+        with self._lock:
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            return {"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"}
+    
+    def write(self, output_path: Union[str, Path]) -> None:
+        """Write the trace to a JSON file"""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+    
+    def get_summary(self) -> Dict[str, Dict[str, float]]:
+        """Get count and total milliseconds per span name, slowest first"""
+        totals: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for event in self.events:
+                total = totals.setdefault(event["name"], {"count": 0, "total_ms": 0.0})
+                total["count"] += 1
+                total["total_ms"] += event["dur"] / 1000
+        for total in totals.values():
+            total["total_ms"] = round(total["total_ms"], 3)
+        return dict(sorted(totals.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable_tracing() -> Tracer:
+    """Start recording spans into a new tracer"""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """Stop recording spans, returning the tracer that recorded them"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the active tracer, if tracing is enabled"""
+    return _tracer
+
+
+def span(name: str, category: str = "", **args: Any):
+    """
+    Context manager timing a stage as a span of the active tracer
+    
+    Args:
+        name: Stage name, e.g. "llm_request"
+        category: Component the stage belongs to, e.g. "llm"
+        **args: Details shown with the span, e.g. path="/v1/hospitais"
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, category, **args)
@@ -0,0 +1,75 @@
+"""
+Shared test helpers
+"""
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from llm_processor import LLMProvider, LLMResponse
+
+
+def prompted_endpoint(prompt: str) -> Tuple[str, str]:
+    """Method and path of the endpoint a generation prompt asks about"""
+    path = prompt.split("Path: ", 1)[1].split("\n", 1)[0]
+    method = prompt.split("Method: ", 1)[1].split("\n", 1)[0]
+    return method, path
+
+
+def echo_cases(prompt: str) -> List[dict]:
+    """Answer one VALID case for the prompted endpoint"""
+    method, path = prompted_endpoint(prompt)
+    return [{"testId": f"{method} {path}", "endpoint": path, "method": method, "category": "VALID",
+             "description": "echo", "expectedStatusCode": 200}]
+
+
+class FakeProvider(LLMProvider):
+    """LLM provider answering test cases without a model, recording prompts and overlapping calls"""
+    
+    def __init__(self, answer: Optional[Callable[[str], List[dict]]] = None, responses: Sequence[List[dict]] = (),
+                 model: str = "fake", delay: float = 0.0, **response_fields):
+        """
+        Initialize fake provider
+        
+        Args:
+            answer: Builds the test cases for a prompt; without it the scripted responses are used
+            responses: Test case lists answered in turn, then no test cases
+            model: Model name reported in responses
+            delay: Seconds each call takes
+            **response_fields: Further LLMResponse fields, such as stop_reason or token counts
+        """
+        self.answer = answer
+        self.responses = list(responses)
+        self.model = model
+        self.delay = delay
+        self.response_fields = response_fields
+        self.prompts = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def calls(self) -> int:
+        """Number of prompts answered"""
+        return len(self.prompts)
+    
+    def generate_response(self, prompt: str, max_tokens: int = 2000) -> LLMResponse:
+        with self._lock:
+            self.prompts.append(prompt)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            test_cases = self.responses.pop(0) if self.answer is None and self.responses else []
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        if self.answer is not None:
+            test_cases = self.answer(prompt)
+        return LLMResponse(content=json.dumps({"testCases": test_cases}), model=self.model, **self.response_fields)
+    
+    def parse_json_response(self, response: LLMResponse):
+        return json.loads(response.content)
@@ -0,0 +1,79 @@
+"""
+Unit tests for the synthetic specs and the benchmark suite
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from synthetic_spec import build_synthetic_spec
+from benchmark import run_benchmarks, compare_to_baseline, STAGES
+
+
+class TestSyntheticSpec:
+    """Test synthetic specification generation"""
+    
+    @pytest.mark.parametrize("version", ["swagger2", "oas3"])
+    def test_parsed_operations(self, version, tmp_path):
+        """Test the parser sees the requested operations, body schemas and enums"""
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps(build_synthetic_spec(12, version, ref_depth=3, enum_size=50)))
+        
+        oas_parser = OASParser(spec_path)
+        endpoints = oas_parser.parse()
+        
+        assert len(endpoints) == 12
+        post = next(e for e in endpoints if e.method == "POST")
+        assert post.request_required_fields == ["name", "code", "status"]
+        listing = next(e for e in endpoints if e.method == "GET" and "{id}" not in e.path)
+        assert len(next(p for p in listing.parameters if p.name == "status").enum_values) == 50
+    
+    def test_ref_chain(self):
+        """Test every resource references a chain of ref_depth nested definitions"""
+        definitions = build_synthetic_spec(5, "swagger2", ref_depth=4)["definitions"]
+        
+        schema, depth = definitions["Resource0"]["properties"]["details"], 0
+        while "$ref" in schema:
+            depth += 1
+            schema = definitions[schema["$ref"].rsplit("/", 1)[-1]]["properties"].get("child", {})
+        
+        assert depth == 4
+
+
+class TestBenchmark:
+    """Test benchmark runs and baseline comparison"""
+    
+    def test_run_records_every_stage(self):
+        """Test a small run records time and peak memory of every stage"""
+        results = run_benchmarks(sizes=[10], versions=["oas3"], formats=["json", "postman"])
+        
+        stages = results["scenarios"]["oas3-10"]
+        assert list(stages) == STAGES
+        assert all(stage["time_ms"] > 0 and stage["peak_kb"] > 0 for stage in stages.values())
+    
+    def test_compare_to_baseline(self):
+        """Test regressions beyond the threshold and the noise floor are reported"""
+        baseline = {"scenarios": {"oas3-100": {
+            "parse": {"time_ms": 100.0, "peak_kb": 1000.0},
+            "validate": {"time_ms": 1.0, "peak_kb": 10.0}
+        }}}
+        results = {"scenarios": {
+            "oas3-100": {
+                "parse": {"time_ms": 180.0, "peak_kb": 1400.0},
+                "validate": {"time_ms": 4.0, "peak_kb": 40.0}
+            },
+            "oas3-100000": {"parse": {"time_ms": 1e6, "peak_kb": 1e6}}
+        }}
+        
+        regressions = compare_to_baseline(results, baseline, threshold=0.5)
+        
+        assert len(regressions) == 1
+        assert regressions[0].startswith("oas3-100 parse: 180.0 ms")
+        assert compare_to_baseline(results, baseline, threshold=1.0) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
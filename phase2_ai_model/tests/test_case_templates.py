@@ -0,0 +1,136 @@
+"""
+Unit tests for data-driven Case Templates
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from case_templates import collapse, expand_template, expand_templates, is_template, count_cases
+from output_formatter import export_formats
+from test_executor import load_test_cases
+
+
+def nearest_case(number, latitude, longitude, status=200):
+    """Build a case of a coordinate sweep on the nearest-hospital endpoint"""
+    return {
+        "testId": f"NEAR-{number:03d}",
+        "endpoint": "/v1/hospitais/maisProximo",
+        "method": "GET",
+        "category": "VALID" if status == 200 else "INVALID",
+        "description": "Find nearest hospital",
+        "requestHeaders": {"Accept": "application/json"},
+        "queryParams": {"latitude": latitude, "longitude": longitude},
+        "expectedStatusCode": status,
+        "expectedResponseFields": ["id", "name"],
+        "tags": ["Hospitals"]
+    }
+
+
+@pytest.fixture
+def sweep():
+    """A 4x3 coordinate grid, one out-of-range row, and two unrelated cases"""
+    cases = [
+        nearest_case(lat * 3 + lon, -23.5 + lat, -46.6 + lon)
+        for lat in range(4) for lon in range(3)
+    ]
+    cases.insert(5, {"testId": "HC-001", "endpoint": "/v1/hospitais/", "method": "POST", "category": "VALID",
+                     "description": "Create", "requestBody": {"name": "Central", "beds": 10}, "expectedStatusCode": 201})
+    cases.append(nearest_case(99, 123.0, -46.6, status=400))
+    cases.append({"testId": "HC-002", "endpoint": "/v1/hospitais/{id}", "method": "GET", "category": "INVALID",
+                  "description": "Missing", "pathParams": {"id": "9"}, "expectedStatusCode": 404})
+    return cases
+
+
+class TestCaseTemplates:
+    """Test collapsing cases into templates and expanding them back"""
+    
+    def test_collapse_round_trip(self, sweep):
+        """Test a sweep becomes one template whose columns are the varying fields"""
+        collapsed = collapse(sweep)
+        
+        assert len(collapsed) == 3
+        template = collapsed[0]
+        assert is_template(template) and not any(is_template(tc) for tc in collapsed[1:])
+        assert template["data"]["columns"] == ["testId", "category", "latitude", "longitude", "expectedStatusCode"]
+        assert template["queryParams"] == {"latitude": "{{latitude}}", "longitude": "{{longitude}}"}
+        assert template["requestHeaders"] == {"Accept": "application/json"}
+        assert template["data"]["rows"][-1] == ["NEAR-099", "INVALID", 123.0, -46.6, 400]
+        
+        expanded = expand_templates(collapsed)
+        sweep_cases = [tc for tc in sweep if tc["endpoint"] == "/v1/hospitais/maisProximo"]
+        assert expanded[:13] == sweep_cases
+        assert sorted(expanded, key=lambda tc: tc["testId"]) == sorted(sweep, key=lambda tc: tc["testId"])
+        assert count_cases(collapsed) == len(sweep)
+        assert collapse(sweep, min_rows=20) == sweep
+    
+    def test_hand_written_template(self):
+        """Test placeholders inside strings are interpolated and fixed ids get row numbers"""
+        template = {
+            "testId": "INV", "endpoint": "/v1/hospitais/{hospitalId}/estoque", "method": "POST",
+            "description": "Add {{quantity}} units", "pathParams": {"hospitalId": "{{hospital}}"},
+            "requestBody": {"productId": "P-{{product}}", "quantity": "{{quantity}}"}, "expectedStatusCode": 201,
+            "data": {"columns": ["hospital", "product", "quantity"], "rows": [["h1", 7, 5], ["h2", 8, 0]]}
+        }
+        
+        first, second = expand_template(template)
+        
+        assert first["testId"] == "INV-001" and second["testId"] == "INV-002"
+        assert first["description"] == "Add 5 units"
+        assert second["requestBody"] == {"productId": "P-8", "quantity": 0}
+        assert second["pathParams"] == {"hospitalId": "h2"}
+        assert "data" not in first
+
+
+class TestTemplateExport:
+    """Test templates in the exported formats"""
+    
+    def test_json_csv_and_postman(self, tmp_path, sweep):
+        """Test templates stay compact in JSON, expand in CSV and become data-driven Postman runs"""
+        collapsed = collapse(sweep)
+        metadata = {"projectName": "Hospital API", "baseUrl": "http://localhost:8080"}
+        files = export_formats(collapsed, metadata, ["json", "csv", "postman"], tmp_path)
+        expanded_files = export_formats(sweep, metadata, ["json"], tmp_path / "full")
+        
+        content = files["json"].read_text()
+        assert '      ["NEAR-000", "VALID", -23.5, -46.6, 200],\n' in content
+        assert json.loads(content)["summary"]["totalTestCases"] == len(sweep)
+        assert load_test_cases(files["json"], expand=False) == collapsed
+        assert sorted(tc["testId"] for tc in load_test_cases(files["json"])) == sorted(tc["testId"] for tc in sweep)
+        assert files["json"].stat().st_size * 2 < expanded_files["json"].stat().st_size
+        assert len(files["csv"].read_text().splitlines()) == len(sweep) + 1
+        
+        collection = json.loads(files["postman"].read_text())
+        assert "dataDriven" not in collection
+        assert sum(len(path["item"]) for tag in collection["item"] for path in tag["item"]) == 2
+        
+        data_collection = tmp_path / "generated_tests_postman.data-1-get-v1-hospitais-maisproximo.json"
+        item = json.loads(data_collection.read_text())["item"][0]
+        iterations = json.loads(data_collection.with_suffix(".iterations.json").read_text())
+        assert item["request"]["url"]["raw"] == (
+            "{{baseUrl}}/v1/hospitais/maisProximo?latitude={{latitude}}&longitude={{longitude}}"
+        )
+        assert 'pm.iterationData.get("expectedStatusCode")' in item["event"][0]["script"]["exec"][0]
+        assert len(iterations) == 13 and iterations[0]["latitude"] == -23.5
+    
+    def test_postman_body_keeps_types(self, tmp_path):
+        """Test whole-placeholder body fields are unquoted and their data JSON-encoded"""
+        cases = [
+            {"testId": f"HC-{n}", "endpoint": "/v1/hospitais/", "method": "POST", "category": "VALID",
+             "description": "Create", "requestBody": {"name": name, "beds": beds}, "expectedStatusCode": 201}
+            for n, (name, beds) in enumerate([("A", 1), ("B", 2), ("C", 3)])
+        ]
+        
+        export_formats(collapse(cases), {}, ["postman"], tmp_path)
+        
+        data_collection = tmp_path / "generated_tests_postman.data-1-post-v1-hospitais.json"
+        raw = json.loads(data_collection.read_text())["item"][0]["request"]["body"]["raw"]
+        iterations = json.loads(data_collection.with_suffix(".iterations.json").read_text())
+        assert raw == '{"name": {{name}}, "beds": {{beds}}}'
+        assert iterations[0] == {"testId": "HC-0", "name": '"A"', "beds": "1"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
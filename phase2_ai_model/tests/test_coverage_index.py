@@ -0,0 +1,91 @@
+"""
+Unit tests for the Coverage Index and coverage-driven generation
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from coverage_index import CoverageIndex
+from conftest import FakeProvider
+import test_generator
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+MANUAL_TEST_CASES = Path(__file__).parent.parent.parent / "manual_testing" / "test_cases.json"
+
+
+def nearest_case(test_id, query, status, category="VALID"):
+    """Create a GET /v1/hospitais/maisProximo test case"""
+    return {"testId": test_id, "endpoint": "/v1/hospitais/maisProximo", "method": "GET", "category": category,
+            "description": test_id, "queryParams": query, "expectedStatusCode": status}
+
+
+class TestCoverageIndex:
+    """Test coverage index functionality"""
+    
+    @pytest.fixture
+    def index(self):
+        """Create a coverage index over the hospital API"""
+        oas_parser = OASParser(OAS_FILE)
+        oas_parser.parse()
+        return CoverageIndex(oas_parser.endpoints, oas_parser.oas_doc["definitions"])
+    
+    def test_items_and_case_masks(self, index):
+        """Test a case sets the bits of the fields it sends, omits and violates"""
+        coverage = index.coverage[("POST", "/v1/hospitais")]
+        
+        assert "missing:body.name" in coverage.items
+        assert "below_minimum:body.beds" in coverage.items
+        assert "status:500" not in coverage.items
+        
+        added = index.add({"endpoint": "/v1/hospitais/", "method": "POST", "expectedStatusCode": 400,
+                           "requestBody": {"address": "", "beds": -1}})
+        
+        assert added == 6
+        assert {item for item in coverage.items if coverage.covered & coverage.bits[item]} == {
+            "missing:body.name", "present:body.address", "too_short:body.address",
+            "present:body.beds", "below_minimum:body.beds", "status:400"
+        }
+        
+        index.add({"endpoint": "/v1/hospitais", "method": "POST", "expectedStatusCode": "201 Created"})
+        assert coverage.covered & coverage.bits["status:201"]
+    
+    def test_seed_with_manual_cases(self, index):
+        """Test manual cases seed coverage, matching placeholders by position"""
+        with open(MANUAL_TEST_CASES, 'r', encoding='utf-8') as f:
+            index.add_all(json.load(f)["testCases"])
+        
+        summary = index.get_summary()
+        
+        assert index.coverage[("GET", "/v1/hospitais/{}")].saturated
+        assert summary["endpoints"]["GET /v1/pacientes/{id}"]["covered"] == 0
+        assert 0 < summary["saturated_endpoints"] < summary["total_endpoints"]
+    
+    def test_generation_stops_when_saturated(self, index):
+        """Test the LLM is asked only for missing coverage and not again once saturated"""
+        provider = FakeProvider(responses=[
+            [nearest_case("N-2", {"latitude": "ABC", "longitude": "x", "radius": "y"}, 400, "INVALID"),
+             nearest_case("N-3", {}, 400, "INVALID")],
+            [nearest_case("N-4", {"latitude": "0", "longitude": "0"}, 404, "INVALID")]
+        ])
+        generator = test_generator.TestCaseGenerator(OAS_FILE, provider)
+        generator.endpoints = [e for e in generator.endpoints if e.path.endswith("maisProximo")]
+        index.add(nearest_case("N-1", {"latitude": "-23.5", "longitude": "-46.6", "radius": "5"}, 200))
+        
+        generated = generator.generate_all_tests(coverage_index=index, max_rounds=3)
+        
+        assert index.for_endpoint(generator.endpoints[0]).saturated
+        assert [tc["testId"] for tc in generated] == ["N-2", "N-3", "N-4"]
+        assert len(provider.prompts) == 2
+        assert "send query parameter latitude with the wrong type" in provider.prompts[0]
+        assert "Generate 0 VALID test cases" in provider.prompts[0]
+        assert "expect status code 200" not in provider.prompts[0]
+        assert "- expect status code 404" in provider.prompts[1]
+        assert "wrong type" not in provider.prompts[1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+"""
+Unit tests for the Endpoint Index and Path Router
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from endpoint_index import PathRouter, path_shape
+from coverage_index import CoverageIndex
+from synthetic_spec import build_synthetic_spec
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+
+
+class TestPathRouter:
+    """Test path template matching"""
+    
+    def test_literals_win_and_params_are_captured(self):
+        """Test literal segments beat placeholders and placeholder values are returned"""
+        router = PathRouter()
+        for template in ["/v1/hospitais/", "/v1/hospitais/{id}", "/v1/hospitais/maisProximo",
+                         "/v1/hospitais/{hospitalId}/estoque", "/v1/hospitais/{hospitalId}/estoque/{productId}"]:
+            router.add(template, template)
+        
+        assert len(router) == 5
+        assert router.match("/v1/hospitais/maisProximo?latitude=1").template == "/v1/hospitais/maisProximo"
+        assert router.match("http://localhost:8080/v1/hospitais").template == "/v1/hospitais/"
+        route = router.match("/v1/hospitais/5e1a/estoque/42/")
+        assert route.template == "/v1/hospitais/{hospitalId}/estoque/{productId}"
+        assert route.params == {"hospitalId": "5e1a", "productId": "42"}
+        assert router.match("/v1/hospitais/5e1a/leitos") is None
+        assert router.get("/v1/hospitais/{other}") == "/v1/hospitais/{id}"
+    
+    def test_backtracks_from_literal_dead_end(self):
+        """Test a literal prefix that leads nowhere falls back to the placeholder branch"""
+        router = PathRouter()
+        router.add("/items/special/info", "special")
+        router.add("/items/{id}/history", "history")
+        
+        assert router.match("/items/special/history").value == "history"
+        assert router.match("/items/special/history").params == {"id": "special"}
+    
+    def test_path_shape(self):
+        """Test templates differing only in placeholder names or query strings share a shape"""
+        assert path_shape("/v1/hospitals/{hospitalId}/beds?page=2") == "/v1/hospitals/{}/beds"
+        assert path_shape("v1/hospitals/{id}/beds/") == path_shape("/v1/hospitals/{hospitalId}/beds")
+        assert path_shape("/") == "/"
+
+
+class TestEndpointIndex:
+    """Test the parser's endpoint indexes"""
+    
+    @pytest.fixture
+    def oas_parser(self, tmp_path):
+        """Parse a synthetic spec with 4 resources"""
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps(build_synthetic_spec(20, "oas3", ref_depth=1, enum_size=3)), encoding="utf-8")
+        oas_parser = OASParser(spec_path)
+        oas_parser.parse()
+        return oas_parser
+    
+    def test_lookups(self, oas_parser):
+        """Test tag, method, operationId and path-prefix lookups"""
+        assert [e.method for e in oas_parser.get_endpoints_by_tag("Resource2")] == ["GET", "POST", "GET", "PUT", "DELETE"]
+        assert len(oas_parser.get_endpoints_by_method("delete")) == 4
+        assert oas_parser.get_endpoint_by_operation_id("putResource3Item").path == "/v1/resources3/{id}"
+        assert {e.path for e in oas_parser.get_endpoints_by_path_prefix("/v1/resources1")} == {
+            "/v1/resources1", "/v1/resources1/{id}"
+        }
+        assert oas_parser.index.with_tags(["Resource3", "Resource0"]) == (
+            oas_parser.get_endpoints_by_tag("Resource0") + oas_parser.get_endpoints_by_tag("Resource3")
+        )
+    
+    def test_match_url(self, oas_parser):
+        """Test concrete URLs map back to their endpoints"""
+        assert oas_parser.match_url("http://localhost/v1/resources2/77", "PUT").operation_id == "putResource2Item"
+        assert oas_parser.match_url("/v1/resources2", "DELETE") is None
+        assert oas_parser.match_url("/v2/unknown") is None
+    
+    def test_coverage_accepts_concrete_paths(self):
+        """Test coverage maps test cases with concrete paths to their endpoint"""
+        oas_parser = OASParser(OAS_FILE)
+        index = CoverageIndex(oas_parser.parse(), oas_parser.definitions)
+        endpoint = next(e for e in oas_parser.endpoints if e.method == "GET" and e.path.endswith("/estoque"))
+        
+        covered = index.add({
+            "endpoint": endpoint.path.replace("{hospitalId}", "5e1a").replace("{id}", "5e1a"),
+            "method": "GET",
+            "expectedStatusCode": 200
+        })
+        
+        assert covered > 0
+        assert index.for_endpoint(endpoint).test_cases == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Unit tests for the Example Retriever
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from conftest import FakeProvider
+from example_retriever import ExampleRetriever, estimate_tokens, route_terms
+import test_generator
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+MANUAL_CASES = Path(__file__).parent.parent.parent / "manual_testing" / "test_cases.json"
+
+
+@pytest.fixture(scope="module")
+def curated():
+    """Manual test cases"""
+    return json.loads(MANUAL_CASES.read_text(encoding="utf-8"))["testCases"]
+
+
+@pytest.fixture(scope="module")
+def endpoints():
+    """Parsed endpoints of the hospital API keyed by method and path"""
+    return {(e.method, e.path): e for e in OASParser(OAS_FILE).parse()}
+
+
+class TestExampleRetriever:
+    """Test few-shot example retrieval"""
+    
+    def test_same_route_ranks_first(self, curated, endpoints):
+        """Test cases of the same route win over cases sharing words, whatever the placeholder names"""
+        assert route_terms("PUT", "/v1/hospitais/{hospital_id}")[-2:] == route_terms("put", "/v1/hospitais/{id}")[-2:]
+        retriever = ExampleRetriever(curated, k=3)
+        
+        put = retriever.select(endpoints[("PUT", "/v1/hospitais/{id}")])
+        assert [(e["method"], e["endpoint"]) for e in put] == [("PUT", "/v1/hospitais/{hospital_id}")] * 3
+        assert {e["category"] for e in put} == {"VALID", "INVALID"}
+        assert all("testId" not in e and "assertions" not in e for e in put)
+        
+        nearest = retriever.select(endpoints[("GET", "/v1/hospitais/maisProximo")])
+        assert all(e["endpoint"] == "/v1/hospitais/maisProximo" for e in nearest)
+    
+    def test_limits(self, curated, endpoints):
+        """Test the number of examples and their estimated tokens stay within the limits"""
+        endpoint = endpoints[("POST", "/v1/hospitais/")]
+        full = ExampleRetriever(curated, k=10, max_tokens=10_000).select(endpoint)
+        capped = ExampleRetriever(curated, k=10, max_tokens=250).select(endpoint)
+        
+        assert len(full) == 10
+        assert 0 < len(capped) < len(full)
+        assert sum(estimate_tokens(json.dumps(e, separators=(",", ":"))) for e in capped) <= 250
+        assert ExampleRetriever([], k=3).select(endpoint) == []
+    
+    def test_examples_reach_the_prompt(self, curated):
+        """Test the generator adds the retrieved examples to each prompt"""
+        provider = FakeProvider()
+        generator = test_generator.TestCaseGenerator(
+            OAS_FILE, llm_provider=provider, example_retriever=ExampleRetriever(curated, k=2)
+        )
+        
+        generator.generate_all_tests(1, 1, filter_tags=["Inventory"])
+        
+        assert provider.prompts
+        assert all("EXAMPLES:" in prompt for prompt in provider.prompts)
+        post = next(prompt for prompt in provider.prompts if "Method: POST" in prompt)
+        assert '"description":"Add product to hospital inventory"' in post
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,162 @@
+"""
+Unit tests for the Execution Planner
+"""
+import pytest
+import asyncio
+import itertools
+from pathlib import Path
+import sys
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from execution_planner import ExecutionPlanner
+from test_executor import AsyncTestExecutor
+
+HOSPITAL_API = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+
+
+def create_crud_app(created: list) -> web.Application:
+    """Create an in-memory stand-in for hospitals and their inventory"""
+    ids = itertools.count(1)
+    hospitals = {}
+    
+    async def create_hospital(request):
+        hospital = {**await request.json(), "id": f"h{next(ids)}", "estoque": {}}
+        hospitals[hospital["id"]] = hospital
+        created.append(hospital["id"])
+        return web.json_response({k: v for k, v in hospital.items() if k != "estoque"}, status=201)
+    
+    async def hospital_view(request):
+        hospital = hospitals.get(request.match_info["id"])
+        if hospital is None:
+            return web.json_response({}, status=404)
+        if request.method == "DELETE":
+            del hospitals[hospital["id"]]
+            return web.Response(status=204)
+        return web.json_response({k: v for k, v in hospital.items() if k != "estoque"})
+    
+    async def create_product(request):
+        hospital = hospitals.get(request.match_info["id"])
+        if hospital is None:
+            return web.json_response({}, status=404)
+        product = {**await request.json(), "id": f"p{next(ids)}"}
+        hospital["estoque"][product["id"]] = product
+        created.append(product["id"])
+        return web.json_response(product, status=201)
+    
+    async def product_view(request):
+        hospital = hospitals.get(request.match_info["id"])
+        if hospital is None or request.match_info["productId"] not in hospital["estoque"]:
+            return web.json_response({}, status=404)
+        if request.method == "DELETE":
+            del hospital["estoque"][request.match_info["productId"]]
+            return web.Response(status=204)
+        return web.json_response(hospital["estoque"][request.match_info["productId"]])
+    
+    app = web.Application()
+    app.router.add_post("/v1/hospitais/", create_hospital)
+    app.router.add_route("*", "/v1/hospitais/{id}", hospital_view)
+    app.router.add_post("/v1/hospitais/{id}/estoque", create_product)
+    app.router.add_route("*", "/v1/hospitais/{id}/estoque/{productId}", product_view)
+    return app
+
+
+class TestExecutionPlanner:
+    """Test execution planner functionality"""
+    
+    @pytest.fixture
+    def test_cases(self):
+        """Create test cases that depend on hospitals and products"""
+        return [
+            {"testId": "H-POST", "endpoint": "/v1/hospitais/", "method": "POST", "category": "VALID",
+             "requestBody": {"id": "100", "name": "Hospital Central", "beds": 50}, "expectedStatusCode": 201},
+            {"testId": "H-GET", "endpoint": "/v1/hospitais/{id}", "method": "GET", "category": "VALID",
+             "pathParams": {"id": "1"}, "expectedStatusCode": 200, "expectedResponseFields": ["name"]},
+            {"testId": "H-GET-404", "endpoint": "/v1/hospitais/{id}", "method": "GET", "category": "INVALID",
+             "pathParams": {"id": "999999"}, "expectedStatusCode": 404},
+            {"testId": "H-DELETE", "endpoint": "/v1/hospitais/{id}", "method": "DELETE", "category": "VALID",
+             "pathParams": {"id": "1"}, "expectedStatusCode": 204},
+            {"testId": "P-POST", "endpoint": "/v1/hospitais/{hospital_id}/estoque", "method": "POST",
+             "category": "VALID", "pathParams": {"hospital_id": "1"},
+             "requestBody": {"name": "Dipirona", "quantity": 10}, "expectedStatusCode": 201},
+            {"testId": "P-GET", "endpoint": "/v1/hospitais/{hospitalId}/estoque/{productId}", "method": "GET",
+             "category": "VALID", "pathParams": {"hospitalId": "1", "productId": "1"}, "expectedStatusCode": 200},
+            {"testId": "P-DELETE", "endpoint": "/v1/hospitais/{hospitalId}/estoque/{productId}", "method": "DELETE",
+             "category": "VALID", "pathParams": {"hospitalId": "1", "productId": "1"}, "expectedStatusCode": 204}
+        ]
+    
+    def test_plan_shares_and_isolates_fixtures(self, test_cases):
+        """Test reads share fixtures while destructive cases get their own"""
+        plan = ExecutionPlanner().plan(test_cases)
+        cases = {c.test_case["testId"]: c for c in plan.cases}
+        fixtures = {f.key: f for f in plan.fixtures}
+        
+        assert cases["H-POST"].bindings == {}
+        assert cases["H-GET-404"].bindings == {}
+        assert fixtures[cases["H-GET"].bindings["id"]].isolated_for is None
+        assert fixtures[cases["H-DELETE"].bindings["id"]].isolated_for == "H-DELETE"
+        
+        shared_hospital = cases["H-GET"].bindings["id"]
+        assert cases["P-GET"].bindings["hospitalId"] == shared_hospital
+        assert cases["P-DELETE"].bindings["hospitalId"] == shared_hospital
+        assert cases["P-GET"].bindings["productId"] != cases["P-DELETE"].bindings["productId"]
+        assert fixtures[cases["P-DELETE"].bindings["productId"]].parents == {"hospital_id": shared_hospital}
+        
+        assert plan.get_summary()["fixtures"] == 4
+    
+    def test_invalid_cases_keep_their_path_values(self, test_cases):
+        """Test negative cases with explicit path values are not rebound to valid fixtures"""
+        test_cases += [
+            {"testId": "H-MALFORMED", "endpoint": "/v1/hospitais/{id}", "method": "GET", "category": "INVALID",
+             "pathParams": {"id": "not-a-valid-id"}, "expectedStatusCode": 400},
+            {"testId": "H-GONE", "endpoint": "/v1/hospitais/{id}", "method": "GET", "category": "VALID",
+             "pathParams": {"id": "999999"}, "expectedStatusCode": "404"},
+            {"testId": "P-BAD-BODY", "endpoint": "/v1/hospitais/{id}/estoque", "method": "POST",
+             "category": "INVALID", "requestBody": {"quantity": -1}, "expectedStatusCode": 400},
+            {"testId": "H-M01", "endpoint": "/v1/hospitais/{id}", "method": "PUT", "category": "INVALID",
+             "pathParams": {"id": "1"}, "requestBody": {}, "expectedStatusCode": 400, "mutation": "missing:body.name"},
+            {"testId": "H-M02", "endpoint": "/v1/hospitais/{id}", "method": "PUT", "category": "INVALID",
+             "pathParams": {"id": "bad"}, "requestBody": {}, "expectedStatusCode": 400, "mutation": "malformed_id:path.id"}
+        ]
+        
+        cases = {c.test_case["testId"]: c for c in ExecutionPlanner().plan(test_cases).cases}
+        
+        assert cases["H-MALFORMED"].bindings == {}
+        assert cases["H-GONE"].bindings == {}
+        assert cases["P-BAD-BODY"].bindings == {"id": cases["H-GET"].bindings["id"]}
+        assert cases["H-M01"].bindings == {"id": cases["H-GET"].bindings["id"]}
+        assert cases["H-M02"].bindings == {}
+    
+    def test_id_field_from_response_schema(self):
+        """Test identifier fields are read from producer response schemas"""
+        parser = OASParser(HOSPITAL_API)
+        planner = ExecutionPlanner(parser.parse(), parser.oas_doc["definitions"])
+        
+        assert planner._id_field("/v1/hospitais") == "id"
+    
+    def test_run_plan_binds_created_fixtures(self, test_cases):
+        """Test fixtures are created once and their ids replace literal path parameters"""
+        created = []
+        
+        async def _run():
+            server = TestServer(create_crud_app(created))
+            await server.start_server()
+            try:
+                executor = AsyncTestExecutor(str(server.make_url("")), concurrency=4)
+                return await executor.run_plan(ExecutionPlanner().plan(test_cases))
+            finally:
+                await server.close()
+        
+        results = {r.test_id: r for r in asyncio.run(_run())}
+        
+        assert all(r.passed for r in results.values()), {k: r.failures or r.error for k, r in results.items()}
+        # 2 hospital fixtures + 2 product fixtures + 2 creation test cases
+        assert len(created) == 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,131 @@
+"""
+Unit tests for the Generation Service
+"""
+import pytest
+import os
+import json
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+
+import aiohttp
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from conftest import FakeProvider, echo_cases
+from oas_parser import OASParser
+import generation_service
+from generation_service import GenerationService
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+
+
+class TestGenerationService:
+    """Test the generation service API"""
+    
+    def test_jobs_share_warm_state(self, tmp_path):
+        """Test concurrent jobs reuse one provider, one parsed spec and cached responses"""
+        created = []
+        
+        def provider_factory(name, model):
+            created.append((name, model))
+            return FakeProvider(echo_cases)
+        
+        service = GenerationService(provider_factory, tmp_path, workers=2, default_provider="echo", payload_cache=True)
+        
+        async def _run():
+            server = TestServer(service.create_app())
+            await server.start_server()
+            try:
+                async with aiohttp.ClientSession(str(server.make_url(""))) as session:
+                    jobs = []
+                    for tags in (["Hospitals"], ["Hospitals"]):
+                        async with session.post("/jobs", json={"oas_file": str(OAS_FILE), "tags": tags,
+                                                               "output_formats": ["json", "jsonl"]}) as response:
+                            assert response.status == 202
+                            jobs.append((await response.json())["id"])
+                    
+                    async with session.get(f"/jobs/{jobs[0]}/results") as response:
+                        streamed = [json.loads(line) for line in (await response.text()).splitlines()]
+                    async with session.get(f"/jobs/{jobs[1]}/results") as response:
+                        await response.read()
+                    
+                    statuses = []
+                    for job_id in jobs:
+                        async with session.get(f"/jobs/{job_id}") as response:
+                            statuses.append(await response.json())
+                    async with session.get("/health") as response:
+                        health = await response.json()
+                    async with session.post("/jobs", json={"oas_file": "missing.json"}) as response:
+                        rejected = response.status
+                    return streamed, statuses, health, rejected
+            finally:
+                await server.close()
+        
+        streamed, statuses, health, rejected = asyncio.run(_run())
+        
+        assert created == [("echo", "")]
+        assert len(streamed) == 6
+        assert [s["status"] for s in statuses] == ["done", "done"]
+        assert Path(statuses[0]["output_files"]["jsonl"]).exists()
+        assert health["cached_specs"] == 1
+        # Depending on timing, a prompt of the second job may carry a request body cached by the first
+        llm_cache = health["providers"]["echo:default"]
+        assert llm_cache["hits"] + llm_cache["misses"] == 12
+        assert 6 <= llm_cache["entries"] == llm_cache["misses"] <= 8
+        assert health["payload_cache"]["entries"] == 1  # POST and PUT share HospitalInput
+        assert rejected == 400
+    
+    def test_specs_parse_concurrently_and_refresh(self, tmp_path, monkeypatch):
+        """Test different specs parse in parallel and a changed file replaces its entry"""
+        barrier = threading.Barrier(2, timeout=5)
+        
+        class MeetingParser(OASParser):
+            def parse(self, *args, **kwargs):
+                barrier.wait()  # both parses must be running at once
+                return super().parse(*args, **kwargs)
+        
+        monkeypatch.setattr(generation_service, "OASParser", MeetingParser)
+        service = GenerationService(lambda name, model: FakeProvider(echo_cases), tmp_path)
+        specs = [tmp_path / "a.json", tmp_path / "b.json"]
+        for spec in specs:
+            spec.write_bytes(OAS_FILE.read_bytes())
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first, _ = pool.map(service.get_spec, specs)
+        
+        assert service.get_spec(specs[0]) is first
+        barrier = threading.Barrier(1)
+        stat = specs[0].stat()
+        os.utime(specs[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert service.get_spec(specs[0]) is not first
+        assert len(service._specs) == 2
+    
+    def test_inline_spec(self, tmp_path):
+        """Test specs posted inline are stored once and generated from"""
+        service = GenerationService(lambda name, model: FakeProvider(echo_cases), tmp_path, workers=1)
+        spec = json.loads(OAS_FILE.read_text(encoding="utf-8"))
+        
+        async def _run():
+            server = TestServer(service.create_app())
+            await server.start_server()
+            try:
+                async with aiohttp.ClientSession(str(server.make_url(""))) as session:
+                    async with session.post("/jobs", json={"spec": spec, "tags": ["Patients"]}) as response:
+                        job_id = (await response.json())["id"]
+                    async with session.get(f"/jobs/{job_id}/results") as response:
+                        return (await response.text()).splitlines()
+            finally:
+                await server.close()
+        
+        lines = asyncio.run(_run())
+        
+        assert len(lines) == 3
+        assert len(list((tmp_path / "specs").iterdir())) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
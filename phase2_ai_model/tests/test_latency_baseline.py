@@ -0,0 +1,73 @@
+"""
+Unit tests for baseline-derived response-time budgets
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from latency_baseline import LatencyBaseline
+from results_store import ResultsStore
+from output_formatter import PostmanFormatter
+from test_executor import AsyncTestExecutor
+
+
+class TestLatencyBaseline:
+    """Test latency baseline functionality"""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a results store with one run of history"""
+        rows = [
+            {"test_id": f"H-{i}", "name": f"H-{i}", "method": "GET", "endpoint": "/v1/hospitais/{id}",
+             "url": "", "status_code": 200, "expected_status_code": 200, "passed": True,
+             "elapsed_ms": float(10 * (i + 1)), "timestamp": "2026-01-01T00:00:00", "assertions": {}}
+            for i in range(20)
+        ] + [
+            {"test_id": "N-1", "name": "N-1", "method": "GET", "endpoint": "/v1/hospitais/maisProximo",
+             "url": "", "status_code": 200, "expected_status_code": 200, "passed": True,
+             "elapsed_ms": 5.0, "timestamp": "2026-01-01T00:00:00", "assertions": {}}
+        ]
+        with ResultsStore(tmp_path / "results.db") as store:
+            store._insert_run(run_key="synthetic:1", name="run 1", source="executor",
+                              started_at="2026-01-01T00:00:00", rows=rows)
+            yield store
+    
+    def test_budgets_from_store(self, store):
+        """Test budgets use the percentile with headroom and skip thin history"""
+        baseline = LatencyBaseline.from_store(store, percentile=95, headroom=1.5, min_samples=5)
+        
+        assert baseline.budget_for("get", "/v1/hospitais/{id}") == 285
+        assert baseline.budget_for("GET", "/v1/hospitais/maisProximo") is None
+    
+    def test_apply_keeps_explicit_budgets(self):
+        """Test budgets are added only to cases without one"""
+        baseline = LatencyBaseline({("GET", "/v1/hospitais/{id}"): 120})
+        test_cases = [
+            {"testId": "H-1", "endpoint": "/v1/hospitais/{id}", "method": "GET"},
+            {"testId": "H-2", "endpoint": "/v1/hospitais/{id}", "method": "GET", "maxResponseTimeMs": 500},
+            {"testId": "H-3", "endpoint": "/v1/hospitais/", "method": "POST"}
+        ]
+        
+        assert baseline.apply(test_cases) == 1
+        assert [tc.get("maxResponseTimeMs") for tc in test_cases] == [120, 500, None]
+    
+    def test_postman_and_executor_assert_budget(self):
+        """Test both the Postman script and the executor check the budget"""
+        test_case = {"testId": "H-1", "endpoint": "/v1/hospitais/{id}", "method": "GET",
+                     "expectedStatusCode": 200, "maxResponseTimeMs": 120}
+        
+        script = "\n".join(PostmanFormatter._create_test_script(test_case))
+        assert "pm.expect(pm.response.responseTime).to.be.below(120);" in script
+        
+        body = json.dumps({"id": "1"}).encode()
+        assert AsyncTestExecutor.check_response(test_case, 200, body, elapsed_ms=80) == []
+        assert AsyncTestExecutor.check_response(test_case, 200, body, elapsed_ms=150) == [
+            "Response time 150 ms exceeded budget of 120 ms"
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
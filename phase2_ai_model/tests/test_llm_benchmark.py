@@ -0,0 +1,82 @@
+"""
+Unit tests for the LLM Benchmark
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from conftest import FakeProvider, prompted_endpoint
+from llm_benchmark import LLMBenchmark, RecordingProvider, ReplayProvider, format_markdown
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+
+
+def fixed_provider(stop_reason="stop"):
+    """LLM provider answering every prompt with the same two valid and one invalid case"""
+    def answer(prompt):
+        method, path = prompted_endpoint(prompt)
+        return [
+            {"testId": "A", "endpoint": path, "method": method, "category": "VALID", "description": "a", "expectedStatusCode": 200},
+            {"testId": "B", "endpoint": path, "method": method, "category": "INVALID", "description": "b", "expectedStatusCode": 404},
+            {"testId": "C", "endpoint": path, "method": method, "category": "UNKNOWN", "description": "c", "expectedStatusCode": 400}
+        ]
+    
+    return FakeProvider(answer, model="gpt-4", stop_reason=stop_reason, prompt_tokens=1000, completion_tokens=500)
+
+
+class TestLLMBenchmark:
+    """Test LLM benchmark metrics and cassettes"""
+    
+    @pytest.fixture
+    def benchmark(self):
+        """Create a benchmark over the hospital endpoints"""
+        endpoints = [e for e in OASParser(OAS_FILE).parse() if e.path.startswith("/v1/hospitais")]
+        return LLMBenchmark(endpoints, repeats=2)
+    
+    def test_yield_cost_and_truncation(self, benchmark):
+        """Test repeated prompts count duplicates once and cost is spread over valid cases"""
+        summary = benchmark.run_target("openai:gpt-4", "openai", "gpt-4", fixed_provider("length")).get_summary()
+        endpoints = len(benchmark.endpoints)
+        
+        assert summary["calls"] == 2 * endpoints
+        assert summary["valid_cases"] == 2 * endpoints
+        assert summary["duplicate_cases"] == 2 * endpoints
+        assert summary["invalid_cases"] == 2 * endpoints
+        assert summary["valid_per_call"] == 1.0
+        assert summary["truncation_rate"] == 1.0
+        # 1000 input tokens at $30/M and 500 output tokens at $60/M per call
+        assert summary["cost_usd"] == pytest.approx(2 * endpoints * 0.06)
+        assert summary["cost_per_valid_case_usd"] == pytest.approx(0.06)
+    
+    def test_record_and_replay(self, benchmark, tmp_path):
+        """Test a recorded run replays offline with the recorded latencies"""
+        cassette = tmp_path / "gpt-4.jsonl"
+        live = benchmark.run_target("openai:gpt-4", "openai", "gpt-4", RecordingProvider(fixed_provider(), cassette))
+        
+        replay = ReplayProvider(cassette)
+        replayed = benchmark.run_target("replay", "replay", replay.model, replay)
+        
+        assert replay.model == "gpt-4"
+        recorded = [json.loads(line)["latency_ms"] for line in cassette.read_text().splitlines()]
+        assert [c.latency_ms for c in replayed.calls] == recorded
+        assert replayed.get_summary()["valid_cases"] == live.get_summary()["valid_cases"]
+        assert replayed.get_summary()["cost_usd"] == pytest.approx(live.get_summary()["cost_usd"])
+    
+    def test_errors_and_markdown(self, benchmark, tmp_path):
+        """Test prompts missing from a cassette count as errors and render in the table"""
+        (tmp_path / "empty.jsonl").write_text("")
+        summary = benchmark.run_target("replay:empty", "replay", "empty", ReplayProvider(tmp_path / "empty.jsonl")).get_summary()
+        
+        assert summary["errors"] == summary["calls"]
+        assert summary["latency_p50_ms"] is None
+        table = format_markdown([summary]).splitlines()
+        assert table[0].startswith("| Target | Calls | Errors |")
+        assert table[2].startswith("| replay:empty |")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
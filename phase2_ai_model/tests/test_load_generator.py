@@ -0,0 +1,148 @@
+"""
+Unit tests for the Load Generator
+"""
+import pytest
+import asyncio
+from pathlib import Path
+import sys
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from load_generator import LatencyHistogram, LoadProfile, LoadGenerator
+from test_executor import AsyncTestExecutor
+from execution_planner import ExecutionPlanner
+
+
+class TestLatencyHistogram:
+    """Test latency histogram functionality"""
+    
+    def test_percentiles_within_precision(self):
+        """Test percentiles stay within the configured significant digits"""
+        histogram = LatencyHistogram(significant_digits=2)
+        for value in range(1, 10001):
+            histogram.record(value / 10)  # 0.1 ms .. 1000 ms
+        
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.01)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.01)
+        assert histogram.get_summary()["max_ms"] == 1000
+        assert len(histogram.counts) < 2000
+    
+    def test_merge(self):
+        """Test merged histograms combine counts and extremes"""
+        fast, slow = LatencyHistogram(), LatencyHistogram()
+        for _ in range(90):
+            fast.record(1)
+        for _ in range(10):
+            slow.record(100)
+        
+        fast.merge(slow)
+        
+        assert fast.total_count == 100
+        assert fast.percentile(50) == pytest.approx(1, rel=0.01)
+        assert fast.percentile(95) == pytest.approx(100, rel=0.01)
+
+
+class TestLoadGenerator:
+    """Test load profile and open-loop generation"""
+    
+    @pytest.fixture
+    def test_cases(self):
+        """Create VALID and INVALID cases for two endpoints"""
+        return [
+            {"testId": "N-1", "endpoint": "/v1/hospitais/maisProximo", "method": "GET", "category": "VALID",
+             "queryParams": {"lat": "-23.59", "lon": "-46.71"}, "expectedStatusCode": 200},
+            {"testId": "N-2", "endpoint": "/v1/hospitais/maisProximo", "method": "GET", "category": "INVALID",
+             "queryParams": {"lat": "ABC"}, "expectedStatusCode": 400},
+            {"testId": "H-1", "endpoint": "/v1/hospitais/", "method": "GET", "category": "VALID",
+             "expectedStatusCode": 200},
+            {"testId": "H-2", "endpoint": "/v1/hospitais/{id}", "method": "DELETE", "category": "VALID",
+             "pathParams": {"id": "1"}, "expectedStatusCode": 204}
+        ]
+    
+    def test_profile_uses_valid_non_destructive_cases(self, test_cases):
+        """Test the traffic mix only holds VALID, non-DELETE cases with endpoint weights"""
+        profile = LoadProfile.from_test_cases(test_cases, weights={"/v1/hospitais/maisProximo": 3})
+        
+        assert [(tc["testId"], w) for tc, w in profile.entries] == [("N-1", 3), ("H-1", 1)]
+    
+    def test_ramp_schedule(self, test_cases):
+        """Test the schedule ramps linearly to the target rate"""
+        profile = LoadProfile.from_test_cases(test_cases)
+        generator = LoadGenerator(None, profile, target_rps=100, duration=2, ramp_up=1, start_rps=10)
+        
+        offsets = generator.schedule()
+        
+        assert generator.rate_at(0.5) == pytest.approx(55)
+        assert 140 < len(offsets) < 160
+        assert len([o for o in offsets if o >= 1]) == pytest.approx(100, abs=2)
+    
+    def test_run_reports_per_endpoint(self, test_cases):
+        """Test a short run reports latencies and error rates per endpoint"""
+        async def nearest(request):
+            return web.json_response({"name": "Hospital Central"})
+        
+        async def hospitals(request):
+            return web.json_response([], status=500)
+        
+        app = web.Application()
+        app.router.add_get("/v1/hospitais/maisProximo", nearest)
+        app.router.add_get("/v1/hospitais/", hospitals)
+        
+        async def _run():
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                executor = AsyncTestExecutor(str(server.make_url("")), concurrency=5)
+                profile = LoadProfile.from_test_cases(test_cases)
+                return await LoadGenerator(executor, profile, target_rps=100, duration=0.5, seed=1).run()
+            finally:
+                await server.close()
+        
+        report = asyncio.run(_run())
+        
+        nearest_stats = report["endpoints"]["GET /v1/hospitais/maisProximo"]
+        hospitals_stats = report["endpoints"]["GET /v1/hospitais/"]
+        assert report["overall"]["count"] == 50
+        assert nearest_stats["error_rate"] == 0
+        assert hospitals_stats["error_rate"] == 1
+        assert 0 < nearest_stats["p50_ms"] <= nearest_stats["p99_ms"] <= nearest_stats["max_ms"]
+    
+    def test_cases_with_failed_fixtures_are_left_out(self):
+        """Test cases whose fixtures failed are dropped, matched by identity rather than testId"""
+        producer = {"testId": "H-POST", "endpoint": "/v1/hospitais/", "method": "POST", "category": "VALID",
+                    "requestBody": {"name": "Hospital Central"}, "expectedStatusCode": 201}
+        test_cases = [
+            {"testId": "DUP", "endpoint": "/v1/hospitais/{hospitalId}", "method": "GET", "category": "VALID",
+             "expectedStatusCode": 200},
+            {"testId": "DUP", "endpoint": "/v1/hospitais/", "method": "GET", "category": "VALID",
+             "expectedStatusCode": 200}
+        ]
+        
+        async def create_hospital(request):
+            return web.json_response({}, status=500)
+        
+        app = web.Application()
+        app.router.add_post("/v1/hospitais/", create_hospital)
+        
+        async def _run():
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                executor = AsyncTestExecutor(str(server.make_url("")))
+                generator = LoadGenerator(executor, LoadProfile.from_test_cases(test_cases), target_rps=1, duration=1)
+                plan = ExecutionPlanner().plan([tc for tc, _ in generator.profile.entries], [producer])
+                async with executor.create_session() as session:
+                    return await generator.bind_profile(session, plan)
+            finally:
+                await server.close()
+        
+        profile = asyncio.run(_run())
+        
+        assert [tc["endpoint"] for tc, _ in profile.entries] == ["/v1/hospitais/"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
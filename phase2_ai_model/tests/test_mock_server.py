@@ -0,0 +1,188 @@
+"""
+Unit tests for the spec-driven Mock Server
+"""
+import pytest
+import time
+import asyncio
+from pathlib import Path
+import sys
+
+import aiohttp
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser, Endpoint, ResponseSchema
+from mock_server import MockServer, SchemaSampler
+from test_executor import AsyncTestExecutor
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+
+
+async def with_mock_server(stateful, scenario):
+    """Run a scenario against a mock of the hospital API"""
+    oas_parser = OASParser(OAS_FILE)
+    mock = MockServer(oas_parser.parse(), oas_parser.oas_doc, stateful=stateful)
+    server = TestServer(mock.create_app())
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession(str(server.make_url(""))) as session:
+            return await scenario(session, str(server.make_url("")))
+    finally:
+        await server.close()
+
+
+class TestSchemaSampler:
+    """Test schema sampling and validation"""
+    
+    @pytest.fixture
+    def sampler(self):
+        """Create a sampler over the hospital API document"""
+        return SchemaSampler(OASParser(OAS_FILE).oas_doc)
+    
+    def test_sample_follows_refs_and_constraints(self, sampler):
+        """Test samples resolve $ref and satisfy their own schema"""
+        hospital = sampler.sample({"$ref": "#/definitions/Hospital"})
+        
+        assert hospital["beds"] == 1
+        assert hospital["location"]["locationCategory"] == "HOSPITAL"
+        assert sampler.validate(hospital, {"$ref": "#/definitions/Hospital"}) == []
+    
+    def test_validate_reports_every_error(self, sampler):
+        """Test missing fields, wrong types and bounds are reported"""
+        errors = sampler.validate({"name": "", "beds": "ten"}, {"$ref": "#/definitions/HospitalInput"})
+        
+        assert errors == [
+            "body.address is required",
+            "body.name must have at least 1 characters",
+            "body.beds must be of type integer"
+        ]
+
+
+class TestMockServer:
+    """Test mock server routing and responses"""
+    
+    def test_stateless_validation_and_responses(self):
+        """Test declared parameters and bodies are validated and samples are served"""
+        async def scenario(session, base_url):
+            nearest = await session.get("/v1/hospitais/maisProximo", params={"latitude": "-23.5", "longitude": "-46.6"})
+            invalid = await session.get("/v1/hospitais/maisProximo", params={"latitude": "ABC"})
+            created = await session.post("/v1/hospitais/", json={"name": "Central", "address": "Rua A", "beds": 10})
+            rejected = await session.post("/v1/hospitais/", json={"name": "Central"})
+            return (
+                (nearest.status, await nearest.json()),
+                (invalid.status, await invalid.json()),
+                created.status,
+                rejected.status
+            )
+        
+        nearest, invalid, created, rejected = asyncio.run(with_mock_server(False, scenario))
+        
+        assert nearest[0] == 200 and "name" in nearest[1]
+        assert invalid == (400, {"error": "Bad Request", "details": [
+            "query parameter latitude must be of type number",
+            "query parameter longitude is required"
+        ]})
+        assert created == 201
+        assert rejected == 400
+    
+    def test_stateful_crud(self):
+        """Test resources are created, read, nested, updated and deleted in memory"""
+        async def scenario(session, base_url):
+            statuses = []
+            hospital = await (await session.post("/v1/hospitais/", json={"name": "Central", "address": "Rua A", "beds": 10})).json()
+            item_path = f"/v1/hospitais/{hospital['id']}/estoque"
+            for method, path, body in [
+                ("GET", f"/v1/hospitais/{hospital['id']}", None),
+                ("POST", item_path, {"name": "Gauze", "quantity": 5}),
+                ("POST", "/v1/hospitais/999/estoque", {"name": "Gauze", "quantity": 5}),
+                ("PUT", f"/v1/hospitais/{hospital['id']}", {"name": "Central II", "address": "Rua B", "beds": 20}),
+                ("DELETE", f"/v1/hospitais/{hospital['id']}", None),
+                ("GET", f"/v1/hospitais/{hospital['id']}", None)
+            ]:
+                async with session.request(method, path, json=body) as response:
+                    statuses.append(response.status)
+                if method == "POST" and path == item_path:
+                    listing = await (await session.get(item_path)).json()
+            return statuses, listing
+        
+        statuses, listing = asyncio.run(with_mock_server(True, scenario))
+        
+        assert statuses == [200, 201, 404, 200, 204, 404]
+        assert [item["name"] for item in listing] == ["Gauze"]
+    
+    def test_optional_and_non_object_bodies(self):
+        """Test an optional body may be omitted and a JSON array is rejected with 400, not merged"""
+        notes = Endpoint(
+            path="/v1/notes", method="POST", request_body_schema={},
+            responses=[ResponseSchema(201, schema={"type": "object", "properties": {"id": {"type": "string"}}})]
+        )
+        required = Endpoint(path="/v1/tags", method="POST", request_body_schema={}, request_body_required=True)
+        
+        async def scenario():
+            server = TestServer(MockServer([notes, required], stateful=True).create_app())
+            await server.start_server()
+            try:
+                async with aiohttp.ClientSession(str(server.make_url(""))) as session:
+                    statuses = []
+                    for path, body in [("/v1/notes", None), ("/v1/notes", [1, 2]), ("/v1/tags", None)]:
+                        async with session.post(path, json=body) as response:
+                            statuses.append((response.status, await response.json()))
+                    return statuses
+            finally:
+                await server.close()
+        
+        empty, array, missing = asyncio.run(scenario())
+        
+        assert empty[0] == 201 and "id" in empty[1]
+        assert array == (400, {"error": "Bad Request", "details": ["request body must be a JSON object"]})
+        assert missing == (400, {"error": "Bad Request", "details": ["request body is required"]})
+    
+    def test_unsupported_media_type(self):
+        """Test a JSON body sent as text/plain is rejected with the spec's 400, or 415 when declared"""
+        hospital = '{"name": "Central", "address": "Rua A", "beds": 10}'
+        
+        async def scenario(session, base_url):
+            statuses = []
+            for content_type in ("text/plain", "application/json; charset=utf-8"):
+                async with session.post("/v1/hospitais/", data=hospital, headers={"Content-Type": content_type}) as response:
+                    statuses.append(response.status)
+            return statuses
+        
+        assert asyncio.run(with_mock_server(False, scenario)) == [400, 201]
+        
+        upload = Endpoint(path="/v1/files", method="PUT", request_body_schema={}, consumes=["application/*"],
+                          responses=[ResponseSchema(200), ResponseSchema(415)])
+        
+        async def upload_scenario():
+            server = TestServer(MockServer([upload]).create_app())
+            await server.start_server()
+            try:
+                async with aiohttp.ClientSession(str(server.make_url(""))) as session:
+                    statuses = []
+                    for content_type in ("text/plain", "application/xml"):
+                        async with session.put("/v1/files", data=b"{}", headers={"Content-Type": content_type}) as response:
+                            statuses.append(response.status)
+                    return statuses
+            finally:
+                await server.close()
+        
+        assert asyncio.run(upload_scenario()) == [415, 200]
+    
+    def test_throughput(self):
+        """Test the mock keeps up with the executor (client and server share one event loop here)"""
+        test_cases = [
+            {"testId": f"N-{i}", "endpoint": "/v1/hospitais/maisProximo", "method": "GET",
+             "queryParams": {"latitude": "-23.5", "longitude": "-46.6"}, "expectedStatusCode": 200}
+            for i in range(2000)
+        ]
+        
+        async def scenario(session, base_url):
+            start = time.perf_counter()
+            results = await AsyncTestExecutor(base_url, concurrency=50).run(test_cases)
+            return results, time.perf_counter() - start
+        
+        results, elapsed = asyncio.run(with_mock_server(False, scenario))
+        
+        assert all(result.passed for result in results)
+        assert len(results) / elapsed > 500
@@ -0,0 +1,97 @@
+"""
+Unit tests for Multi-Spec Generation
+"""
+import pytest
+import json
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from llm_processor import RateLimitedProvider
+from conftest import FakeProvider, echo_cases
+from multi_spec import MultiSpecGenerator, discover_specs, spec_names
+from synthetic_spec import build_synthetic_spec
+
+
+@pytest.fixture
+def spec_tree(tmp_path):
+    """Two service specs in subdirectories and a JSON file that is not a spec"""
+    for service, size, version in [("billing", 10, "oas3"), ("pharmacy", 5, "swagger2")]:
+        spec = build_synthetic_spec(size, version, ref_depth=1, enum_size=2)
+        spec["paths"] = {f"/{service}{path}": item for path, item in spec["paths"].items()}
+        (tmp_path / "specs" / service).mkdir(parents=True)
+        (tmp_path / "specs" / service / "openapi.json").write_text(json.dumps(spec), encoding="utf-8")
+    (tmp_path / "specs" / "settings.json").write_text(json.dumps({"retries": 3}), encoding="utf-8")
+    return tmp_path / "specs"
+
+
+class TestDiscovery:
+    """Test finding spec files"""
+    
+    def test_directories_globs_and_files(self, spec_tree):
+        """Test sources are expanded recursively and each file is found once"""
+        billing = spec_tree / "billing" / "openapi.json"
+        
+        assert discover_specs([spec_tree]) == [
+            billing.resolve(), (spec_tree / "pharmacy" / "openapi.json").resolve(), (spec_tree / "settings.json").resolve()
+        ]
+        assert discover_specs([billing, str(spec_tree / "**" / "openapi.json")]) == [
+            billing.resolve(), (spec_tree / "pharmacy" / "openapi.json").resolve()
+        ]
+        assert discover_specs([spec_tree / "missing"]) == []
+        assert spec_names(discover_specs([spec_tree])) == ["billing-openapi", "pharmacy-openapi", "settings"]
+
+
+class TestMultiSpecGenerator:
+    """Test generating several specs in one run"""
+    
+    def test_run_writes_outputs_and_index(self, spec_tree, tmp_path):
+        """Test every spec is generated under one concurrency limit and a failing spec is only recorded"""
+        provider = FakeProvider(echo_cases, delay=0.02)
+        generator = MultiSpecGenerator(provider, tmp_path / "out", concurrency=3, parse_workers=2)
+        
+        index = generator.run([spec_tree], valid_per_endpoint=1, invalid_per_endpoint=0, output_formats=["json", "csv"])
+        
+        specs = {spec["name"]: spec for spec in index["specs"]}
+        assert specs["billing-openapi"]["endpoints"] == 10
+        assert specs["billing-openapi"]["testCases"] == 10
+        assert specs["pharmacy-openapi"]["testCases"] == 5
+        assert "Not an OpenAPI" in specs["settings"]["error"]
+        assert index["totals"] == {"specs": 3, "failed": 1, "endpoints": 15, "testCases": 15}
+        
+        exported = json.loads(Path(specs["pharmacy-openapi"]["outputFiles"]["json"]).read_text(encoding="utf-8"))
+        assert [tc["endpoint"] for tc in exported["testCases"]][:2] == ["/pharmacy/v1/resources0", "/pharmacy/v1/resources0"]
+        assert Path(specs["billing-openapi"]["outputFiles"]["csv"]).parent == tmp_path / "out" / "billing-openapi"
+        assert json.loads((tmp_path / "out" / "index.json").read_text(encoding="utf-8"))["totals"] == index["totals"]
+        assert provider.calls == 15
+        assert 1 < provider.max_running <= 3
+    
+    def test_no_specs(self, tmp_path):
+        """Test sources without spec files are an error"""
+        with pytest.raises(FileNotFoundError):
+            MultiSpecGenerator(FakeProvider(echo_cases, delay=0.02), tmp_path / "out").run([tmp_path / "*.yaml"])
+
+
+class TestRateLimitedProvider:
+    """Test the shared request rate"""
+    
+    def test_requests_are_spaced_across_threads(self):
+        """Test concurrent callers together stay within the request rate"""
+        provider = RateLimitedProvider(FakeProvider(echo_cases), requests_per_minute=1200)
+        prompt = "Path: /v1/items\nMethod: GET\n"
+        
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: provider.generate_response(prompt), range(5)))
+        
+        assert time.monotonic() - started >= 4 * 0.05 - 0.01
+        assert provider.provider.calls == 5
+        with pytest.raises(ValueError):
+            RateLimitedProvider(provider, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
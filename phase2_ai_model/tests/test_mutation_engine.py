@@ -0,0 +1,170 @@
+"""
+Unit tests for the Mutation Engine
+"""
+import pytest
+import json
+from pathlib import Path
+from dataclasses import replace
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser, ResponseSchema
+from conftest import FakeProvider, prompted_endpoint
+from schema_sampler import SchemaSampler
+from mutation_engine import MutationEngine, fingerprint
+import test_generator
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+HOSPITAL = {"name": "Central", "address": "Rua A, 1", "beds": 120}
+
+
+def valid_case(test_id, method, path, **fields):
+    """Build a VALID test case"""
+    return dict(testId=test_id, endpoint=path, method=method, category="VALID",
+                description="Valid request", expectedStatusCode=200, **fields)
+
+
+def valid_only(prompt):
+    """Answer one VALID case per prompt"""
+    method, path = prompted_endpoint(prompt)
+    fields = {"requestBody": HOSPITAL} if method in ("POST", "PUT") and "hospitais" in path else {}
+    if "{id}" in path:
+        fields["pathParams"] = {"id": "5e1a"}
+    return [valid_case("v", method, path, **fields)]
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Parsed hospital API"""
+    parser = OASParser(OAS_FILE)
+    parser.parse()
+    return parser
+
+
+@pytest.fixture(scope="module")
+def endpoints(parser):
+    """Parsed endpoints of the hospital API keyed by method and path"""
+    return {(e.method, e.path): e for e in parser.get_all_endpoints()}
+
+
+class TestMutationEngine:
+    """Test deriving INVALID cases from VALID ones"""
+    
+    def test_body_mutations_break_the_schema(self, parser, endpoints):
+        """Test each body variant expects a declared 4xx status and fails schema validation"""
+        endpoint = endpoints[("POST", "/v1/hospitais/")]
+        engine = MutationEngine(parser.definitions, max_body_bytes=1000)
+        base = valid_case("TC-1", "POST", "/v1/hospitais/", requestBody=HOSPITAL, assertions=["status == 201"])
+        
+        variants = engine.mutate(endpoint, [base])
+        
+        kinds = {v["mutation"] for v in variants}
+        assert {"missing:body.name", "wrong_type:body.beds", "too_long:body.address", "below_minimum:body.beds",
+                "overflow:body.beds", "oversized:body", "malformed_json:body"} <= kinds
+        assert "injection:body.name" not in kinds  # free text accepts the string
+        assert "content_type:body" not in kinds  # 415 is not declared, so its status would be a guess
+        assert all(v["category"] == "INVALID" and v["expectedStatusCode"] == 400 for v in variants)
+        assert all(v["derivedFrom"] == "TC-1" and "assertions" not in v for v in variants)
+        assert len({v["testId"] for v in variants}) == len(variants)
+        
+        schema = endpoint.request_body_schema
+        sampler = SchemaSampler()
+        for variant in variants:
+            if isinstance(variant["requestBody"], dict) and variant["mutation"] not in ("oversized:body", "overflow:body.beds", "overflow:body.availableBeds"):
+                assert sampler.validate(variant["requestBody"], schema), variant["mutation"]
+        oversized = next(v for v in variants if v["mutation"] == "oversized:body")
+        assert len(json.dumps(oversized["requestBody"])) > 1000
+        assert base["requestBody"] == HOSPITAL and "requestHeaders" not in base
+        
+        declaring = replace(endpoint, responses=endpoint.responses + [ResponseSchema(415)])
+        [text] = [v for v in MutationEngine(parser.definitions).mutate(declaring, [base]) if v["mutation"] == "content_type:body"]
+        assert text["expectedStatusCode"] == 415
+        assert text["requestHeaders"] == {"Content-Type": "text/plain"} and json.loads(text["requestBody"]) == HOSPITAL
+    
+    def test_parameters_and_declared_statuses(self, parser, endpoints):
+        """Test query and path parameters are mutated and malformed IDs expect the declared 404"""
+        engine = MutationEngine(parser.definitions)
+        nearest = engine.mutate(
+            endpoints[("GET", "/v1/hospitais/maisProximo")],
+            [valid_case("N", "GET", "/v1/hospitais/maisProximo", queryParams={"latitude": -23.5, "longitude": -46.6})]
+        )
+        by_id = engine.mutate(
+            endpoints[("GET", "/v1/hospitais/{id}")],
+            [valid_case("G", "GET", "/v1/hospitais/{id}", pathParams={"id": "5e1a"})]
+        )
+        
+        assert {"missing:query.latitude", "wrong_type:query.longitude", "wrong_type:query.radius"} <= {
+            v["mutation"] for v in nearest
+        }
+        assert [(v["mutation"], v["pathParams"], v["expectedStatusCode"]) for v in by_id] == [
+            ("malformed_id:path.id", {"id": "not-a-valid-id"}, 404)
+        ]
+        
+        put = engine.mutate(
+            endpoints[("PUT", "/v1/hospitais/{id}")],
+            [valid_case("P", "PUT", "/v1/hospitais/{id}", pathParams={"id": "5e1a"}, requestBody=HOSPITAL)]
+        )
+        statuses = {v["mutation"]: v["expectedStatusCode"] for v in put}
+        assert statuses["malformed_id:path.id"] == 404  # the item's declared 404, though PUT also declares 400
+        assert statuses["missing:body.name"] == 400
+    
+    def test_only_valid_cases_are_mutated_and_duplicates_dropped(self, parser, endpoints):
+        """Test invalid bases are skipped, items are capped and existing cases are not repeated"""
+        endpoint = endpoints[("POST", "/v1/hospitais/")]
+        engine = MutationEngine(parser.definitions)
+        existing = dict(valid_case("X", "POST", "/v1/hospitais/", requestBody={"address": "Rua A, 1", "beds": 120}),
+                        category="INVALID", expectedStatusCode=400)
+        engine.seed([existing])
+        
+        variants = engine.mutate(endpoint, [
+            valid_case("A", "POST", "/v1/hospitais/", requestBody=HOSPITAL),
+            valid_case("B", "POST", "/v1/hospitais/", requestBody=dict(HOSPITAL, name="Other")),
+            valid_case("C", "POST", "/v1/hospitais/", requestBody={"name": "No beds"}),
+            dict(valid_case("D", "POST", "/v1/hospitais/", requestBody=HOSPITAL), expectedStatusCode=409)
+        ])
+        
+        assert {v["derivedFrom"] for v in variants} == {"A"}
+        assert "missing:body.name" not in {v["mutation"] for v in variants}  # A's repeats the existing case
+        # B's name variants repeat A's and the existing case; its other items are capped
+        assert engine.get_stats() == {"derived": len(variants), "duplicates": 5}
+        assert not engine.mutate(endpoint, [valid_case("A", "POST", "/v1/hospitais/", requestBody=HOSPITAL)])
+        
+        described = dict(valid_case("E", "POST", "/v1/hospitais/", requestBody=HOSPITAL), expectedStatusCode="201 Created")
+        assert engine.is_valid_case(described, endpoint)
+        assert not engine.is_valid_case(dict(described, expectedStatusCode="2xx"), endpoint)
+        
+        twice = MutationEngine(parser.definitions, variants_per_item=2).mutate(endpoint, [
+            valid_case("A", "POST", "/v1/hospitais/", requestBody=HOSPITAL),
+            valid_case("B", "POST", "/v1/hospitais/", requestBody=dict(HOSPITAL, name="Other"))
+        ])
+        assert {v["derivedFrom"] for v in twice} == {"A", "B"}
+        assert [v["derivedFrom"] for v in twice if v["mutation"].endswith("body.name")] == ["A"] * 4
+        assert fingerprint(existing) == fingerprint(json.loads(json.dumps(existing)))
+
+
+class TestGeneratorWithMutations:
+    """Test generation adding derived INVALID cases"""
+    
+    def test_variants_follow_their_endpoint(self):
+        """Test each endpoint's variants are appended to its LLM cases"""
+        parser = OASParser(OAS_FILE)
+        parser.parse()
+        generator = test_generator.TestCaseGenerator(
+            OAS_FILE, llm_provider=FakeProvider(valid_only), oas_parser=parser,
+            mutation_engine=MutationEngine(parser.definitions)
+        )
+        
+        test_cases = generator.generate_all_tests(1, 0, filter_tags=["Hospitals"])
+        
+        base = None
+        for test_case in test_cases:
+            if "derivedFrom" not in test_case:
+                base = test_case
+            assert (test_case["method"], test_case["endpoint"]) == (base["method"], base["endpoint"])
+        assert generator.get_statistics()["invalid_test_cases"] == generator.mutation_engine.derived > 20
+        assert all(test_generator.TestCaseValidator.validate_test_case(tc)[0] for tc in test_cases)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
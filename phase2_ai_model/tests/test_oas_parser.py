@@ -3,13 +3,17 @@ Unit tests for OAS Parser
 """
 import pytest
 import json
+import pickle
 import tempfile
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+import oas_parser as oas_parser_module
 from oas_parser import OASParser, Endpoint, Parameter
+from lazy_json import LazyObject, skip_value, _value_pattern
+from synthetic_spec import build_synthetic_spec
 
 
 class TestOASParser:
@@ -95,6 +99,19 @@ class TestOASParser:
         assert hospital_endpoint.method == "POST"
         assert hospital_endpoint.summary == "Create hospital"
         assert "hospitals" in hospital_endpoint.tags
+        assert hospital_endpoint.request_body_required
+        assert hospital_endpoint.consumes == ["application/json"]
+    
+    def test_consumes_of_openapi3_bodies(self, tmp_path):
+        """Test OpenAPI 3 operations consume the media types of their request body content"""
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps({"openapi": "3.0.0", "info": {"title": "Forms", "version": "1"}, "paths": {
+            "/forms": {"post": {"requestBody": {"content": {"application/x-www-form-urlencoded": {"schema": {}}}},
+                                "responses": {"201": {"description": "Created"}}}}
+        }}), encoding="utf-8")
+        
+        [endpoint] = OASParser(spec_path).parse()
+        assert endpoint.consumes == ["application/x-www-form-urlencoded"]
     
     def test_get_endpoints_summary(self, oas_file):
         """Test getting endpoints summary"""
@@ -108,5 +125,165 @@ class TestOASParser:
         assert "POST" in summary["methods"]
 
 
+
+class TestLazyParsing:
+    """Test filter pushdown and lazily decoded specs"""
+    
+    @pytest.fixture
+    def spec_file(self, tmp_path):
+        """Write a synthetic spec with 20 resources"""
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps(build_synthetic_spec(100, "oas3", ref_depth=2, enum_size=5)), encoding="utf-8")
+        return spec_path
+    
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_filters(self, spec_file, lazy):
+        """Test tag, method and path filters select operations"""
+        assert len(OASParser(spec_file, lazy=lazy).parse(tags=["Resource3", "Resource4"])) == 10
+        assert len(OASParser(spec_file, lazy=lazy).parse(methods=["post"])) == 20
+        
+        endpoints = OASParser(spec_file, lazy=lazy).parse(methods=["GET"], paths=["/v1/resources1*"])
+        assert {(e.method, e.path) for e in endpoints} == {
+            ("GET", f"/v1/resources{i}{suffix}") for i in (1, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19) for suffix in ("", "/{id}")
+        }
+    
+    def test_lazy_matches_eager(self, spec_file):
+        """Test lazy parsing builds the same endpoints and only decodes the definitions they use"""
+        eager = OASParser(spec_file).parse(tags=["Resource7"])
+        oas_parser = OASParser(spec_file, lazy=True)
+        lazy = oas_parser.parse(tags=["Resource7"])
+        
+        assert [e.to_dict() for e in lazy] == [e.to_dict() for e in eager]
+        assert oas_parser.api_title == "Synthetic API (100 operations)"
+        assert set(oas_parser.definitions._values) == {"Resource7", "Resource7Nested0", "Resource7Nested1"}
+    
+    def test_lazy_object(self):
+        """Test members decode on access and malformed JSON is rejected"""
+        document = LazyObject('{"info": {"title": "API"}, "paths": {"/a": {"get": {}}}, "tags": [1, 2]}', layout={"paths": {}})
+        
+        assert list(document) == ["info", "paths", "tags"]
+        assert isinstance(document["paths"], LazyObject)
+        assert document["paths"].load("/a") == {"get": {}}
+        assert document.get("missing") is None
+        assert document.to_dict() == {"info": {"title": "API"}, "paths": {"/a": {"get": {}}}, "tags": [1, 2]}
+        
+        with pytest.raises(json.JSONDecodeError):
+            LazyObject('{"info": {"title": "API"} "paths": {}}')
+    
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_lazy_object_skips_without_decoding(self, indent):
+        """Test skipped values end in the right place, including brackets inside strings and deep nesting"""
+        deep = {"a": {}}
+        for _ in range(50):
+            deep = {"a": [deep]}
+        document = {"text": "}]{[\\\"", "deep": deep, "empty": {}, "list": [1, "]", {"b": None}], "last": -1.5e3}
+        lazy = LazyObject(json.dumps(document, indent=indent))
+        
+        assert list(lazy) == list(document)
+        assert all(lazy.load(key) == value for key, value in document.items())
+    
+    def test_skip_value(self):
+        """Test values are skipped by their brackets and strings without being decoded"""
+        text = '[1, "a]", {"b": [true]}], {broken'
+        
+        assert skip_value(text, 0) == text.index(",", text.index("}"))
+        assert skip_value('"x\\\\" y', 0) == 5
+        assert skip_value("12.5e3, 1", 0) == 6
+        # Values are not decoded, so malformed content only fails on access
+        assert skip_value('{"a": tru}', 0) == 10
+        with pytest.raises(json.JSONDecodeError):
+            skip_value(text, text.index("{broken"))
+    
+    def test_skip_patterns_compile_before_python_3_11(self):
+        """Test the scanner patterns avoid possessive quantifiers, which Python 3.10 rejects"""
+        pattern = _value_pattern(3).pattern
+        
+        assert "*+" not in pattern and "++" not in pattern
+        assert _value_pattern(1).match('["a]", 1]').end() == 9
+    
+    def test_yaml_spec(self, tmp_path):
+        """Test YAML specs load with the available YAML loader"""
+        spec_path = tmp_path / "spec.yaml"
+        spec_path.write_text(
+            "swagger: '2.0'\ninfo: {title: YAML API, version: 2.0.0}\npaths:\n  /items:\n    get:\n      tags: [items]\n",
+            encoding="utf-8"
+        )
+        oas_parser = OASParser(spec_path)
+        
+        assert oas_parser.api_title == "YAML API"
+        assert [(e.method, e.path) for e in oas_parser.parse(tags=["items"])] == [("GET", "/items")]
+
+
+
+class TestEndpointModel:
+    """Test the compact endpoint model"""
+    
+    def test_slots_and_views(self, tmp_path):
+        """Test endpoints have no instance dicts and share enums and parameter views"""
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps(build_synthetic_spec(10, "oas3", ref_depth=1, enum_size=3)), encoding="utf-8")
+        listings = [e for e in OASParser(spec_path).parse() if e.method == "GET" and "{id}" not in e.path]
+        
+        assert not hasattr(listings[0], "__dict__")
+        assert not hasattr(listings[0].parameters[0], "__dict__")
+        statuses = [next(p for p in e.parameters if p.name == "status").enum_values for e in listings]
+        assert statuses[0] is statuses[1]
+        
+        views = listings[0].parameter_views()
+        assert views is listings[0].parameter_views()
+        assert views[0]["name"] == "status" and views[0]["data_type"] == "string"
+        with pytest.raises(TypeError):
+            views[0]["name"] = "other"
+        
+        restored = pickle.loads(pickle.dumps(listings[0]))
+        assert restored == listings[0]
+        assert restored.parameter_views() == views
+
+
+class TestSpecCache:
+    """Test the parsed-spec cache"""
+    
+    @pytest.fixture
+    def spec_file(self, tmp_path):
+        """Write a small synthetic spec"""
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps(build_synthetic_spec(10, "swagger2", ref_depth=2, enum_size=3)), encoding="utf-8")
+        return spec_path
+    
+    def test_warm_parse_skips_document(self, spec_file, tmp_path):
+        """Test a warm parse restores the endpoints without loading the spec"""
+        cold = OASParser(spec_file, cache_dir=tmp_path / "cache").parse()
+        warm_parser = OASParser(spec_file, cache_dir=tmp_path / "cache")
+        warm = warm_parser.parse()
+        
+        assert warm_parser._oas_doc is None
+        assert warm_parser.api_title == "Synthetic API (10 operations)"
+        assert [e.to_dict() for e in warm] == [e.to_dict() for e in cold]
+        post, put = (next(e for e in warm if e.method == method) for method in ("POST", "PUT"))
+        assert post.request_body_schema is put.request_body_schema
+        assert set(warm_parser.definitions) == {f"Resource{i}{part}" for i in (0, 1) for part in ("", "Nested0", "Nested1")}
+        assert warm_parser._oas_doc is None
+        
+        assert len(OASParser(spec_file, cache_dir=tmp_path / "cache").parse(methods=["DELETE"])) == 2
+        assert len(list((tmp_path / "cache").glob("*.pickle"))) == 2
+    
+    def test_invalidation(self, spec_file, tmp_path, monkeypatch):
+        """Test changed specs, parser versions and unreadable caches are parsed again"""
+        cache_dir = tmp_path / "cache"
+        OASParser(spec_file, cache_dir=cache_dir).parse()
+        
+        spec_file.write_text(json.dumps(build_synthetic_spec(5, "swagger2")), encoding="utf-8")
+        assert len(OASParser(spec_file, cache_dir=cache_dir).parse()) == 5
+        
+        monkeypatch.setattr(oas_parser_module, "parser_fingerprint", lambda: "next-version")
+        oas_parser = OASParser(spec_file, cache_dir=cache_dir)
+        oas_parser.parse()
+        assert oas_parser._oas_doc is not None
+        
+        [cache_file] = cache_dir.glob("*.pickle")
+        cache_file.write_bytes(b"not a pickle")
+        assert len(OASParser(spec_file, cache_dir=cache_dir).parse()) == 5
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+"""
+Unit tests for Output Formatters
+"""
+import pytest
+import csv
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from output_formatter import (
+    FormatterFactory, JSONLFormatter, PostmanFormatter, PostmanTimingProfile, export_formats
+)
+from conftest import FakeProvider, echo_cases
+from test_generator import TestCaseGenerator
+
+MANUAL_RUN_REPORT = Path(__file__).parent.parent.parent / "manual_testing" / "Hospital  API Tests.postman_test_run.json"
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+
+
+class TestOutputFormatter:
+    """Test output formatter functionality"""
+    
+    @pytest.fixture
+    def test_cases(self):
+        """Create sample generated test cases"""
+        return [
+            {
+                "testId": "HC-001",
+                "endpoint": "/v1/hospitais/",
+                "method": "POST",
+                "category": "VALID",
+                "description": "Create hospital",
+                "priority": "HIGH",
+                "requestHeaders": {"Content-Type": "application/json"},
+                "requestBody": {"name": "Hospital Central", "address": "Rua Principal, 123", "beds": 50},
+                "expectedStatusCode": 201
+            },
+            {
+                "testId": "HC-002",
+                "endpoint": "/v1/hospitais/{id}",
+                "method": "GET",
+                "category": "INVALID",
+                "description": "Get non-existent hospital",
+                "priority": "MEDIUM",
+                "expectedStatusCode": 404
+            }
+        ]
+    
+    @pytest.fixture
+    def metadata(self):
+        """Create sample export metadata"""
+        return {"projectName": "Hospital API", "apiVersion": "1.0.0", "baseUrl": "http://localhost:8080"}
+    
+    def test_jsonl_formatter_registered(self):
+        """Test JSONL formatter is available through the factory"""
+        assert "jsonl" in FormatterFactory.available_formats()
+        assert isinstance(FormatterFactory.create_formatter("jsonl"), JSONLFormatter)
+    
+    def test_unknown_format(self):
+        """Test unknown formats are rejected"""
+        with pytest.raises(ValueError):
+            FormatterFactory.create_formatter("xml")
+    
+    def test_export_formats_writes_every_format(self, tmp_path, test_cases, metadata):
+        """Test a single set of test cases is written to every requested format"""
+        output_files = export_formats(test_cases, metadata, ["json", "csv", "postman", "jsonl"], tmp_path)
+        
+        assert set(output_files) == {"json", "csv", "postman", "jsonl"}
+        assert output_files["csv"] == tmp_path / "generated_tests_csv.csv"
+        assert output_files["postman"] == tmp_path / "generated_tests_postman.json"
+        
+        json_data = json.loads(output_files["json"].read_text())
+        assert json_data["summary"]["totalTestCases"] == 2
+        
+        with open(output_files["csv"], newline='') as f:
+            assert [row["testId"] for row in csv.DictReader(f)] == ["HC-001", "HC-002"]
+        
+        postman_data = json.loads(output_files["postman"].read_text())
+        assert [folder["name"] for folder in postman_data["item"][0]["item"]] == ["/v1/hospitais/", "/v1/hospitais/{id}"]
+        
+        lines = output_files["jsonl"].read_text().splitlines()
+        assert [json.loads(line)["testId"] for line in lines] == ["HC-001", "HC-002"]
+    
+    def test_export_formats_ignores_duplicates(self, tmp_path, test_cases, metadata):
+        """Test repeated format names are only written once"""
+        output_files = export_formats(test_cases, metadata, ["json", "JSON"], tmp_path)
+        
+        assert list(output_files) == ["json"]
+    
+    def test_postman_groups_by_tag_and_path(self, test_cases, metadata):
+        """Test Postman items are nested in tag and path folders"""
+        test_cases[0]["tags"] = ["hospital", "create"]
+        collection = PostmanFormatter().format(test_cases, metadata)
+        
+        assert [folder["name"] for folder in collection["item"]] == ["hospital", "default"]
+        path_folder = collection["item"][0]["item"][0]
+        assert path_folder["name"] == "/v1/hospitais/"
+        assert path_folder["item"][0]["request"]["method"] == "POST"
+    
+    def test_postman_folders_generated_cases_by_endpoint_tag(self, metadata):
+        """Test generated cases carry their endpoint's tags into the Postman folders"""
+        generator = TestCaseGenerator(OAS_FILE, llm_provider=FakeProvider(echo_cases))
+        test_cases = generator.generate_all_tests(1, 0)
+        
+        collection = PostmanFormatter().format(test_cases, metadata)
+        
+        assert [folder["name"] for folder in collection["item"]] == ["Hospitals", "Inventory", "Patients"]
+        assert all(tc["tags"] for tc in test_cases)
+    
+    def test_timing_profile_matches_path_templates(self):
+        """Test recorded concrete URLs are matched against endpoint templates"""
+        profile = PostmanTimingProfile.from_reports([MANUAL_RUN_REPORT])
+        
+        assert profile.estimate("POST", "/v1/hospitais/") == pytest.approx((1931 + 7 + 12) / 3)
+        assert profile.estimate("GET", "/v1/hospitais/{hospitalId}/hospitaisProximos") == pytest.approx((104 + 13 + 17) / 3)
+    
+    def test_postman_shards_are_balanced(self, tmp_path, metadata):
+        """Test shards split path folders by historical time"""
+        profile = PostmanTimingProfile()
+        profile.add_report({
+            "results": [
+                {"method": "GET", "url": "http://localhost:8080/slow", "time": 90},
+                {"method": "GET", "url": "http://localhost:8080/a", "time": 30},
+                {"method": "GET", "url": "http://localhost:8080/b", "time": 30},
+                {"method": "GET", "url": "http://localhost:8080/c", "time": 30}
+            ]
+        })
+        test_cases = [
+            {"testId": path, "endpoint": path, "method": "GET", "tags": ["api"], "expectedStatusCode": 200}
+            for path in ["/a", "/b", "/slow", "/c"]
+        ]
+        formatter = PostmanFormatter(shards=2)
+        formatter.timing_profile = profile
+        
+        shards = formatter.shard_collection(formatter.format(test_cases, metadata))
+        
+        shard_paths = [
+            sorted(folder["name"] for folder in shard["item"][0]["item"])
+            for shard in shards
+        ]
+        assert sorted(shard_paths) == [["/a", "/b", "/c"], ["/slow"]]
+        
+        formatter.write(tmp_path / "collection.json", formatter.format(test_cases, metadata))
+        assert (tmp_path / "collection.shard-1-of-2.json").exists()
+        assert (tmp_path / "collection.shard-2-of-2.json").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
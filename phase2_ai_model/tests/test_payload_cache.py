@@ -0,0 +1,111 @@
+"""
+Unit tests for the Payload Cache
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from conftest import FakeProvider, prompted_endpoint
+import test_generator
+from payload_cache import PayloadCache, assemble_request_body
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+HOSPITAL = {"name": "Central", "address": "Rua A, 1", "beds": 120}
+
+
+def override_cases(prompt):
+    """Write a full body until shown a valid one, then only overrides"""
+    method, path = prompted_endpoint(prompt)
+    base = {"endpoint": path, "method": method, "description": "d"}
+    if "VALID REQUEST BODY" in prompt:
+        return [
+            dict(base, testId="v", category="VALID", expectedStatusCode=200, requestBodyOverrides={"beds": 5}),
+            dict(base, testId="i", category="INVALID", expectedStatusCode=400,
+                 requestBodyOverrides={}, requestBodyOmit=["name"])
+        ]
+    return [dict(base, testId="v", category="VALID", expectedStatusCode=201, requestBody=HOSPITAL)]
+
+
+class TestPayloadCache:
+    """Test caching valid payloads per schema"""
+    
+    @pytest.fixture
+    def endpoints(self):
+        """Parsed endpoints of the hospital API keyed by method and path"""
+        return {(e.method, e.path): e for e in OASParser(OAS_FILE).parse()}
+    
+    def test_shared_schema_is_filled_once(self, endpoints):
+        """Test endpoints sharing a definition share one entry, filled by the first valid payload"""
+        cache = PayloadCache()
+        post = endpoints[("POST", "/v1/hospitais/")].request_body_schema
+        put = endpoints[("PUT", "/v1/hospitais/{id}")].request_body_schema
+        
+        assert cache.schema_key(post) == cache.schema_key(put) == cache.schema_key(json.loads(json.dumps(post)))
+        assert cache.get(post) is None
+        cache.learn(post, [{"category": "VALID", "requestBody": {"name": "No beds"}},
+                           {"category": "VALID", "requestBody": HOSPITAL}])
+        assert cache.get(put) == HOSPITAL
+        cache.get(put)["name"] = "changed"
+        assert cache.get(put) == HOSPITAL
+        assert cache.get_stats() == {"entries": 1, "hits": 3, "misses": 1}
+    
+    def test_example_and_sampler_sources(self, endpoints):
+        """Test a valid schema example is used directly and the sampler fills in without a valid case"""
+        cache = PayloadCache()
+        inventory = endpoints[("POST", "/v1/hospitais/{hospitalId}/estoque")].request_body_schema
+        example = {"type": "object", "required": ["code"], "properties": {"code": {"type": "string"}},
+                   "example": {"code": "A1"}}
+        
+        assert cache.get(example) == {"code": "A1"}
+        cache.learn(inventory, [{"category": "INVALID", "requestBody": {}}])
+        sampled = cache.get(inventory)
+        assert not cache.sampler.validate(sampled, inventory)
+    
+    def test_save_and_load(self, tmp_path, endpoints):
+        """Test payloads are reused by a later run"""
+        schema = endpoints[("POST", "/v1/hospitais/")].request_body_schema
+        cache = PayloadCache(tmp_path / "payloads.json")
+        cache.put(schema, HOSPITAL, "llm")
+        cache.save()
+        
+        assert PayloadCache(tmp_path / "payloads.json").get(schema) == HOSPITAL
+    
+    def test_assemble_request_body(self):
+        """Test overrides and omitted fields are applied to a copy and explicit bodies are kept"""
+        test_case = {"requestBodyOverrides": {"beds": -1}, "requestBodyOmit": ["address"]}
+        assemble_request_body(HOSPITAL, test_case)
+        explicit = {"requestBody": {"name": "x"}, "requestBodyOverrides": {"beds": 1}}
+        assemble_request_body(HOSPITAL, explicit)
+        
+        assert test_case == {"requestBody": {"name": "Central", "beds": -1}}
+        assert explicit == {"requestBody": {"name": "x"}}
+        assert HOSPITAL["beds"] == 120
+
+
+class TestGeneratorWithPayloadCache:
+    """Test generation reusing cached request bodies"""
+    
+    def test_second_endpoint_only_gets_overrides(self):
+        """Test the PUT sharing the POST's schema is prompted with its body and gets full bodies back"""
+        provider = FakeProvider(override_cases)
+        generator = test_generator.TestCaseGenerator(OAS_FILE, llm_provider=provider, payload_cache=PayloadCache())
+        
+        test_cases = generator.generate_all_tests(1, 1, filter_tags=["Hospitals"])
+        
+        write_prompts = [p for p in provider.prompts if "Method: POST" in p or "Method: PUT" in p]
+        assert len(write_prompts) == 2
+        assert "VALID REQUEST BODY" not in write_prompts[0]
+        assert "requestBodyOverrides" in write_prompts[1] and "- requestBody:" not in write_prompts[1]
+        put_cases = [tc for tc in test_cases if tc["method"] == "PUT"]
+        assert [tc["requestBody"] for tc in put_cases] == [
+            dict(HOSPITAL, beds=5), {"address": "Rua A, 1", "beds": 120}
+        ]
+        assert generator.payload_cache.get_stats()["hits"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+"""
+Unit tests for the Results Store
+"""
+import pytest
+import json
+import time
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from results_store import ResultsStore
+
+MANUAL_RUN_REPORT = Path(__file__).parent.parent.parent / "manual_testing" / "Hospital  API Tests.postman_test_run.json"
+TEMPLATES = [
+    "/v1/hospitais/",
+    "/v1/hospitais/{id}",
+    "/v1/hospitais/maisProximo",
+    "/v1/hospitais/{hospitalId}/estoque",
+    "/v1/hospitais/{hospitalId}/estoque/{productId}"
+]
+
+
+class TestResultsStore:
+    """Test results store functionality"""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create an empty results store"""
+        with ResultsStore(tmp_path / "results.db", endpoint_templates=TEMPLATES) as store:
+            yield store
+    
+    def test_import_postman_run(self, store):
+        """Test Postman run exports are imported once with endpoint templates"""
+        run_id = store.import_postman_run(MANUAL_RUN_REPORT)
+        
+        assert run_id is not None
+        assert store.import_postman_run(MANUAL_RUN_REPORT) is None
+        assert store.get_summary()["results"] == 26
+        
+        trend = store.latency_trend("/v1/hospitais/{id}", method="GET")
+        assert trend[0]["requests"] == 2
+        assert trend[0]["max_ms"] == 13
+        
+        nearest = [r for r in store.failure_rates() if r["endpoint"] == "/v1/hospitais/maisProximo"]
+        assert nearest[0]["total"] == 1
+    
+    def test_import_execution_results(self, store, tmp_path):
+        """Test executor JSONL results are imported with pass/fail and timings"""
+        results_file = tmp_path / "execution_results.jsonl"
+        results_file.write_text("\n".join(json.dumps(r) for r in [
+            {"test_id": "HC-001", "endpoint": "/v1/hospitais/", "method": "POST", "url": "http://localhost/v1/hospitais/",
+             "status_code": 201, "expected_status_code": 201, "passed": True, "elapsed_ms": 40.0,
+             "failures": [], "started_at": "2026-01-01T10:00:00"},
+            {"test_id": "HC-002", "endpoint": "/v1/hospitais/", "method": "POST", "url": "http://localhost/v1/hospitais/",
+             "status_code": 201, "expected_status_code": 400, "passed": False, "elapsed_ms": 80.0,
+             "failures": ["Expected status 400, got 201"], "started_at": "2026-01-01T10:00:01"}
+        ]))
+        
+        store.import_execution_results(results_file)
+        
+        assert store.failure_rates()[0]["failure_rate"] == 0.5
+        assert store.slowest_tests(limit=1)[0]["test_id"] == "HC-002"
+        assert store.endpoint_latencies() == {("POST", "/v1/hospitais/"): [40.0]}
+    
+    def test_unmapped_urls_warn(self, tmp_path, caplog):
+        """Test URLs without a matching template keep their concrete path and are reported"""
+        with ResultsStore(tmp_path / "unmapped.db") as store:
+            store.import_postman_run(MANUAL_RUN_REPORT)
+            
+            endpoints = {row["endpoint"] for row in store.failure_rates()}
+        
+        assert "/v1/hospitais/{id}" not in endpoints and "/v1/hospitais/maisProximo" in endpoints
+        assert "match no endpoint template" in caplog.text
+    
+    def test_queries_scale_to_thousands_of_runs(self, store, tmp_path):
+        """Test indexed queries stay fast over thousands of runs"""
+        for run in range(2000):
+            store._insert_run(
+                run_key=f"synthetic:{run}", name=f"run {run}", source="executor",
+                started_at=f"2026-01-01T{run // 3600 % 24:02d}:{run // 60 % 60:02d}:{run % 60:02d}",
+                rows=[
+                    {"test_id": f"T-{i}", "name": f"T-{i}", "method": "GET", "endpoint": TEMPLATES[i % 5],
+                     "url": "", "status_code": 200, "expected_status_code": 200, "passed": i % 7 != 0,
+                     "elapsed_ms": float(i + run % 10), "timestamp": "2026-01-01T00:00:00", "assertions": {}}
+                    for i in range(10)
+                ]
+            )
+        
+        start = time.perf_counter()
+        trend = store.latency_trend("/v1/hospitais/{id}", last_runs=100)
+        failures = store.failure_rates()
+        slowest = store.slowest_tests(limit=5)
+        elapsed = time.perf_counter() - start
+        
+        assert len(trend) == 100
+        assert len(failures) == 5
+        assert slowest[0]["test_id"] == "T-9"
+        assert elapsed < 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
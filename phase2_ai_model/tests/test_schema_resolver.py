@@ -0,0 +1,70 @@
+"""
+Unit tests for Schema Resolver
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from schema_resolver import SchemaResolver
+from synthetic_spec import build_synthetic_spec
+
+
+class TestSchemaResolver:
+    """Test $ref resolution"""
+    
+    @pytest.mark.parametrize("version", ["swagger2", "oas3"])
+    def test_parser_resolves_shared_definitions(self, tmp_path, version):
+        """Test request and response schemas are resolved once and shared between operations"""
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps(build_synthetic_spec(5, version, ref_depth=3, enum_size=4)), encoding="utf-8")
+        endpoints = {(e.method, e.path): e for e in OASParser(spec_path).parse()}
+        
+        post = endpoints[("POST", "/v1/resources0")]
+        put = endpoints[("PUT", "/v1/resources0/{id}")]
+        assert post.request_body_schema["properties"]["status"]["enum"] == ["STATUS_0", "STATUS_1", "STATUS_2", "STATUS_3"]
+        assert post.request_body_schema["properties"]["details"]["properties"]["child"]["properties"]["child"]["required"] == ["label"]
+        assert post.request_required_fields == ["name", "code", "status"]
+        assert post.request_body_schema is put.request_body_schema
+        
+        created = next(r for r in post.responses if r.status_code == 201)
+        assert created.schema is post.request_body_schema
+        assert all(p.in_ != "body" for p in post.parameters)
+    
+    def test_cycles_stay_references(self):
+        """Test a recursive definition keeps its back reference and resolves it on demand"""
+        document = {
+            "definitions": {
+                "Ward": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "parent": {"$ref": "#/definitions/Ward"},
+                        "beds": {"type": "array", "items": {"$ref": "#/definitions/Bed"}}
+                    }
+                },
+                "Bed": {"type": "object", "properties": {"ward": {"$ref": "#/definitions/Ward"}}}
+            }
+        }
+        resolver = SchemaResolver(document)
+        ward = resolver.resolve({"$ref": "#/definitions/Ward"})
+        
+        assert ward["properties"]["parent"] == {"$ref": "#/definitions/Ward"}
+        assert ward["properties"]["beds"]["items"]["properties"]["ward"] == {"$ref": "#/definitions/Ward"}
+        assert resolver.resolve(ward["properties"]["parent"]) is ward
+    
+    def test_unreferenced_schemas_are_not_copied(self):
+        """Test schemas without references are returned as they are"""
+        schema = {"type": "object", "properties": {"name": {"type": "string"}}}
+        resolver = SchemaResolver(definitions={"Name": {"type": "string"}})
+        
+        assert resolver.resolve(schema) is schema
+        assert resolver.resolve({"$ref": "#/components/schemas/Name"}) == {"type": "string"}
+        assert resolver.resolve({"$ref": "#/definitions/Missing"}) == {"$ref": "#/definitions/Missing"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
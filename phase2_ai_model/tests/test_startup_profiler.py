@@ -0,0 +1,46 @@
+"""
+Unit tests for the Startup Profiler
+"""
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from startup_profiler import parse_import_times, profile_startup
+
+MAIN = Path(__file__).parent.parent / "main.py"
+
+
+class TestStartupProfiler:
+    """Test import time profiling"""
+    
+    def test_parse_import_times(self):
+        """Test -X importtime lines are parsed with their nesting depth"""
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     _io",
+            "import time:       510 |      11376 |   yaml.loader",
+            "import time:       450 |      15713 | yaml",
+            "usage: main.py [-h]"
+        ])
+        
+        timings = parse_import_times(stderr)
+        
+        assert [(t.module, t.depth) for t in timings] == [("_io", 2), ("yaml.loader", 1), ("yaml", 0)]
+        assert timings[2].self_us == 450
+        assert timings[2].cumulative_us == 15713
+    
+    def test_non_llm_commands_load_only_what_they_need(self):
+        """Test --help runs do not import the HTTP stack, YAML or provider SDKs"""
+        for argv in (["--help"], ["select", "--help"], ["mock", "--help"], ["results", "--help"]):
+            report = profile_startup(MAIN, argv)
+            
+            assert report["returncode"] == 0
+            loaded = {t.module.split(".")[0] for t in report["timings"]}
+            assert "config" in loaded
+            assert not loaded & {"aiohttp", "yaml", "openai", "anthropic", "requests", "asyncio"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
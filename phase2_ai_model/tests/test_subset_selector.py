@@ -0,0 +1,104 @@
+"""
+Unit tests for the Subset Selector
+"""
+import pytest
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oas_parser import OASParser
+from subset_selector import SubsetSelector
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+MANUAL_TEST_CASES = Path(__file__).parent.parent.parent / "manual_testing" / "test_cases.json"
+
+
+def hospital_body(**overrides):
+    """Create a hospital request body"""
+    body = {"name": "Hospital Central", "address": "Rua Principal, 123", "beds": 50,
+            "location": {"locationCategory": "HOSPITAL"}}
+    body.update(overrides)
+    return {k: v for k, v in body.items() if v is not None}
+
+
+class TestSubsetSelector:
+    """Test subset selection"""
+    
+    @pytest.fixture
+    def oas_parser(self):
+        """Parse the hospital API specification"""
+        oas_parser = OASParser(OAS_FILE)
+        oas_parser.parse()
+        return oas_parser
+    
+    @pytest.fixture
+    def test_cases(self):
+        """Create redundant POST /v1/hospitais/ cases"""
+        return [
+            {"testId": "H-1", "endpoint": "/v1/hospitais/", "method": "POST", "category": "VALID",
+             "requestBody": hospital_body(), "expectedStatusCode": 201},
+            {"testId": "H-2", "endpoint": "/v1/hospitais/", "method": "POST", "category": "VALID",
+             "requestBody": hospital_body(name="Hospital Norte"), "expectedStatusCode": 201},
+            {"testId": "H-3", "endpoint": "/v1/hospitais/", "method": "POST", "category": "VALID",
+             "requestBody": hospital_body(location={"locationCategory": "CLINIC"}), "expectedStatusCode": 201},
+            {"testId": "H-4", "endpoint": "/v1/hospitais/", "method": "POST", "category": "INVALID",
+             "requestBody": hospital_body(name=None), "expectedStatusCode": 400},
+            {"testId": "H-5", "endpoint": "/v1/hospitais/", "method": "POST", "category": "INVALID",
+             "requestBody": hospital_body(name=None, address=None), "expectedStatusCode": 400},
+            {"testId": "H-6", "endpoint": "/v1/hospitais/", "method": "POST", "category": "INVALID",
+             "requestBody": hospital_body(beds=-1), "expectedStatusCode": 400}
+        ]
+    
+    def test_coverage_matrix_uses_spec(self, oas_parser, test_cases):
+        """Test each case covers its operation, status, missing required fields and enum values"""
+        selector = SubsetSelector(oas_parser.endpoints, oas_parser.oas_doc["definitions"])
+        
+        matrix = selector.coverage_matrix(test_cases)
+        
+        assert matrix[4] == {
+            ("operation", "POST", "/v1/hospitais"),
+            ("status", "POST", "/v1/hospitais", 400),
+            ("missing_field", "POST", "/v1/hospitais", "name"),
+            ("missing_field", "POST", "/v1/hospitais", "address"),
+            ("enum_value", "POST", "/v1/hospitais", "body.location.locationCategory", "HOSPITAL")
+        }
+    
+    def test_select_keeps_full_coverage(self, oas_parser, test_cases):
+        """Test the subset covers everything the full suite covers with fewer cases"""
+        selector = SubsetSelector(oas_parser.endpoints, oas_parser.oas_doc["definitions"])
+        
+        subset = selector.select(test_cases)
+        
+        assert [tc["testId"] for tc in subset.test_cases] == ["H-3", "H-5"]
+        assert set().union(*selector.coverage_matrix(subset.test_cases)) == subset.covered
+        assert ("missing_field", "POST", "/v1/hospitais", "beds") in subset.uncovered
+        assert ("operation", "GET", "/v1/pacientes") in subset.uncovered
+    
+    def test_select_without_spec(self, test_cases):
+        """Test required fields are inferred from VALID bodies when no spec is given"""
+        subset = SubsetSelector(criteria=["status", "missing_field"]).select(test_cases)
+        
+        assert [tc["testId"] for tc in subset.test_cases] == ["H-1", "H-5"]
+        assert subset.uncovered == set()
+    
+    def test_unknown_criterion(self):
+        """Test unknown criteria are rejected"""
+        with pytest.raises(ValueError):
+            SubsetSelector(criteria=["branches"])
+    
+    def test_manual_suite(self):
+        """Test the manual suite shrinks while every operation and status is kept"""
+        with open(MANUAL_TEST_CASES, 'r', encoding='utf-8') as f:
+            test_cases = json.load(f)["testCases"]
+        
+        subset = SubsetSelector(criteria=["operation", "status"]).select(test_cases)
+        
+        assert len(subset.test_cases) < len(test_cases)
+        assert {(tc["method"], tc["endpoint"], tc["expectedStatusCode"]) for tc in subset.test_cases} == \
+            {(tc["method"], tc["endpoint"], tc["expectedStatusCode"]) for tc in test_cases}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
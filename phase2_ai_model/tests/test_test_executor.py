@@ -0,0 +1,148 @@
+"""
+Unit tests for the async Test Executor, run against a local stand-in server
+"""
+import pytest
+import json
+import asyncio
+from pathlib import Path
+import sys
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from test_executor import AsyncTestExecutor, load_test_cases
+
+
+def create_stand_in_app(peers: set) -> web.Application:
+    """Create a minimal stand-in for the hospital API"""
+    hospitals = {"1": {"id": "1", "name": "Hospital Central", "beds": 50}}
+    
+    async def get_hospital(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        hospital = hospitals.get(request.match_info["id"])
+        if hospital is None:
+            return web.json_response({"error": "Not Found"}, status=404)
+        return web.json_response(hospital)
+    
+    async def create_hospital(request):
+        body = await request.json()
+        if "name" not in body:
+            return web.json_response({"error": "name is required"}, status=400)
+        return web.json_response({"id": "2", **body}, status=201)
+    
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+    
+    app = web.Application()
+    app.router.add_get("/v1/hospitais/slow", slow)
+    app.router.add_get("/v1/hospitais/{id}", get_hospital)
+    app.router.add_post("/v1/hospitais/", create_hospital)
+    return app
+
+
+async def run_against_stand_in(test_cases, peers=None, **executor_options):
+    """Execute test cases against a freshly started stand-in server"""
+    server = TestServer(create_stand_in_app(peers if peers is not None else set()))
+    await server.start_server()
+    try:
+        executor = AsyncTestExecutor(str(server.make_url("")), **executor_options)
+        return await executor.run(test_cases)
+    finally:
+        await server.close()
+
+
+class TestAsyncTestExecutor:
+    """Test async executor functionality"""
+    
+    def test_status_and_response_fields(self):
+        """Test status codes and expected response fields are checked"""
+        test_cases = [
+            {
+                "testId": "HC-001", "endpoint": "/v1/hospitais/{id}", "method": "GET",
+                "pathParams": {"id": "1"}, "expectedStatusCode": 200,
+                "expectedResponseFields": ["id", "name"]
+            },
+            {
+                "testId": "HC-002", "endpoint": "/v1/hospitais/{id}", "method": "GET",
+                "pathParams": {"id": "1"}, "expectedStatusCode": 200,
+                "expectedResponseFields": ["address"]
+            },
+            {
+                "testId": "HC-003", "endpoint": "/v1/hospitais/", "method": "POST",
+                "requestBody": {"beds": 10}, "expectedStatusCode": 400
+            },
+            {
+                "testId": "HC-004", "endpoint": "/v1/hospitais/", "method": "POST",
+                "requestBody": {"name": "Hospital Novo"}, "expectedStatusCode": 400
+            },
+            {
+                "testId": "HC-005", "endpoint": "/v1/hospitais/", "method": "POST",
+                "requestBody": {"name": "Hospital Novo"}, "expectedStatusCode": "201 Created"
+            },
+            {
+                "testId": "HC-006", "endpoint": "/v1/hospitais/", "method": "POST",
+                "requestBody": {"beds": 10}, "expectedStatusCode": "4xx"
+            }
+        ]
+        
+        results = {r.test_id: r for r in asyncio.run(run_against_stand_in(test_cases))}
+        
+        assert results["HC-001"].passed
+        assert results["HC-002"].failures == ["Missing response field: address"]
+        assert results["HC-003"].passed
+        assert results["HC-004"].failures == ["Expected status 400, got 201"]
+        assert results["HC-005"].passed
+        assert results["HC-006"].failures == ["Invalid expected status '4xx'"] and results["HC-006"].error is None
+        assert all(r.elapsed_ms > 0 for r in results.values())
+    
+    def test_connections_are_pooled(self):
+        """Test requests reuse at most `concurrency` keep-alive connections"""
+        test_cases = [
+            {"testId": f"HC-{i}", "endpoint": "/v1/hospitais/1", "method": "GET", "expectedStatusCode": 200}
+            for i in range(30)
+        ]
+        peers = set()
+        
+        results = asyncio.run(run_against_stand_in(test_cases, peers, concurrency=3))
+        
+        assert all(r.passed for r in results)
+        assert 1 <= len(peers) <= 3
+    
+    def test_request_timeout(self):
+        """Test slow requests fail with a timeout instead of blocking the run"""
+        test_cases = [{"testId": "HC-SLOW", "endpoint": "/v1/hospitais/slow", "method": "GET", "expectedStatusCode": 200}]
+        
+        result = asyncio.run(run_against_stand_in(test_cases, timeout=0.1))[0]
+        
+        assert not result.passed
+        assert "timed out" in result.error
+    
+    def test_templates_run_once_per_row(self):
+        """Test a data-driven template is executed natively, one request per row"""
+        template = {
+            "testId": "{{testId}}", "endpoint": "/v1/hospitais/{id}", "method": "GET",
+            "pathParams": {"id": "{{id}}"}, "expectedStatusCode": "{{status}}",
+            "data": {"columns": ["testId", "id", "status"], "rows": [["HC-1", "1", 200], ["HC-9", "9", 404]]}
+        }
+        
+        results = {r.test_id: r for r in asyncio.run(run_against_stand_in([template]))}
+        
+        assert set(results) == {"HC-1", "HC-9"}
+        assert all(r.passed for r in results.values())
+        assert results["HC-9"].url.endswith("/v1/hospitais/9")
+    
+    def test_load_test_cases_json_and_jsonl(self, tmp_path):
+        """Test JSON and JSONL generator outputs are both readable"""
+        cases = [{"testId": "HC-001"}, {"testId": "HC-002"}]
+        (tmp_path / "cases.json").write_text(json.dumps({"metadata": {}, "testCases": cases}))
+        (tmp_path / "cases.jsonl").write_text("\n".join(json.dumps(tc) for tc in cases) + "\n")
+        
+        assert load_test_cases(tmp_path / "cases.json") == cases
+        assert load_test_cases(tmp_path / "cases.jsonl") == cases
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
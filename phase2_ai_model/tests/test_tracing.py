@@ -0,0 +1,84 @@
+"""
+Unit tests for stage tracing
+"""
+import pytest
+import json
+import threading
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import tracing
+from tracing import span, enable_tracing, disable_tracing
+from conftest import FakeProvider, echo_cases
+from output_formatter import export_formats
+import test_generator
+
+OAS_FILE = Path(__file__).parent.parent.parent / "oas_docs" / "hospital-api.json"
+
+
+class TestTracing:
+    """Test span recording and Chrome trace export"""
+    
+    @pytest.fixture(autouse=True)
+    def tracer(self):
+        """Enable tracing for one test"""
+        tracer = enable_tracing()
+        yield tracer
+        disable_tracing()
+    
+    def test_disabled_spans_record_nothing(self, tracer):
+        """Test spans are no-ops once tracing is disabled"""
+        disable_tracing()
+        with span("ignored"):
+            pass
+        
+        assert tracer.events == []
+        assert tracing.get_tracer() is None
+    
+    def test_concurrent_spans_get_separate_threads(self, tracer):
+        """Test spans of concurrent threads keep their own thread ids"""
+        barrier = threading.Barrier(2)
+        
+        def _work():
+            with span("work", "test"):
+                barrier.wait()
+        
+        threads = [threading.Thread(target=_work, name=f"worker-{i}") for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        first, second = tracer.events
+        assert first["tid"] != second["tid"]
+        assert first["ts"] < second["ts"] + second["dur"] and second["ts"] < first["ts"] + first["dur"]
+        names = [e["args"]["name"] for e in tracer.to_chrome_trace()["traceEvents"] if e["ph"] == "M"]
+        assert sorted(names) == ["worker-0", "worker-1"]
+    
+    def test_generation_stages(self, tracer, tmp_path):
+        """Test a generation run records every stage and writes a loadable trace"""
+        generator = test_generator.TestCaseGenerator(OAS_FILE, llm_provider=FakeProvider(echo_cases))
+        generator.generate_all_tests(filter_tags=["Hospitals"])
+        export_formats(generator.generated_test_cases, generator.get_export_metadata(), ["json", "csv"], tmp_path)
+        
+        summary = tracer.get_summary()
+        endpoints = [e for e in generator.endpoints if "Hospitals" in (e.tags or [])]
+        paths = {e.path for e in endpoints}
+        for stage in ("load_spec", "parse_spec", "build_prompt", "parse_json", "format", "write"):
+            assert stage in summary
+        assert summary["generate_endpoint"]["count"] == len(endpoints)
+        assert summary["llm_request"]["count"] == len(endpoints)
+        assert summary["validate"]["count"] == len(endpoints)
+        
+        tracer.write(tmp_path / "trace.json")
+        trace = json.loads((tmp_path / "trace.json").read_text())
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert {e["args"]["path"] for e in spans if e["name"] == "generate_endpoint"} == paths
+        # Formatters run in the export pool, not on the generating thread
+        assert threading.get_ident() not in {e["tid"] for e in spans if e["name"] == "format"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])